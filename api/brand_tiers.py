@@ -0,0 +1,56 @@
+"""
+Brand tiers behind the deal score's brand component (numpy-free).
+A copy of BRAND_TIERS / getBrandTier and the tier points of calculateDealScore in
+docs/js/app.js, so sort=score on the API ranks items as the UI scores them;
+tests/test_item_store.py checks the scores against the JS.
+"""
+from typing import Dict
+
+# Tier -> brand names, in the order the frontend checks them
+BRAND_TIERS = {
+    'luxury': [
+        'Gucci', 'Prada', 'Burberry', 'Versace', 'Balenciaga', 'Saint Laurent', 'Givenchy',
+        'Valentino', 'Dolce & Gabbana', 'Fendi', 'Bottega Veneta', 'Tom Ford', 'Alexander McQueen',
+        'Off-White', 'Balmain', 'Kenzo', 'Salvatore Ferragamo', 'Ermenegildo Zegna',
+        'Brunello Cucinelli',
+    ],
+    'premium': [
+        'Hugo Boss', 'BOSS', 'Calvin Klein', 'Tommy Hilfiger', 'Ralph Lauren', 'Polo Ralph Lauren',
+        'Lacoste', 'Ted Baker', 'Paul Smith', 'Reiss', 'Sandro', 'The Kooples', 'Armani Exchange',
+        'Michael Kors', 'Coach', 'Kate Spade', 'Marc Jacobs', 'Diesel', 'Fred Perry', 'Gant',
+        'Barbour', 'Hackett', 'Scotch & Soda', 'J.Lindeberg', 'Tiger of Sweden', 'Filippa K',
+        'Acne Studios', 'R.M. Williams', 'Country Road', 'Trenery', 'Saba', 'MJ Bale', 'Oxford',
+        'Calibre', 'Aquila', 'Rodd & Gunn', 'Ben Sherman', 'Original Penguin', 'The North Face',
+        'Columbia', 'Patagonia', 'Superdry', 'Uniqlo', 'Zara',
+    ],
+    'midrange': [
+        "Levi's", 'Levis', 'Nike', 'Adidas', 'Puma', 'New Balance', 'Reebok', 'Under Armour',
+        'Timberland', 'Converse', 'Vans', 'ASICS', 'Skechers', 'Clarks', 'Hush Puppies', 'Wrangler',
+        'Lee', 'Dickies', 'Carhartt', 'Champion', 'Fila', 'Guess', 'Nautica', 'Dockers', 'Hanes',
+        'Jack & Jones', 'Only & Sons', 'Selected Homme', 'Blend', 'Billabong', 'Quiksilver',
+        'Rip Curl', 'Volcom', 'ASOS DESIGN', 'Topman', 'River Island', 'Burton', 'New Look',
+        'Staple Superior', 'Academy Brand', 'Industrie', 'Kenji', 'JD Sports', 'Theory',
+        'AllSaints', 'Witchery', 'Julius Marlow', 'Gazman', 'Mango',
+    ],
+    'budget': [
+        'Bonds', 'Cotton On', 'H&M', 'Pull & Bear', 'Bershka', 'Stradivarius', 'Primark', 'Kmart',
+        'Target', 'Best & Less', 'Big W', 'Lowes', 'Rivers', 'Jeanswest', 'Jay Jays', 'Factorie',
+        'Typo', 'Supre', 'Valleygirl', 'Unknown',
+    ],
+}
+
+# Deal-score points per tier (max 25)
+TIER_SCORES: Dict[str, int] = {'luxury': 25, 'premium': 22, 'midrange': 15, 'budget': 8, 'unknown': 12}
+
+_LOWER_TIERS = [(tier, [name.lower() for name in names]) for tier, names in BRAND_TIERS.items()]
+
+
+def brand_tier(brand: str) -> str:
+    """Tier of a brand, matched as getBrandTier does (either name contains the other)"""
+    if not brand:
+        return 'unknown'
+    brand = brand.lower()
+    for tier, names in _LOWER_TIERS:
+        if any(brand in name or name in brand for name in names):
+            return tier
+    return 'unknown'
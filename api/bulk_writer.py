@@ -0,0 +1,164 @@
+"""
+Batched bulk inserts for the Supabase REST API (stdlib only).
+Rows are split into batches, each batch is sent gzip-compressed as its own
+POST, and batches run concurrently over a small pool of keep-alive
+connections. A failed batch is retried on its own (with backoff) instead of
+failing the whole write, and every batch reports its outcome.
+"""
+import gzip
+import http.client
+import json
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+from urllib.parse import urlsplit
+
+# Statuses worth another attempt; other 4xx mean the batch itself is bad
+RETRY_STATUSES = {408, 425, 429, 500, 502, 503, 504}
+
+
+def _gzip_rejected(status: int, text: str) -> bool:
+    """True when the server could not read a gzip-encoded body (the rows are always valid JSON).
+    PostgREST answers an undecoded body with 400 PGRST102, 'Empty or invalid json'."""
+    if status == 415:
+        return True
+    lowered = text.lower()
+    return status == 400 and ('pgrst102' in lowered or 'invalid json' in lowered)
+
+
+@dataclass
+class BatchResult:
+    """Outcome of one batch"""
+    table: str
+    index: int
+    rows: int
+    ok: bool
+    status: Optional[int] = None
+    attempts: int = 0
+    elapsed_s: float = 0.0
+    error: Optional[str] = None
+
+
+class BulkWriter:
+    """POSTs row batches to one REST endpoint over pooled keep-alive connections.
+
+    Args:
+        base_url: e.g. "https://xyz.supabase.co/rest/v1".
+        headers: Sent with every request (auth, Prefer, ...).
+        concurrency: Batches in flight at once (and pooled connections).
+        max_attempts: Tries per batch, including the first.
+        timeout: Socket timeout per request, in seconds.
+        compress: gzip request bodies; switched off for the rest of the
+            writer's life if the server rejects a compressed body.
+    """
+
+    def __init__(self, base_url: str, headers: Dict[str, str], concurrency: int = 4,
+                 max_attempts: int = 3, timeout: float = 30.0, compress: bool = True):
+        parts = urlsplit(base_url)
+        self.scheme = parts.scheme
+        self.host = parts.hostname
+        self.port = parts.port
+        self.base_path = parts.path.rstrip('/')
+        self.headers = dict(headers)
+        self.concurrency = max(1, concurrency)
+        self.max_attempts = max(1, max_attempts)
+        self.timeout = timeout
+        self.compress = compress
+        self._pool: queue.LifoQueue = queue.LifoQueue()
+
+    def _connect(self) -> http.client.HTTPConnection:
+        cls = http.client.HTTPSConnection if self.scheme == 'https' else http.client.HTTPConnection
+        return cls(self.host, self.port, timeout=self.timeout)
+
+    def _acquire(self) -> tuple:
+        """(connection, reused from the pool)"""
+        try:
+            return self._pool.get_nowait(), True
+        except queue.Empty:
+            return self._connect(), False
+
+    def _release(self, conn: http.client.HTTPConnection):
+        self._pool.put(conn)
+
+    def close(self):
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                return
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _post(self, path: str, body: bytes, headers: Dict[str, str]) -> tuple:
+        """(status, response text) for one POST; the connection is reused unless it broke"""
+        conn, reused = self._acquire()
+        while True:
+            try:
+                conn.request('POST', f"{self.base_path}/{path}", body=body, headers=headers)
+                resp = conn.getresponse()
+                text = resp.read().decode('utf-8', errors='replace')
+                break
+            except (OSError, http.client.HTTPException) as e:
+                conn.close()
+                # An idle pooled connection the server already closed: retry once on a fresh one
+                if reused and isinstance(e, (ConnectionError, http.client.RemoteDisconnected)):
+                    conn, reused = self._connect(), False
+                    continue
+                raise
+        if resp.will_close:
+            conn.close()
+        else:
+            self._release(conn)
+        return resp.status, text
+
+    def _send(self, path: str, table: str, index: int, rows: List[Dict],
+              extra_headers: Dict[str, str]) -> BatchResult:
+        result = BatchResult(table=table, index=index, rows=len(rows), ok=False)
+        payload = json.dumps(rows, separators=(',', ':')).encode()
+        start = time.monotonic()
+        while result.attempts < self.max_attempts:
+            result.attempts += 1
+            compressed = self.compress
+            headers = {**self.headers, **extra_headers, 'Connection': 'keep-alive'}
+            body = payload
+            if compressed:
+                body = gzip.compress(payload, compresslevel=5)
+                headers['Content-Encoding'] = 'gzip'
+            try:
+                result.status, text = self._post(path, body, headers)
+            except (OSError, http.client.HTTPException) as e:
+                result.status, result.error = None, f"{type(e).__name__}: {e}"
+            else:
+                if 200 <= result.status < 300:
+                    result.ok, result.error = True, None
+                    break
+                result.error = text[:300]
+                if compressed and _gzip_rejected(result.status, text):
+                    # Plain JSON from now on; this retry does not use up an attempt
+                    self.compress = False
+                    result.attempts -= 1
+                    continue
+                if result.status not in RETRY_STATUSES:
+                    break
+            if result.attempts < self.max_attempts:
+                time.sleep(min(8.0, 0.5 * 2 ** (result.attempts - 1)))
+        result.elapsed_s = round(time.monotonic() - start, 3)
+        return result
+
+    def write(self, path: str, rows: List[Dict], batch_size: int,
+              extra_headers: Dict[str, str] = None, table: str = None) -> List[BatchResult]:
+        """Insert `rows` in batches of `batch_size`; one BatchResult per batch, in order"""
+        if not rows:
+            return []
+        table = table or path.split('?', 1)[0]
+        batches = [rows[i:i + batch_size] for i in range(0, len(rows), batch_size)]
+        with ThreadPoolExecutor(max_workers=min(self.concurrency, len(batches))) as pool:
+            futures = [pool.submit(self._send, path, table, index, batch, extra_headers or {})
+                       for index, batch in enumerate(batches)]
+            return [future.result() for future in futures]
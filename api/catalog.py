@@ -0,0 +1,40 @@
+"""
+Catalogue mappings the API needs (numpy-free, so the storage clients can use them).
+The api is deployed on its own and cannot import the scraper's modules; this mirrors
+categories.CATEGORY_GROUPS and the store adapters' sources, and tests/test_catalog.py
+keeps them in sync.
+"""
+from typing import Iterable, Set
+
+# Store registry key (stores.STORE_MODULES, the frontend's store values) -> item 'source'
+STORE_SOURCES = {
+    'iconic': 'The Iconic',
+    'asos': 'ASOS',
+    'myer': 'Myer',
+    'jbhifi': 'JB Hi-Fi',
+    'davidjones': 'David Jones',
+}
+
+# Broad UI group names -> the category keys they cover
+CATEGORY_GROUPS = {
+    'tops': ['Tops', 'T-Shirts', 'T-Shirts & Singlets', 'Shirts', 'Shirts & Polos'],
+    'jeans': ['Jeans'],
+    'shoes': ['Shoes', 'Sneakers', 'Boots', 'Heels', 'Flats', 'Sandals', 'Sandals & Thongs',
+              'Mules & Slides', 'Trainers', 'Slip Ons & Loafers', 'Casual Shoes', 'Dress Shoes'],
+    'jackets': ['Jackets & Coats', 'Coats & Jackets'],
+    'dresses': ['Dresses'],
+    'pants': ['Pants', 'Trousers & Chinos', 'Trousers & Leggings'],
+    'shorts': ['Shorts'],
+    'knitwear': ['Knitwear', 'Jumpers & Cardigans', 'Sweats & Hoodies', 'Hoodies & Sweatshirts'],
+    'skirts': ['Skirts'],
+    'activewear': ['Activewear'],
+    'swimwear': ['Swimwear'],
+    'suits': ['Suits & Blazers', 'Suits'],
+    'electronics': ['Laptops', 'Headphones', 'Speakers', 'TVs', 'Phones', 'Gaming',
+                    'Cameras', 'Smart Home', 'Wearables', 'Audio'],
+}
+
+
+def store_sources(stores: Iterable[str]) -> Set[str]:
+    """Item sources for store keys (unknown keys match nothing)"""
+    return {STORE_SOURCES[key] for key in stores if key in STORE_SOURCES}
@@ -0,0 +1,139 @@
+"""
+Columnar item store for server-side filtering, sorting and paging.
+Items are loaded once into NumPy columns (prices, discount, savings, score and
+integer codes for source/brand/category); each query is a handful of vectorised
+masks plus one argsort, and only the requested page is turned back into dicts.
+The deal score is the frontend's calculateDealScore (docs/js/app.js).
+"""
+import numpy as np
+
+from brand_tiers import TIER_SCORES, brand_tier
+from catalog import CATEGORY_GROUPS, store_sources
+
+# sort= values (same names as the frontend's sortBy select)
+SORT_KEYS = ('score', 'discount', 'savings', 'price_low', 'price_high')
+
+DEFAULT_PAGE_SIZE = 48
+MAX_PAGE_SIZE = 500
+
+
+def _price(value) -> float:
+    if value is None or value == 'N/A':
+        return np.nan
+    if isinstance(value, (int, float)):
+        return float(value)
+    try:
+        return float(str(value).replace('$', '').replace(',', '').strip())
+    except ValueError:
+        return np.nan
+
+
+def _encode(values: list):
+    """(vocabulary, int32 codes) for a list of strings"""
+    vocab, codes = np.unique(np.array(values, dtype=object), return_inverse=True)
+    return list(vocab), codes.astype(np.int32)
+
+
+def _category_in_group(category: str, keys: list) -> bool:
+    # Same rule as the scraper: exact key or "<key> Page N"
+    return any(category == key or category.startswith(key + ' ') for key in keys)
+
+
+class ItemStore:
+    """Immutable columnar snapshot of an item list"""
+
+    def __init__(self, items: list):
+        self.items = items
+        n = len(items)
+        self.current = np.fromiter((_price(i.get('current_price')) for i in items), dtype=np.float64, count=n)
+        self.original = np.fromiter((_price(i.get('original_price')) for i in items), dtype=np.float64, count=n)
+        self.discount = np.fromiter((float(i.get('discount_percent') or 0) for i in items), dtype=np.float64, count=n)
+        self.savings = np.nan_to_num(self.original - self.current, nan=0.0)
+
+        self.sources, self.source_codes = _encode([i.get('source') or '' for i in items])
+        self.brands, self.brand_codes = _encode([i.get('brand') or '' for i in items])
+        self.categories, self.category_codes = _encode([i.get('category') or 'Other' for i in items])
+        self.genders, self.gender_codes = _encode([i.get('gender') or '' for i in items])
+        self._source_index = {s: c for c, s in enumerate(self.sources)}
+        # Lowercased brand -> its codes ('BOSS' and 'Boss' are separate vocabulary entries)
+        self._brand_index = {}
+        for c, b in enumerate(self.brands):
+            self._brand_index.setdefault(b.lower(), []).append(c)
+        self._gender_index = {g.lower(): c for c, g in enumerate(self.genders)}
+
+        # Category-group membership, precomputed per distinct category: group -> bool[category code]
+        self._group_masks = {
+            group: np.array([_category_in_group(c, keys) for c in self.categories], dtype=bool)
+            for group, keys in CATEGORY_GROUPS.items()
+        }
+
+        self.score = self._scores()
+
+    def __len__(self):
+        return len(self.items)
+
+    def _scores(self) -> np.ndarray:
+        """Deal score as the UI computes it: discount (40) + brand tier (25)
+        + price vs category average (20) + savings (15)"""
+        if not len(self.items):
+            return np.zeros(0)
+        priced = np.where(self.current > 0, self.current, 0.0)
+        totals = np.bincount(self.category_codes, weights=priced, minlength=len(self.categories))
+        counts = np.bincount(self.category_codes, weights=(priced > 0), minlength=len(self.categories))
+        averages = np.divide(totals, counts, out=np.zeros_like(totals), where=counts > 0)[self.category_codes]
+
+        discount_score = np.minimum(40, self.discount / 70 * 40)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            below_avg = (averages - self.current) / averages * 100
+        avg_score = np.where((averages > 0) & (self.current > 0), np.clip(10 + below_avg / 5, 0, 20), 10)
+        savings_score = np.clip(self.savings / 300 * 15, 0, 15)
+        tier_points = np.array([TIER_SCORES[brand_tier(b)] for b in self.brands], dtype=np.float64)
+        return discount_score + tier_points[self.brand_codes] + avg_score + savings_score
+
+    def _mask(self, stores=None, category_groups=None, brands=None, genders=None,
+              min_discount=None, min_price=None, max_price=None) -> np.ndarray:
+        mask = np.ones(len(self.items), dtype=bool)
+        if stores:
+            # Store keys ('iconic', 'jbhifi') resolve to the sources stamped on the items
+            wanted = [self._source_index.get(source, -1) for source in store_sources(stores)]
+            mask &= np.isin(self.source_codes, wanted)
+        if category_groups:
+            allowed = np.zeros(len(self.categories), dtype=bool)
+            for group in category_groups:
+                if group in self._group_masks:
+                    allowed |= self._group_masks[group]
+            mask &= allowed[self.category_codes]
+        if brands:
+            wanted = [c for b in brands for c in self._brand_index.get(b.lower(), ())]
+            mask &= np.isin(self.brand_codes, wanted)
+        if genders:
+            wanted = [self._gender_index.get(g.lower(), -1) for g in genders]
+            mask &= np.isin(self.gender_codes, wanted)
+        if min_discount is not None:
+            mask &= self.discount >= min_discount
+        if min_price is not None:
+            mask &= self.current >= min_price
+        if max_price is not None:
+            mask &= self.current <= max_price
+        return mask
+
+    def query(self, sort: str = 'score', page: int = 1, page_size: int = DEFAULT_PAGE_SIZE, **filters):
+        """Filter, sort and page; returns (matching count, items on the page)"""
+        if sort not in SORT_KEYS:
+            raise ValueError(f'sort must be one of {SORT_KEYS}, got {sort!r}')
+        page = max(1, page)
+        page_size = max(1, min(page_size, MAX_PAGE_SIZE))
+
+        indexes = np.flatnonzero(self._mask(**filters))
+        keys = {
+            'score': -self.score,
+            'discount': -self.discount,
+            'savings': -self.savings,
+            'price_low': self.current,
+            'price_high': -self.current,
+        }[sort][indexes]
+        start = (page - 1) * page_size
+        if start >= len(indexes):
+            return len(indexes), []
+        order = indexes[np.argsort(keys, kind='stable')][start:start + page_size]
+        return len(indexes), [self.items[i] for i in order]
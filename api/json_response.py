@@ -0,0 +1,105 @@
+"""
+Compact, compressed JSON response bodies for the API handlers.
+Bodies are encoded without whitespace (orjson when installed, else the json
+module), compressed with brotli or gzip as the client's Accept-Encoding allows
+(brotli only when the package is installed), and tagged with a weak ETag over
+the stable part of the payload so unchanged data can be answered with a 304.
+"""
+import gzip
+import hashlib
+import json
+
+try:
+    import orjson
+except ImportError:  # optional speed-up
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # optional: gzip only
+    brotli = None
+
+# Smaller bodies go out uncompressed (headers and framing would eat the saving)
+MIN_COMPRESS_BYTES = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def encode_json(obj) -> bytes:
+    """Compact UTF-8 JSON; anything not JSON-native is stringified (as default=str did)"""
+    if orjson is not None:
+        return orjson.dumps(obj, default=str, option=orjson.OPT_PASSTHROUGH_DATETIME)
+    return json.dumps(obj, default=str, separators=(',', ':'), ensure_ascii=False).encode('utf-8')
+
+
+def project_items(items: list, fields) -> list:
+    """Items reduced to the requested keys (missing keys are left out)"""
+    fields = tuple(dict.fromkeys(fields))
+    return [{key: item[key] for key in fields if key in item} for item in items]
+
+
+def negotiate_encoding(accept_encoding: str):
+    """'br', 'gzip' or None for an Accept-Encoding header (q=0 excludes a coding)"""
+    accepted = {}
+    for part in (accept_encoding or '').split(','):
+        coding, _, params = part.strip().partition(';')
+        coding = coding.strip().lower()
+        if not coding:
+            continue
+        q = 1.0
+        # Only the q parameter counts ("gzip;q=0.5;level=1")
+        for param in params.split(';'):
+            name, _, value = param.partition('=')
+            if name.strip().lower() == 'q':
+                try:
+                    q = float(value.strip())
+                except ValueError:
+                    q = 0.0
+        accepted[coding] = q
+    wildcard = accepted.get('*', 0.0)
+    candidates = (['br'] if brotli is not None else []) + ['gzip']
+    best, best_q = None, 0.0
+    for coding in candidates:
+        q = accepted.get(coding, wildcard)
+        if q > best_q:
+            best, best_q = coding, q
+    return best
+
+
+def compress(body: bytes, encoding):
+    """(body, Content-Encoding or None)"""
+    if encoding is None or len(body) < MIN_COMPRESS_BYTES:
+        return body, None
+    if encoding == 'br':
+        return brotli.compress(body, quality=BROTLI_QUALITY), 'br'
+    return gzip.compress(body, compresslevel=GZIP_LEVEL), 'gzip'
+
+
+def build_body(payload: dict, volatile=()) -> tuple:
+    """(JSON bytes, weak ETag). Keys in `volatile` (timestamps, cache age) are
+    serialised but left out of the ETag, so identical data revalidates with a 304."""
+    stable = {k: v for k, v in payload.items() if k not in volatile}
+    changing = {k: v for k, v in payload.items() if k in volatile}
+    body = encode_json(stable)
+    etag = f'W/"{hashlib.blake2b(body, digest_size=12).hexdigest()}"'
+    if changing:
+        extra = encode_json(changing)
+        # Splice the two objects: {"a":1} + {"b":2} -> {"a":1,"b":2}
+        body = body[:-1] + (b',' if len(body) > 2 else b'') + extra[1:]
+    return body, etag
+
+
+def etag_matches(if_none_match: str, etag: str) -> bool:
+    """Weak comparison of an If-None-Match header against our ETag"""
+    if not if_none_match:
+        return False
+    opaque = etag[2:] if etag.startswith('W/') else etag
+    for tag in if_none_match.split(','):
+        tag = tag.strip()
+        if tag == '*':
+            return True
+        if tag.startswith('W/'):
+            tag = tag[2:]
+        if tag == opaque:
+            return True
+    return False
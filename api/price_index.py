@@ -0,0 +1,100 @@
+"""
+Last-known price per product, used to write price snapshots only on change.
+A snapshot is due when the current price, original price or discount differs
+from the last one written, or when the last write is older than the heartbeat
+(so every live product still gets a row now and then). The index is kept in a
+local JSON file and rebuilt from recent price_history rows when that file is
+missing, unreadable or was written for a different storage target.
+"""
+import json
+import os
+import time
+from datetime import datetime
+from typing import Dict, Iterable, Optional
+
+# A product gets a snapshot at least this often even when its price is unchanged
+HEARTBEAT_SECONDS = 24 * 3600
+
+_FORMAT_VERSION = 1
+
+
+def _key(current, original, discount) -> tuple:
+    """Comparable price state: cents and a one-decimal discount"""
+    return (
+        round(current * 100) if current is not None else None,
+        round(original * 100) if original is not None else None,
+        round(float(discount), 1) if discount is not None else None,
+    )
+
+
+def _timestamp(value) -> float:
+    try:
+        return datetime.fromisoformat(str(value).replace('Z', '+00:00')).timestamp()
+    except (TypeError, ValueError):
+        return 0.0
+
+
+class PriceIndex:
+    """product_id -> (price state, time of the last snapshot written)"""
+
+    def __init__(self, path: str, heartbeat: float = HEARTBEAT_SECONDS, target: Optional[str] = None):
+        self.path = path
+        self.heartbeat = heartbeat
+        # The database the index describes ('sqlite:/path/prices.db'); a file for another one is rebuilt
+        self.target = target
+        self._entries: Dict[str, list] = {}
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def load(self) -> bool:
+        """Read the local file; False when it is missing, unreadable or for another target (rebuild instead)"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return False
+        if not isinstance(data, dict) or data.get('version') != _FORMAT_VERSION:
+            return False
+        if data.get('target') != self.target:
+            return False
+        self._entries = data.get('products') or {}
+        return True
+
+    def rebuild(self, rows: Iterable[Dict]):
+        """Reset from snapshot rows (newest first) as returned by get_recent_snapshots"""
+        self._entries = {}
+        for row in rows:
+            pid = row.get('product_id')
+            if pid and pid not in self._entries:
+                state = _key(row.get('current_price'), row.get('original_price'), row.get('discount_percent'))
+                self._entries[pid] = [*state, _timestamp(row.get('scraped_at'))]
+
+    def save(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp = f"{self.path}.tmp"
+        with open(tmp, 'w', encoding='utf-8') as f:
+            json.dump({'version': _FORMAT_VERSION, 'target': self.target, 'saved_at': time.time(),
+                       'products': self._entries}, f)
+        os.replace(tmp, self.path)
+
+    def due(self, snapshot: Dict, now: Optional[float] = None) -> Optional[str]:
+        """Why this snapshot must be written ('new', 'changed', 'heartbeat'), or None to skip it"""
+        entry = self._entries.get(snapshot['product_id'])
+        if entry is None:
+            return 'new'
+        state = _key(snapshot.get('current_price'), snapshot.get('original_price'),
+                     snapshot.get('discount_percent'))
+        if tuple(entry[:3]) != state:
+            return 'changed'
+        if (now if now is not None else time.time()) - entry[3] >= self.heartbeat:
+            return 'heartbeat'
+        return None
+
+    def record(self, snapshot: Dict, now: Optional[float] = None):
+        """Remember a snapshot that was written"""
+        state = _key(snapshot.get('current_price'), snapshot.get('original_price'),
+                     snapshot.get('discount_percent'))
+        self._entries[snapshot['product_id']] = [*state, now if now is not None else time.time()]
@@ -0,0 +1,171 @@
+"""
+Cross-store near-duplicate grouping of items (MinHash + LSH).
+The same product listed by several stores gets one group with its best price;
+items are compared on their normalised brand + name tokens. MinHash signatures
+are banded into LSH buckets, so only items sharing a bucket are compared and
+the work stays roughly linear in the number of items. A group holds at most one
+offer per store, and model numbers and colours must agree, so variants of a
+product ("Air Max 90" / "Air Max 95", "Logo Tee Black" / "Logo Tee Navy") stay
+separate rows.
+"""
+import re
+import zlib
+
+import numpy as np
+
+NUM_PERM = 64
+BANDS = 16               # 16 bands x 4 rows: pairs above ~0.5 Jaccard usually share a bucket
+ROWS = NUM_PERM // BANDS
+JACCARD_THRESHOLD = 0.8  # candidate pairs are confirmed on exact token Jaccard
+MAX_BUCKET = 50          # huge buckets are generic names ("t-shirt"), not one product
+
+# Words that say nothing about which product it is
+_STOP_WORDS = frozenset([
+    'the', 'a', 'an', 'and', 'in', 'with', 'for', 'of', 'by',
+    'mens', 'men', 'womens', 'women', 's', 'unisex', 'new', 'sale',
+])
+_TOKEN_RE = re.compile(r'[a-z0-9]+')
+# Variant words: when both names give a colour, the colours must be the same
+_COLOURS = frozenset([
+    'black', 'white', 'navy', 'blue', 'red', 'green', 'grey', 'gray', 'charcoal', 'brown',
+    'tan', 'beige', 'cream', 'ecru', 'khaki', 'olive', 'pink', 'purple', 'yellow', 'orange',
+    'stone', 'sand', 'burgundy', 'maroon', 'silver', 'gold', 'indigo', 'teal',
+])
+# Spellings stores use for the same thing
+_SYNONYMS = [
+    (re.compile(r'\bt[\s-]?shirts?\b|\btees\b'), 'tee'),
+    (re.compile(r'\btrainers?\b|\bsneakers\b'), 'sneaker'),
+    (re.compile(r'\bjumpers?\b|\bsweaters?\b'), 'jumper'),
+]
+
+_PRIME = (1 << 31) - 1
+_rng = np.random.RandomState(20240601)
+_A = _rng.randint(1, _PRIME, size=(NUM_PERM, 1), dtype=np.int64)
+_B = _rng.randint(0, _PRIME, size=(NUM_PERM, 1), dtype=np.int64)
+
+
+def _price(value) -> float:
+    if value is None or value == 'N/A':
+        return float('inf')
+    try:
+        return float(str(value).replace('$', '').replace(',', '').strip())
+    except ValueError:
+        return float('inf')
+
+
+def product_tokens(brand: str, name: str) -> frozenset:
+    """Normalised brand + name tokens used for matching"""
+    text = f"{brand or ''} {name or ''}".lower()
+    for pattern, replacement in _SYNONYMS:
+        text = pattern.sub(replacement, text)
+    return frozenset(t for t in _TOKEN_RE.findall(text) if t not in _STOP_WORDS)
+
+
+def _signatures(token_sets: list, block: int = 4096) -> np.ndarray:
+    """(n, NUM_PERM) MinHash signatures (rows for empty token sets stay at the maximum)"""
+    signatures = np.full((len(token_sets), NUM_PERM), _PRIME, dtype=np.int64)
+    for first in range(0, len(token_sets), block):
+        rows = [i for i in range(first, min(first + block, len(token_sets))) if token_sets[i]]
+        if not rows:
+            continue
+        lengths = np.fromiter((len(token_sets[i]) for i in rows), dtype=np.int64, count=len(rows))
+        hashed = np.fromiter((zlib.crc32(t.encode()) % _PRIME for i in rows for t in token_sets[i]),
+                             dtype=np.int64, count=int(lengths.sum()))
+        # One (NUM_PERM, tokens) matrix per block, reduced to a per-item minimum
+        permuted = (_A * hashed + _B) % _PRIME
+        starts = np.r_[0, np.cumsum(lengths)[:-1]]
+        signatures[rows] = np.minimum.reduceat(permuted, starts, axis=1).T
+    return signatures
+
+
+class _DisjointSet:
+    def __init__(self, n: int):
+        self.parent = list(range(n))
+
+    def find(self, i: int) -> int:
+        while self.parent[i] != i:
+            self.parent[i] = self.parent[self.parent[i]]
+            i = self.parent[i]
+        return i
+
+    def union(self, i: int, j: int):
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            self.parent[max(ri, rj)] = min(ri, rj)
+
+
+def _candidate_pairs(signatures: np.ndarray, sources: list):
+    """Pairs of items from different stores sharing at least one LSH band"""
+    n = len(signatures)
+    pairs = set()
+    bands = signatures.reshape(n, BANDS, ROWS).astype(np.uint64)
+    weights = np.array([1 << (16 * r) for r in range(ROWS)], dtype=np.uint64)
+    for band in range(BANDS):
+        keys = (bands[:, band, :] * weights).sum(axis=1)  # uint64 wraps: fine for bucketing
+        order = np.argsort(keys, kind='stable')
+        sorted_keys = keys[order]
+        starts = np.flatnonzero(np.r_[True, sorted_keys[1:] != sorted_keys[:-1]])
+        ends = np.r_[starts[1:], n]
+        for start, end in zip(starts, ends):
+            if end - start < 2 or end - start > MAX_BUCKET:
+                continue
+            members = order[start:end].tolist()
+            for x in range(len(members)):
+                for y in range(x + 1, len(members)):
+                    i, j = members[x], members[y]
+                    if sources[i] != sources[j]:
+                        pairs.add((i, j) if i < j else (j, i))
+    return pairs
+
+
+def _variant_match(a: frozenset, b: frozenset) -> bool:
+    """Model tokens (anything with a digit: "90", "501", "xm5") equal, and no conflicting colours"""
+    if {t for t in a if any(c.isdigit() for c in t)} != {t for t in b if any(c.isdigit() for c in t)}:
+        return False
+    colours_a, colours_b = a & _COLOURS, b & _COLOURS
+    return not (colours_a and colours_b and colours_a != colours_b)
+
+
+def group_indexes(items: list, threshold: float = JACCARD_THRESHOLD) -> list:
+    """Lists of item indexes describing the same product (singletons included), in item order"""
+    token_sets = [product_tokens(i.get('brand'), i.get('name')) for i in items]
+    sources = [i.get('source') or '' for i in items]
+    groups = _DisjointSet(len(items))
+    if items:
+        matches = []
+        for i, j in _candidate_pairs(_signatures(token_sets), sources):
+            a, b = token_sets[i], token_sets[j]
+            if not (a and b) or not _variant_match(a, b):
+                continue
+            similarity = len(a & b) / len(a | b)
+            if similarity >= threshold:
+                matches.append((-similarity, i, j))
+        # Closest pairs first; a group never takes a second offer from a store it already has
+        stores = {index: {source} for index, source in enumerate(sources)}
+        for _, i, j in sorted(matches):
+            ri, rj = groups.find(i), groups.find(j)
+            if ri == rj or stores[ri] & stores[rj]:
+                continue
+            groups.union(ri, rj)
+            root = groups.find(ri)
+            stores[root] = stores[ri] | stores[rj]
+    members = {}
+    for index in range(len(items)):
+        members.setdefault(groups.find(index), []).append(index)
+    return list(members.values())
+
+
+def group_items(items: list, threshold: float = JACCARD_THRESHOLD) -> list:
+    """One row per product: the cheapest offer, plus the other stores' offers as alternatives"""
+    rows = []
+    for indexes in group_indexes(items, threshold):
+        offers = sorted((items[i] for i in indexes), key=lambda item: _price(item.get('current_price')))
+        best = dict(offers[0])
+        best['offers'] = len(offers)
+        best['alternatives'] = [
+            {key: offer.get(key) for key in ('product_id', 'source', 'current_price', 'original_price',
+                                             'discount_percent', 'url')}
+            for offer in offers[1:]
+        ]
+        rows.append(best)
+    return rows
@@ -2,23 +2,30 @@
 Vercel Serverless Function - Async Discount Scraper with Caching + Supabase price history
 """
 from datetime import datetime
-import json
 import os
 import sys
 from http.server import BaseHTTPRequestHandler
 from urllib.parse import urlparse, parse_qs
 
-# Multi-slot cache keyed by (stores, genders, categories) tuple
+# Sibling modules (storage, item_store, ...) are imported by bare name
+_API_DIR = os.path.dirname(os.path.abspath(__file__))
+if _API_DIR not in sys.path:
+    sys.path.insert(0, _API_DIR)
+
+from json_response import build_body, compress, etag_matches, negotiate_encoding, project_items  # noqa: E402
+
+# Multi-slot cache keyed by (stores, genders, categories, min_discount) tuple
 _cache = {}
 _CACHE_TTL = 900  # 15 minutes
 _CACHE_MAX_SLOTS = 10
 
 
-def _make_cache_key(stores, genders, category_groups):
+def _make_cache_key(stores, genders, category_groups, min_discount=None):
     return (
         frozenset(stores) if stores else None,
-        frozenset(genders) if genders else None,
+        frozenset(g.lower() for g in genders) if genders else None,
         frozenset(category_groups) if category_groups else None,
+        min_discount,
     )
 
 
@@ -40,6 +47,31 @@ def set_cache(cache_key, data):
     _cache[cache_key] = {'data': data, 'timestamp': datetime.now()}
 
 
+def _cached_derived(cache_key, items, name, build):
+    """Value derived from a cached item list, built once per cache entry"""
+    entry = _cache.get(cache_key)
+    if entry is None or entry['data'] is not items:
+        return build(items)
+    if entry.get(name) is None:
+        entry[name] = build(items)
+    return entry[name]
+
+
+def get_item_store(cache_key, items, grouped=False):
+    """Columnar store for a cached item list (or for its product groups)"""
+    from item_store import ItemStore
+    if grouped:
+        return _cached_derived(cache_key, items, 'grouped_store',
+                               lambda data: ItemStore(get_grouped_items(cache_key, data)))
+    return _cached_derived(cache_key, items, 'store', ItemStore)
+
+
+def get_grouped_items(cache_key, items):
+    """One row per product across stores (best price first, other offers as alternatives)"""
+    from product_groups import group_items
+    return _cached_derived(cache_key, items, 'grouped', group_items)
+
+
 def _parse_list_param(qs, name):
     values = qs.get(name, [])
     result = []
@@ -48,6 +80,54 @@ def _parse_list_param(qs, name):
     return result if result else None
 
 
+def _parse_float_param(qs, name):
+    values = qs.get(name)
+    if not values or not values[0].strip():
+        return None
+    return float(values[0])
+
+
+def _parse_int_param(qs, name, default):
+    values = qs.get(name)
+    if not values or not values[0].strip():
+        return default
+    return int(values[0])
+
+
+# Any of these switches /api/scrape from the full item list to a filtered, sorted page
+# (stores=, categories=, genders= and min_discount= are applied by the storage query)
+_QUERY_PARAMS = ('min_price', 'max_price', 'brands', 'sort', 'page', 'page_size')
+
+
+def _query_args(qs) -> dict:
+    """ItemStore.query arguments from the query string (ValueError when malformed)"""
+    from item_store import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, SORT_KEYS
+    sort = (qs.get('sort') or ['score'])[0]
+    if sort not in SORT_KEYS:
+        raise ValueError(f'sort must be one of {SORT_KEYS}, got {sort!r}')
+    return {
+        'sort': sort,
+        'page': max(1, _parse_int_param(qs, 'page', 1)),
+        'page_size': max(1, min(_parse_int_param(qs, 'page_size', DEFAULT_PAGE_SIZE), MAX_PAGE_SIZE)),
+        'brands': _parse_list_param(qs, 'brands'),
+        'min_price': _parse_float_param(qs, 'min_price'),
+        'max_price': _parse_float_param(qs, 'max_price'),
+    }
+
+
+def _query_items(store, args: dict) -> dict:
+    """Filtered, sorted page of items from the columnar store
+    (the storage filters were already applied when the items were loaded)"""
+    total, items = store.query(**args)
+    return {
+        'items': items,
+        'total': total,
+        'page': args['page'],
+        'page_size': args['page_size'],
+        'pages': -(-total // args['page_size']),
+    }
+
+
 def _cors_headers():
     return {
         'Content-Type': 'application/json',
@@ -56,6 +136,10 @@ def _cors_headers():
     }
 
 
+# Response keys that change between requests for the same data (kept out of the ETag)
+_VOLATILE_KEYS = ('timestamp', 'cached', 'cache_age_seconds', 'source')
+
+
 class handler(BaseHTTPRequestHandler):
 
     def do_GET(self):
@@ -68,29 +152,68 @@ class handler(BaseHTTPRequestHandler):
             self._handle_scrape(parsed)
 
     # ------------------------------------------------------------------
-    # /api/scrape  — main scrape endpoint
+    # Response writer shared by the endpoints
     # ------------------------------------------------------------------
-    def _handle_scrape(self, parsed):
+    def _send_json(self, response: dict, status: int = 200, cache_control: str = None):
+        """Status and headers go out only now, with the finished (compressed) body"""
+        body, etag = build_body(response, volatile=_VOLATILE_KEYS)
         headers = _cors_headers()
-        self.send_response(200)
+        if cache_control:
+            headers['Cache-Control'] = cache_control
+        headers['Vary'] = 'Accept-Encoding'
+
+        if status == 200:
+            headers['ETag'] = etag
+            if etag_matches(self.headers.get('If-None-Match'), etag):
+                self.send_response(304)
+                for k, v in headers.items():
+                    if k != 'Content-Type':
+                        self.send_header(k, v)
+                self.end_headers()
+                return
+        else:
+            headers['Cache-Control'] = 'no-store'
+
+        body, encoding = compress(body, negotiate_encoding(self.headers.get('Accept-Encoding')))
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        headers['Content-Length'] = str(len(body))
+        self.send_response(status)
         for k, v in headers.items():
             self.send_header(k, v)
         self.end_headers()
+        self.wfile.write(body)
 
+    # ------------------------------------------------------------------
+    # /api/scrape  — main scrape endpoint
+    # ------------------------------------------------------------------
+    def _handle_scrape(self, parsed):
         try:
             qs = parse_qs(parsed.query)
             stores = _parse_list_param(qs, 'stores')
             category_groups = _parse_list_param(qs, 'categories')
-            cache_key = _make_cache_key(stores, None, category_groups)
+            genders = _parse_list_param(qs, 'genders')
+            min_discount = _parse_float_param(qs, 'min_discount')
+            # Filter/sort/page on the server when asked; otherwise the full list as before
+            query_args = _query_args(qs) if any(name in qs for name in _QUERY_PARAMS) else None
+            # group=1: one row per product with the other stores' offers as alternatives
+            grouped = (qs.get('group') or ['0'])[0].lower() in ('1', 'true', 'yes')
+            # fields=name,current_price,...: only these keys of each item
+            fields = _parse_list_param(qs, 'fields')
+        except ValueError as e:
+            # Malformed query parameter (page=abc, sort=unknown, ...)
+            self._send_json({'success': False, 'error': str(e)}, 400)
+            return
 
-            cached_data, cache_age = get_cached_data(cache_key)
+        status = 200
+        try:
+            cache_key = _make_cache_key(stores, genders, category_groups, min_discount)
 
-            api_dir = os.path.dirname(os.path.abspath(__file__))
-            if api_dir not in sys.path:
-                sys.path.insert(0, api_dir)
+            cached_data, cache_age = get_cached_data(cache_key)
 
             if cached_data:
                 print(f'Serving cached data ({cache_age:.0f}s old)', flush=True)
+                items = cached_data
                 response = {
                     'success': True,
                     'items': cached_data,
@@ -100,10 +223,13 @@ class handler(BaseHTTPRequestHandler):
                     'cache_age_seconds': round(cache_age),
                 }
             else:
-                # Read from Supabase (populated by local run_scraper.py)
-                from supabase_client import get_latest_items
-                items = get_latest_items(stores=stores, category_groups=category_groups)
-                print(f'Supabase: loaded {len(items)} items', flush=True)
+                # Read from storage (populated by local run_scraper.py)
+                from storage import STORAGE_BACKEND, get_latest_items
+                # Filtered in the database; sort=score needs the whole filtered set
+                # (category averages), so sorting and paging happen below
+                items = get_latest_items(stores=stores, category_groups=category_groups,
+                                         genders=genders, min_discount=min_discount)
+                print(f'{STORAGE_BACKEND}: loaded {len(items)} items', flush=True)
 
                 set_cache(cache_key, items)
                 response = {
@@ -112,33 +238,37 @@ class handler(BaseHTTPRequestHandler):
                     'total': len(items),
                     'timestamp': datetime.now().isoformat(),
                     'cached': False,
-                    'source': 'supabase',
+                    'source': STORAGE_BACKEND,
                 }
 
+            if grouped:
+                response['items'] = get_grouped_items(cache_key, items)
+                response['total'] = len(response['items'])
+                response['grouped'] = True
+
+            if query_args is not None:
+                store = get_item_store(cache_key, items, grouped=grouped)
+                response.update(_query_items(store, query_args))
+
+            if fields:
+                response['items'] = project_items(response['items'], fields)
+
         except Exception as e:
             import traceback
             print(f'Scrape error: {e}\n{traceback.format_exc()}', flush=True)
+            status = 500
             response = {'success': False, 'error': str(e)}
 
-        self.wfile.write(json.dumps(response, default=str, indent=2).encode())
+        self._send_json(response, status)
 
     # ------------------------------------------------------------------
     # /api/history?product_id=<id>   — price history for one product
     # /api/history?product_ids=<id1,id2,...>  — batch lookup
     # ------------------------------------------------------------------
     def _handle_history(self, parsed):
-        headers = _cors_headers()
-        headers['Cache-Control'] = 'public, max-age=60'
-        self.send_response(200)
-        for k, v in headers.items():
-            self.send_header(k, v)
-        self.end_headers()
-
+        status = 200
         try:
-            api_dir = os.path.dirname(os.path.abspath(__file__))
-            if api_dir not in sys.path:
-                sys.path.insert(0, api_dir)
-            from supabase_client import get_price_history, get_price_history_batch
+            from storage import get_price_history, get_price_history_batch
 
             qs = parse_qs(parsed.query)
 
@@ -151,14 +281,16 @@ class handler(BaseHTTPRequestHandler):
                 rows = get_price_history(pid)
                 response = {'success': True, 'product_id': pid, 'history': rows}
             else:
+                status = 400
                 response = {'success': False, 'error': 'product_id or product_ids required'}
 
         except Exception as e:
             import traceback
             print(f'History error: {e}\n{traceback.format_exc()}', flush=True)
+            status = 500
             response = {'success': False, 'error': str(e)}
 
-        self.wfile.write(json.dumps(response, default=str, indent=2).encode())
+        self._send_json(response, status, cache_control='public, max-age=60')
 
     def do_OPTIONS(self):
         self.send_response(200)
@@ -0,0 +1,217 @@
+"""
+SQLite price history store with the same functions as supabase_client.
+For the scrape box and offline runs/benchmarks: one local database file in WAL
+mode, snapshots indexed on (product_id, scraped_at), and a latest_prices table
+kept up to date by a trigger in the same transaction as each write, so
+latest-item and history reads never scan the history.
+"""
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+
+from price_index import PriceIndex
+from catalog import store_sources
+from supabase_client import LATEST_MAX_AGE, SNAPSHOT_BATCH_SIZE, _GROUP_CATEGORIES, _due_rows, _latest_item
+
+SQLITE_PATH = os.environ.get(
+    'SCRAPER_SQLITE_PATH',
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), '.cache', 'prices.db'))
+
+_SCHEMA = '''
+create table if not exists products (
+    id text primary key,
+    source text, brand text, name text, url text, category text, gender text,
+    -- filter keys, as in the Supabase latest_items view
+    base_category text, gender_key text
+);
+create index if not exists products_source on products (source);
+create table if not exists price_history (
+    product_id text not null references products(id),
+    current_price real, original_price real, discount_percent real,
+    scraped_at text not null
+);
+create index if not exists price_history_product_scraped on price_history (product_id, scraped_at);
+-- One snapshot per product per hour, like the Supabase unique index
+create unique index if not exists price_history_product_hour on price_history (product_id, substr(scraped_at, 1, 13));
+create table if not exists latest_prices (
+    product_id text primary key references products(id),
+    current_price real, original_price real, discount_percent real,
+    scraped_at text not null
+);
+create index if not exists latest_prices_scraped on latest_prices (scraped_at);
+-- Kept current by every snapshot stored (a rescrape within the hour replaces that hour's row)
+create trigger if not exists price_history_latest after insert on price_history begin
+    insert into latest_prices values (new.product_id, new.current_price, new.original_price,
+                                      new.discount_percent, new.scraped_at)
+    on conflict(product_id) do update set
+        current_price = excluded.current_price, original_price = excluded.original_price,
+        discount_percent = excluded.discount_percent, scraped_at = excluded.scraped_at
+    where excluded.scraped_at >= latest_prices.scraped_at;
+end;
+create trigger if not exists price_history_latest_update after update on price_history begin
+    insert into latest_prices values (new.product_id, new.current_price, new.original_price,
+                                      new.discount_percent, new.scraped_at)
+    on conflict(product_id) do update set
+        current_price = excluded.current_price, original_price = excluded.original_price,
+        discount_percent = excluded.discount_percent, scraped_at = excluded.scraped_at
+    where excluded.scraped_at >= latest_prices.scraped_at;
+end;'''
+
+# The newest snapshot of an hour wins, so a price change is never dropped as a duplicate
+_INSERT_SNAPSHOT = (
+    'insert into price_history values (?,?,?,?,?) '
+    'on conflict(product_id, substr(scraped_at, 1, 13)) do update set '
+    'current_price = excluded.current_price, original_price = excluded.original_price, '
+    'discount_percent = excluded.discount_percent, scraped_at = excluded.scraped_at'
+)
+
+_PAGE_SUFFIX_RE = re.compile(r' Page [0-9]+$')
+
+_LATEST_SELECT = '''
+select p.id as product_id, p.source, p.brand, p.name, p.url, p.category, p.gender,
+       l.current_price, l.original_price, l.discount_percent, l.scraped_at
+from latest_prices l join products p on p.id = l.product_id
+'''
+
+_conn = None
+_lock = threading.Lock()
+
+
+def _connect() -> sqlite3.Connection:
+    """The module's connection, opened (and the schema created) on first use"""
+    global _conn
+    if _conn is None:
+        directory = os.path.dirname(SQLITE_PATH)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        conn = sqlite3.connect(SQLITE_PATH, check_same_thread=False)
+        conn.row_factory = sqlite3.Row
+        conn.execute('pragma journal_mode=wal')
+        # WAL makes NORMAL durable against application crashes; only an OS crash can lose the last commit
+        conn.execute('pragma synchronous=normal')
+        conn.execute('pragma foreign_keys=on')
+        conn.executescript(_SCHEMA)
+        _conn = conn
+    return _conn
+
+
+def _now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec='seconds')
+
+
+def _since(seconds: float) -> str:
+    """Timestamp `seconds` ago, in the format _now() writes"""
+    return datetime.fromtimestamp(time.time() - seconds, timezone.utc).isoformat(timespec='seconds')
+
+
+def save_price_history(items: list, index: PriceIndex = None) -> dict:
+    """
+    Upsert products and insert price snapshots for a list of scraped items.
+    Returns the same counts as supabase_client.save_price_history.
+    """
+    products, snapshots, skipped, reasons = _due_rows(items, index)
+    summary = {'written': 0, 'batches': 0, 'failed_batches': 0,
+               'skipped_unchanged': skipped, 'reasons': reasons}
+    if not snapshots:
+        return summary
+
+    scraped_at = _now()
+    product_rows = [
+        (p['id'], p['source'], p['brand'], p['name'], p['url'], p['category'], p['gender'],
+         _PAGE_SUFFIX_RE.sub('', p['category']), p['gender'].lower())
+        for p in products
+    ]
+    snapshot_rows = [
+        (s['product_id'], s['current_price'], s['original_price'], s['discount_percent'], scraped_at)
+        for s in snapshots
+    ]
+    conn = _connect()
+    with _lock, conn:
+        # Product metadata rarely changes - keep the first row, as the Supabase upsert does
+        conn.executemany(
+            'insert or ignore into products (id, source, brand, name, url, category, gender, base_category, gender_key) '
+            'values (?,?,?,?,?,?,?,?,?)', product_rows)
+        for start in range(0, len(snapshot_rows), SNAPSHOT_BATCH_SIZE):
+            cursor = conn.executemany(_INSERT_SNAPSHOT, snapshot_rows[start:start + SNAPSHOT_BATCH_SIZE])
+            summary['written'] += cursor.rowcount
+            summary['batches'] += 1
+
+    if index is not None:
+        now = time.time()
+        for row in snapshots:
+            index.record(row, now)
+    print(f'SQLite: saved {summary["written"]} price snapshots'
+          f'{f", {skipped} unchanged skipped" if index is not None else ""}', flush=True)
+    return summary
+
+
+def get_recent_snapshots(since_seconds: float, page_size: int = 1000) -> list:
+    """Newest snapshot per product written in the last `since_seconds` (rebuilds a PriceIndex)"""
+    since = _since(since_seconds)
+    rows = _connect().execute(
+        'select product_id, current_price, original_price, discount_percent, scraped_at '
+        'from latest_prices where scraped_at >= ? order by scraped_at desc', (since,))
+    return [dict(row) for row in rows]
+
+
+def get_latest_items(stores=None, category_groups=None, genders=None, min_discount=None,
+                     page_size: int = None, max_age: float = LATEST_MAX_AGE) -> list:
+    """Return the latest scraped item for each product matching the filters, leaving out
+    products with no snapshot in the last `max_age` seconds (delisted)
+    (page_size is accepted for parity with supabase_client; one query returns all rows)"""
+    where = ['l.scraped_at >= ?']
+    params = [_since(max_age)]
+
+    def any_of(column, values):
+        values = sorted(values)
+        where.append(f"{column} in ({','.join('?' * len(values))})")
+        params.extend(values)
+
+    if stores:
+        sources = store_sources(stores)
+        if not sources:
+            return []
+        any_of('p.source', sources)
+    if category_groups:
+        categories = set()
+        for group in category_groups:
+            categories.update(_GROUP_CATEGORIES.get(group, ()))
+        if not categories:
+            return []
+        any_of('p.base_category', categories)
+    if genders:
+        any_of('p.gender_key', {g.lower() for g in genders})
+    if min_discount is not None:
+        where.append('l.discount_percent >= ?')
+        params.append(float(min_discount))
+
+    sql = _LATEST_SELECT + f" where {' and '.join(where)} order by l.product_id"
+    return [_latest_item(dict(row)) for row in _connect().execute(sql, params)]
+
+
+def get_price_history(product_id: str) -> list:
+    """Return price history rows for a single product, newest first, last 90 days."""
+    rows = _connect().execute(
+        'select current_price, original_price, discount_percent, scraped_at from price_history '
+        'where product_id = ? order by scraped_at desc limit 90', (product_id,))
+    return [dict(row) for row in rows]
+
+
+def get_price_history_batch(product_ids: list) -> dict:
+    """Return price history for multiple products keyed by product_id."""
+    if not product_ids:
+        return {}
+    rows = _connect().execute(
+        f"select product_id, current_price, scraped_at from price_history "
+        f"where product_id in ({','.join('?' * len(product_ids))}) order by scraped_at desc limit 500",
+        list(product_ids))
+    result = {}
+    for row in rows:
+        result.setdefault(row['product_id'], []).append({
+            'price': row['current_price'],
+            'scraped_at': row['scraped_at'],
+        })
+    return result
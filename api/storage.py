@@ -0,0 +1,26 @@
+"""
+Price history storage, selected by the SCRAPER_STORAGE environment variable:
+'supabase' (default, the hosted database) or 'sqlite' (a local file, see
+sqlite_client.py). Both expose the same functions.
+"""
+import os
+
+from supabase_client import _product_id  # noqa: F401  (same IDs in every backend)
+
+STORAGE_BACKEND = os.environ.get('SCRAPER_STORAGE', 'supabase').strip().lower()
+
+if STORAGE_BACKEND == 'sqlite':
+    from sqlite_client import (  # noqa: F401
+        SQLITE_PATH, get_latest_items, get_price_history, get_price_history_batch, get_recent_snapshots,
+        save_price_history,
+    )
+    # The database written to (keys caches of its contents, such as the price index)
+    STORAGE_TARGET = f'sqlite:{os.path.abspath(SQLITE_PATH)}'
+elif STORAGE_BACKEND == 'supabase':
+    from supabase_client import (  # noqa: F401
+        SUPABASE_URL, get_latest_items, get_price_history, get_price_history_batch, get_recent_snapshots,
+        save_price_history,
+    )
+    STORAGE_TARGET = f'supabase:{SUPABASE_URL}'
+else:
+    raise ValueError(f"SCRAPER_STORAGE must be 'supabase' or 'sqlite', got {STORAGE_BACKEND!r}")
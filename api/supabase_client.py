@@ -1,13 +1,21 @@
 """
 Supabase price history client.
-Upserts products and inserts price snapshots after each scrape.
+Upserts products and inserts price snapshots after each scrape (batched,
+compressed and concurrent - see bulk_writer.py). With a PriceIndex only
+snapshots whose price changed (or whose heartbeat is due) are written.
 """
 import hashlib
 import json
 import os
+import time
 import urllib.request
 import urllib.error
-from datetime import datetime
+from datetime import datetime, timezone
+from urllib.parse import quote, urlencode
+
+from bulk_writer import BulkWriter
+from catalog import CATEGORY_GROUPS, store_sources
+from price_index import HEARTBEAT_SECONDS, PriceIndex
 
 SUPABASE_URL = os.environ.get('SUPABASE_URL', '')
 SUPABASE_KEY = os.environ.get('SUPABASE_KEY', '')
@@ -19,6 +27,21 @@ _HEADERS = {
     'Prefer': 'return=minimal',
 }
 
+# Rows per bulk POST: snapshot rows are a few numbers, product rows carry names and URLs
+PRODUCT_BATCH_SIZE = 500
+SNAPSHOT_BATCH_SIZE = 1000
+# Batches in flight at once (one pooled keep-alive connection each)
+WRITE_CONCURRENCY = 4
+# Rows per latest_items request (Supabase caps responses at 1000 rows by default)
+LATEST_PAGE_SIZE = 1000
+# Live products get a snapshot at least every heartbeat; older ones are delisted
+LATEST_MAX_AGE = 3 * HEARTBEAT_SECONDS
+
+_LATEST_COLUMNS = ('product_id,source,brand,name,url,category,gender,'
+                   'current_price,original_price,discount_percent,scraped_at')
+# group -> category keys, matched against latest_items.base_category
+_GROUP_CATEGORIES = {group: frozenset(keys) for group, keys in CATEGORY_GROUPS.items()}
+
 
 def _request(method: str, path: str, body=None, extra_headers=None) -> dict:
     url = f'{SUPABASE_URL}/rest/v1/{path}'
@@ -52,24 +75,21 @@ def _parse_price(price_str) -> float | None:
         return None
 
 
-def save_price_history(items: list) -> int:
-    """
-    Upsert products and insert price snapshots for a list of scraped items.
-    Returns the number of snapshots successfully written.
-    """
-    if not items:
-        return 0
-
+def _price_rows(items: list) -> tuple:
+    """(products, snapshots) rows for the scraped items that have a price"""
     products = []
     snapshots = []
+    seen = set()
 
     for item in items:
         pid = _product_id(item)
         current = _parse_price(item.get('current_price'))
         original = _parse_price(item.get('original_price'))
 
-        if current is None:
+        # One row per product: the same URL can be listed under two categories
+        if current is None or pid in seen:
             continue
+        seen.add(pid)
 
         products.append({
             'id': pid,
@@ -88,75 +108,214 @@ def save_price_history(items: list) -> int:
             'discount_percent': item.get('discount_percent'),
         })
 
-    # Upsert products (ignore conflicts — metadata rarely changes)
-    if products:
-        _request(
-            'POST',
-            'products?on_conflict=id',
-            body=products,
+    return products, snapshots
+
+
+def _due_rows(items: list, index: PriceIndex = None) -> tuple:
+    """(products, snapshots, skipped, reasons): the rows worth writing given the index"""
+    products, snapshots = _price_rows(items)
+    if index is None:
+        return products, snapshots, 0, {}
+    now = time.time()
+    due = []
+    reasons = {}
+    for row in snapshots:
+        reason = index.due(row, now)
+        if reason is not None:
+            reasons[reason] = reasons.get(reason, 0) + 1
+            due.append(row)
+    # Unchanged products were upserted when their last snapshot was written
+    wanted = {row['product_id'] for row in due}
+    products = [row for row in products if row['id'] in wanted]
+    return products, due, len(snapshots) - len(due), reasons
+
+
+def write_price_history(items: list, index: PriceIndex = None) -> dict:
+    """
+    Upsert products, then insert price snapshots, as concurrent gzip batches.
+    With an index, snapshots that are not due (same prices, heartbeat not reached)
+    are skipped along with their product rows, and written ones are recorded in it.
+    Returns the per-batch results: {'products': [BatchResult], 'price_history': [BatchResult],
+    'skipped': int, 'reasons': {'new'|'changed'|'heartbeat': int}}.
+    """
+    products, snapshots, skipped, reasons = _due_rows(items, index)
+    with BulkWriter(f'{SUPABASE_URL}/rest/v1', _HEADERS, concurrency=WRITE_CONCURRENCY) as writer:
+        # Upsert products (ignore conflicts — metadata rarely changes)
+        product_results = writer.write(
+            'products?on_conflict=id', products, PRODUCT_BATCH_SIZE,
             extra_headers={'Prefer': 'resolution=ignore-duplicates,return=minimal'},
         )
+        # Snapshots reference their product: drop those whose product batch failed
+        failed = set()
+        for result in product_results:
+            if not result.ok:
+                start = result.index * PRODUCT_BATCH_SIZE
+                failed.update(row['id'] for row in products[start:start + PRODUCT_BATCH_SIZE])
+        if failed:
+            snapshots = [row for row in snapshots if row['product_id'] not in failed]
 
-    # Insert price snapshots — the unique index on (product_id, hour) prevents duplicates
-    if snapshots:
-        _request(
-            'POST',
-            'price_history',
-            body=snapshots,
-            extra_headers={'Prefer': 'return=minimal'},
+        # Upsert price snapshots on (product_id, hour) (supabase/price_history_hour.sql): a rerun
+        # within the hour replaces that hour's row, as in the SQLite backend, instead of a 409
+        scraped_at = datetime.now(timezone.utc).isoformat()
+        snapshots = [{**row, 'scraped_at': scraped_at} for row in snapshots]
+        snapshot_results = writer.write(
+            'price_history?on_conflict=product_id,hour', snapshots, SNAPSHOT_BATCH_SIZE,
+            extra_headers={'Prefer': 'resolution=merge-duplicates,return=minimal'},
         )
 
-    print(f'Supabase: saved {len(snapshots)} price snapshots', flush=True)
-    return len(snapshots)
+    if index is not None:
+        now = time.time()
+        for result in snapshot_results:
+            if result.ok:
+                start = result.index * SNAPSHOT_BATCH_SIZE
+                for row in snapshots[start:start + SNAPSHOT_BATCH_SIZE]:
+                    index.record(row, now)
+
+    for result in product_results + snapshot_results:
+        if not result.ok:
+            print(f'Supabase {result.table} batch {result.index} ({result.rows} rows) failed after '
+                  f'{result.attempts} attempts -> {result.status}: {result.error}', flush=True)
+    return {'products': product_results, 'price_history': snapshot_results,
+            'skipped': skipped, 'reasons': reasons}
 
 
-def get_latest_items(stores=None, category_groups=None) -> list:
+def write_summary(results: dict) -> dict:
+    """Counts for a write_price_history result (printed, and added to the run report)"""
+    snapshot_results = results['price_history']
+    return {
+        'written': sum(result.rows for result in snapshot_results if result.ok),
+        'batches': len(snapshot_results),
+        'failed_batches': sum(not result.ok for result in snapshot_results)
+                          + sum(not result.ok for result in results['products']),
+        'skipped_unchanged': results.get('skipped', 0),
+        'reasons': results.get('reasons', {}),
+    }
+
+
+def save_price_history(items: list, index: PriceIndex = None) -> dict:
     """
-    Return the latest scraped item for each product from Supabase.
-    Joins products + most recent price_history snapshot.
+    Upsert products and insert price snapshots for a list of scraped items.
+    Returns write_summary counts ('written' is the number of snapshots stored).
     """
-    # Fetch latest snapshot per product using a view or RPC if available,
-    # otherwise fetch recent price_history + products separately and merge.
-    path = (
-        'price_history'
-        '?order=scraped_at.desc'
-        '&limit=2000'
-        '&select=product_id,current_price,original_price,discount_percent,scraped_at,'
-        'products(source,brand,name,url,category,gender)'
-    )
-    rows = _request('GET', path, extra_headers={'Prefer': ''})
-    if not isinstance(rows, list):
-        return []
+    if not items:
+        return write_summary({'products': [], 'price_history': []})
 
-    # Deduplicate — keep only the most recent snapshot per product
-    seen = set()
-    items = []
-    for row in rows:
-        pid = row.get('product_id')
-        if pid in seen:
-            continue
-        seen.add(pid)
-        product = row.get('products') or {}
-        source = product.get('source', '')
-        category = product.get('category', '')
+    summary = write_summary(write_price_history(items, index))
+    failed = summary['failed_batches']
+    unchanged = f", {summary['skipped_unchanged']} unchanged skipped" if index is not None else ''
+    print(f'Supabase: saved {summary["written"]} price snapshots in {summary["batches"]} batches'
+          f'{f" ({failed} failed)" if failed else ""}{unchanged}', flush=True)
+    return summary
 
-        if stores and source.lower().replace(' ', '') not in [s.lower().replace(' ', '') for s in stores]:
-            continue
 
-        items.append({
-            'product_id': pid,
-            'source': source,
-            'brand': product.get('brand', ''),
-            'name': product.get('name', ''),
-            'url': product.get('url', ''),
-            'category': category,
-            'gender': product.get('gender', 'Men'),
-            'current_price': f"${row['current_price']:.2f}" if row.get('current_price') else 'N/A',
-            'original_price': f"${row['original_price']:.2f}" if row.get('original_price') else 'N/A',
-            'discount_percent': row.get('discount_percent', 0),
-            'scraped_at': row.get('scraped_at', ''),
-        })
+def get_recent_snapshots(since_seconds: float, page_size: int = 1000) -> list:
+    """
+    Newest snapshot per product among those written in the last `since_seconds`,
+    for rebuilding a PriceIndex. Older products are due a heartbeat anyway.
+    """
+    since = _since(since_seconds)
+    latest = {}
+    offset = 0
+    while True:
+        path = (
+            f'price_history'
+            f'?scraped_at=gte.{quote(since)}'
+            f'&order=scraped_at.desc'
+            f'&select=product_id,current_price,original_price,discount_percent,scraped_at'
+            f'&limit={page_size}&offset={offset}'
+        )
+        rows = _request('GET', path, extra_headers={'Prefer': ''})
+        if not isinstance(rows, list) or not rows:
+            break
+        for row in rows:
+            latest.setdefault(row['product_id'], row)
+        if len(rows) < page_size:
+            break
+        offset += page_size
+    return list(latest.values())
+
+
+def _in_filter(values) -> str:
+    """PostgREST in.(...) list, values quoted so commas and spaces survive"""
+    return 'in.(' + ','.join('"' + v.replace('\\', '\\\\').replace('"', '\\"') + '"' for v in sorted(values)) + ')'
+
 
+def _since(seconds: float) -> str:
+    """ISO UTC timestamp `seconds` ago"""
+    return datetime.fromtimestamp(time.time() - seconds, timezone.utc).isoformat()
+
+
+def latest_items_filters(stores=None, category_groups=None, genders=None, min_discount=None,
+                         max_age: float = LATEST_MAX_AGE):
+    """
+    PostgREST query parameters for the latest_items view (see supabase/latest_items.sql),
+    or None when the filters cannot match anything (unknown stores or category groups).
+    """
+    params = [('scraped_at', f'gte.{_since(max_age)}')]
+    if stores:
+        sources = store_sources(stores)
+        if not sources:
+            return None
+        params.append(('source', _in_filter(sources)))
+    if category_groups:
+        categories = set()
+        for group in category_groups:
+            categories.update(_GROUP_CATEGORIES.get(group, ()))
+        if not categories:
+            return None
+        params.append(('base_category', _in_filter(categories)))
+    if genders:
+        params.append(('gender_key', _in_filter({g.lower() for g in genders})))
+    if min_discount is not None:
+        params.append(('discount_percent', f'gte.{float(min_discount)}'))
+    return params
+
+
+def _latest_item(row: dict) -> dict:
+    return {
+        'product_id': row['product_id'],
+        'source': row.get('source') or '',
+        'brand': row.get('brand') or '',
+        'name': row.get('name') or '',
+        'url': row.get('url') or '',
+        'category': row.get('category') or '',
+        'gender': row.get('gender') or 'Men',
+        'current_price': f"${row['current_price']:.2f}" if row.get('current_price') else 'N/A',
+        'original_price': f"${row['original_price']:.2f}" if row.get('original_price') else 'N/A',
+        'discount_percent': row.get('discount_percent') or 0,
+        'scraped_at': row.get('scraped_at') or '',
+    }
+
+
+def get_latest_items(stores=None, category_groups=None, genders=None, min_discount=None,
+                     page_size: int = LATEST_PAGE_SIZE, max_age: float = LATEST_MAX_AGE) -> list:
+    """
+    Return the latest scraped item for each product matching the filters.
+    Filtering happens in the latest_items view; products without a snapshot in the
+    last `max_age` seconds are delisted and left out. Rows are fetched in keyset
+    pages (product_id > last seen) until the view is exhausted, so nothing is capped.
+    Raises RuntimeError when the query fails (e.g. the view has not been created).
+    """
+    filters = latest_items_filters(stores, category_groups, genders, min_discount, max_age)
+    if filters is None:
+        return []
+
+    items = []
+    last_id = None
+    while True:
+        params = list(filters)
+        if last_id is not None:
+            params.append(('product_id', f'gt.{last_id}'))
+        params += [('select', _LATEST_COLUMNS), ('order', 'product_id'), ('limit', str(page_size))]
+        query = urlencode(params, safe=',()', quote_via=quote)
+        rows = _request('GET', f'latest_items?{query}', extra_headers={'Prefer': ''})
+        if not isinstance(rows, list):
+            # _request has printed the error; an empty list here would be cached and served as "no deals"
+            raise RuntimeError('latest_items query failed - has supabase/latest_items.sql been applied?')
+        items.extend(_latest_item(row) for row in rows)
+        if len(rows) < page_size:
+            break
+        last_id = rows[-1]['product_id']
     return items
 
 
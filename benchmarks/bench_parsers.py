@@ -0,0 +1,194 @@
+"""
+Offline parser benchmark: runs each parse_*_category over stored HTML fixtures
+(no network) and reports ms/page, items/sec and peak memory. Results can be
+written as JSON and compared against a previous run.
+
+Usage:
+    python benchmarks/bench_parsers.py                       # default fixtures, lxml engine
+    python benchmarks/bench_parsers.py --engine lxml soup --json bench.json
+    python benchmarks/bench_parsers.py --fixture asos=saved/asos.html --stores asos
+    python benchmarks/bench_parsers.py --compare baseline.json --json current.json
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+try:
+    import resource  # Unix only
+except ImportError:
+    resource = None
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from discount_scraper_async import AsyncDiscountScraper, PARSER_ENGINES  # noqa: E402
+
+STORES = ['iconic', 'asos', 'myer', 'jbhifi', 'davidjones']
+
+# Fixtures checked into the repo (both are The Iconic category pages)
+DEFAULT_FIXTURES = {
+    'iconic': ['iconic_page.html', 'debug_page.html'],
+}
+
+
+def _load_fixtures(specs):
+    """{store: [path, ...]} from the defaults plus --fixture store=path overrides"""
+    fixtures = {}
+    if not specs:
+        for store, names in DEFAULT_FIXTURES.items():
+            fixtures[store] = [os.path.join(ROOT, name) for name in names]
+        return fixtures
+    for spec in specs:
+        store, _, path = spec.partition('=')
+        if store not in STORES or not path:
+            raise SystemExit(f"--fixture expects store=path with store in {STORES}, got {spec!r}")
+        fixtures.setdefault(store, []).append(path)
+    return fixtures
+
+
+def _parse_once(engine, store, html):
+    scraper = AsyncDiscountScraper(use_http_cache=False, use_page_store=False, parser_engine=engine)
+    return scraper.parse_page(store, html, 'Benchmark', 'Men')
+
+
+def _rss_child(engine, store, html, conn):
+    base = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    _parse_once(engine, store, html)
+    conn.send(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss - base)
+    conn.close()
+
+
+def _peak_rss_kb(engine, store, html):
+    """Peak RSS growth of one parse in a forked child (None where fork is unavailable).
+
+    tracemalloc cannot see libxml2's allocations, so this is the number to watch
+    for the lxml engine.
+    """
+    if resource is None or 'fork' not in multiprocessing.get_all_start_methods():
+        return None
+    ctx = multiprocessing.get_context('fork')
+    parent, child = ctx.Pipe(duplex=False)
+    proc = ctx.Process(target=_rss_child, args=(engine, store, html, child))
+    proc.start()
+    growth = parent.recv()
+    proc.join()
+    # ru_maxrss is KiB on Linux, bytes on macOS
+    return growth // 1024 if sys.platform == 'darwin' else growth
+
+
+def bench_case(engine, store, path, repeat):
+    with open(path, encoding='utf-8') as f:
+        html = f.read()
+
+    scraper = AsyncDiscountScraper(use_http_cache=False, use_page_store=False, parser_engine=engine)
+    timings = []
+    items = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = scraper.parse_page(store, html, 'Benchmark', 'Men')
+        timings.append(time.perf_counter() - start)
+
+    tracemalloc.start()
+    scraper.parse_page(store, html, 'Benchmark', 'Men')
+    _, py_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    best = min(timings)
+    return {
+        'fixture': os.path.basename(path),
+        'bytes': len(html.encode('utf-8')),
+        'store': store,
+        'engine': engine,
+        'items': len(items),
+        'ms_per_page': round(best * 1000, 3),
+        'ms_per_page_median': round(sorted(timings)[len(timings) // 2] * 1000, 3),
+        'items_per_sec': round(len(items) / best, 1) if best > 0 else None,
+        'py_peak_kb': py_peak // 1024,
+        'rss_peak_kb': _peak_rss_kb(engine, store, html),
+    }
+
+
+def _git_commit():
+    try:
+        return subprocess.check_output(['git', 'rev-parse', '--short', 'HEAD'], cwd=ROOT,
+                                       stderr=subprocess.DEVNULL).decode().strip()
+    except Exception:
+        return None
+
+
+def _print_results(results, baseline=None):
+    base = {}
+    if baseline:
+        base = {(r['fixture'], r['store'], r['engine']): r for r in baseline.get('results', [])}
+    print(f"{'fixture':<20} {'store':<11} {'engine':<6} {'items':>5} {'ms/page':>9} {'items/s':>9} "
+          f"{'py KiB':>8} {'rss KiB':>8}" + ('  vs baseline' if base else ''))
+    for r in results:
+        line = (f"{r['fixture']:<20} {r['store']:<11} {r['engine']:<6} {r['items']:>5} {r['ms_per_page']:>9.2f} "
+                f"{r['items_per_sec'] or 0:>9.0f} {r['py_peak_kb']:>8} {r['rss_peak_kb'] if r['rss_peak_kb'] is not None else '-':>8}")
+        old = base.get((r['fixture'], r['store'], r['engine']))
+        if old:
+            delta = (r['ms_per_page'] - old['ms_per_page']) / old['ms_per_page'] * 100 if old['ms_per_page'] else 0
+            line += f"  {delta:+6.1f}% time"
+            if old['items'] != r['items']:
+                line += f", items {old['items']} -> {r['items']}"
+        print(line)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline parser benchmark over stored HTML fixtures')
+    parser.add_argument('--fixture', action='append', metavar='STORE=PATH',
+                        help='Fixture for a store parser (repeatable); defaults to the checked-in Iconic pages')
+    parser.add_argument('--stores', nargs='+', choices=STORES,
+                        help='Only these parsers (default: the stores that have fixtures)')
+    parser.add_argument('--all-parsers', action='store_true',
+                        help='Run every store parser over every fixture (measures traversal cost on foreign markup)')
+    parser.add_argument('--engine', nargs='+', choices=PARSER_ENGINES, default=['lxml'])
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--json', metavar='PATH', help='Write machine-readable results here')
+    parser.add_argument('--compare', metavar='PATH', help='Previous --json output to diff against')
+    args = parser.parse_args()
+
+    fixtures = _load_fixtures(args.fixture)
+    cases = []
+    for fixture_store, paths in fixtures.items():
+        parsers = STORES if args.all_parsers else [fixture_store]
+        for store in parsers:
+            if args.stores and store not in args.stores:
+                continue
+            for path in paths:
+                for engine in args.engine:
+                    cases.append((engine, store, path))
+
+    results = [bench_case(engine, store, path, args.repeat) for engine, store, path in cases]
+
+    baseline = None
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+    _print_results(results, baseline)
+
+    if args.json:
+        report = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(),
+                'commit': _git_commit(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'repeat': args.repeat,
+            },
+            'results': results,
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
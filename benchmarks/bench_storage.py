@@ -0,0 +1,141 @@
+"""
+Offline storage benchmark: runs the SQLite backend (api/sqlite_client.py)
+over synthetic scrapes in a temporary database and reports write throughput
+and read latency for the latest-items and price-history lookups.
+
+Usage:
+    python benchmarks/bench_storage.py                         # 5000 products, 5 runs
+    python benchmarks/bench_storage.py --products 20000 --runs 10 --changed 0.1
+    python benchmarks/bench_storage.py --delta --json storage.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'api'))
+
+SOURCES = ['The Iconic', 'ASOS', 'Myer', 'JB Hi-Fi', 'David Jones']
+CATEGORIES = ['Shirts', 'Shirts Page 2', 'Jeans', 'Sneakers', 'Jackets & Coats', 'Headphones']
+
+
+def _items(count, rng):
+    items = []
+    for i in range(count):
+        original = rng.randint(2000, 40000)
+        current = original * rng.randint(30, 90) // 100
+        items.append({
+            'source': SOURCES[i % len(SOURCES)],
+            'brand': f'Brand {i % 300}',
+            'name': f'Product {i}',
+            'url': f'https://example.com/p/{i}',
+            'category': CATEGORIES[i % len(CATEGORIES)],
+            'gender': 'Men' if i % 3 else 'Women',
+            'current_price': f'${current / 100:.2f}',
+            'original_price': f'${original / 100:.2f}',
+            'discount_percent': round((1 - current / original) * 100),
+        })
+    return items
+
+
+def _reprice(items, share, rng):
+    """A copy of the scrape with `share` of the prices changed"""
+    changed = []
+    for item in items:
+        if rng.random() < share:
+            price = float(item['current_price'][1:]) * rng.choice((0.9, 0.95, 1.05))
+            item = dict(item, current_price=f'${price:.2f}')
+        changed.append(item)
+    return changed
+
+
+def _best_ms(fn, repeat):
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        timings.append(time.perf_counter() - start)
+    return round(min(timings) * 1000, 3)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Offline benchmark of the SQLite storage backend')
+    parser.add_argument('--products', type=int, default=5000)
+    parser.add_argument('--runs', type=int, default=5, help='Scrapes written (one simulated hour apart)')
+    parser.add_argument('--changed', type=float, default=0.05, help='Share of prices changed per run')
+    parser.add_argument('--delta', action='store_true', help='Write through a PriceIndex (changes + heartbeats only)')
+    parser.add_argument('--repeat', type=int, default=20)
+    parser.add_argument('--json', metavar='PATH', help='Write machine-readable results here')
+    args = parser.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix='bench_storage_')
+    os.environ['SCRAPER_SQLITE_PATH'] = os.path.join(tmp, 'prices.db')
+    import sqlite_client
+    from price_index import PriceIndex
+    from supabase_client import _product_id
+
+    rng = random.Random(1)
+    items = _items(args.products, rng)
+    index = PriceIndex(os.path.join(tmp, 'price_index.json')) if args.delta else None
+
+    writes = []
+    written = skipped = 0
+    # The last run lands in the current hour, so the latest-items reads see every product as listed
+    first_hour = datetime.now(timezone.utc).replace(minute=0, second=0, microsecond=0) - timedelta(hours=args.runs - 1)
+    for run in range(args.runs):
+        if run:
+            items = _reprice(items, args.changed, rng)
+        # Each run lands in its own hour, as scheduled scrapes do
+        hour = (first_hour + timedelta(hours=run)).isoformat(timespec='seconds')
+        sqlite_client._now = lambda hour=hour: hour
+        start = time.perf_counter()
+        summary = sqlite_client.save_price_history(items, index)
+        writes.append(time.perf_counter() - start)
+        written += summary['written']
+        skipped += summary['skipped_unchanged']
+
+    ids = [_product_id(item) for item in items[:100]]
+    reads = {
+        'latest_all_ms': _best_ms(sqlite_client.get_latest_items, args.repeat),
+        'latest_filtered_ms': _best_ms(lambda: sqlite_client.get_latest_items(
+            stores=['iconic'], category_groups=['tops'], genders=['Men'], min_discount=30), args.repeat),
+        'history_one_ms': _best_ms(lambda: sqlite_client.get_price_history(ids[0]), args.repeat),
+        'history_batch_100_ms': _best_ms(lambda: sqlite_client.get_price_history_batch(ids), args.repeat),
+    }
+    result = {
+        'products': args.products,
+        'runs': args.runs,
+        'delta': args.delta,
+        'snapshots_written': written,
+        'snapshots_skipped': skipped,
+        'write_s_total': round(sum(writes), 3),
+        'rows_per_sec': round(written / sum(writes)) if sum(writes) else None,
+        'db_bytes': os.path.getsize(os.environ['SCRAPER_SQLITE_PATH']),
+        **reads,
+    }
+    for key, value in result.items():
+        print(f'{key:<22} {value}')
+
+    if args.json:
+        report = {
+            'meta': {
+                'timestamp': datetime.now().isoformat(),
+                'python': platform.python_version(),
+                'platform': platform.platform(),
+                'repeat': args.repeat,
+            },
+            'results': [result],
+        }
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nWrote {args.json}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,94 @@
+"""
+Compare the compiled lxml spec engine against the reference BeautifulSoup parsers.
+Runs every store parser over every fixture with both engines, checks that the
+same items come out (also when the lxml engine parses the page as a streamed
+body) and prints the timings. Each fixture is also run with a featured-product
+JSON-LD block injected, which must not replace the product grid.
+
+Usage: python benchmarks/compare_selectors.py [fixture.html ...] [--repeat N]
+"""
+import argparse
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+from discount_scraper_async import AsyncDiscountScraper  # noqa: E402
+from stores import get_adapter  # noqa: E402
+from stream_parse import STREAM_CHUNK_SIZE, StreamedPage  # noqa: E402
+
+DEFAULT_FIXTURES = ['iconic_page.html', 'debug_page.html']
+STORES = ['iconic', 'asos', 'myer', 'jbhifi', 'davidjones']
+
+# One product-shaped JSON-LD object, as a "featured product" widget ships it
+FEATURED_PRODUCT = ('<script type="application/ld+json">{"@context": "https://schema.org", "@type": "Product", '
+                    '"name": "Featured Jacket", "url": "/featured-jacket.html", "brand": {"name": "Featured"}, '
+                    '"offers": {"@type": "Offer", "price": "99.00", "priceCurrency": "AUD"}}</script>')
+
+
+def _comparable(items):
+    return [{k: v for k, v in deal.to_dict().items() if k != 'scraped_at'} for deal in items]
+
+
+def _with_featured_product(html):
+    head_end = html.find('</head>')
+    return html[:head_end] + FEATURED_PRODUCT + html[head_end:] if head_end >= 0 else FEATURED_PRODUCT + html
+
+
+def _streamed(store, body):
+    """The page as fetch_page builds it from a chunked response body"""
+    page = StreamedPage(get_adapter(store).spec)
+    for start in range(0, len(body), STREAM_CHUNK_SIZE):
+        page.feed(body[start:start + STREAM_CHUNK_SIZE])
+    page.close()
+    return page
+
+
+def _time_parse(scraper, store, html, repeat):
+    best = float('inf')
+    items = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        items = scraper.parse_page(store, html, 'Benchmark', 'Men')
+        best = min(best, time.perf_counter() - start)
+    return best, items
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('fixtures', nargs='*', default=[os.path.join(ROOT, f) for f in DEFAULT_FIXTURES])
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    soup = AsyncDiscountScraper(use_http_cache=False, use_page_store=False, parser_engine='soup')
+    lxml = AsyncDiscountScraper(use_http_cache=False, use_page_store=False, parser_engine='lxml')
+
+    mismatches = 0
+    print(f"{'fixture':<20} {'store':<11} {'items':>5} {'soup ms':>9} {'lxml ms':>9} {'speedup':>8}  same")
+    cases = []
+    for path in args.fixtures:
+        with open(path, encoding='utf-8') as f:
+            html = f.read()
+        cases.append((os.path.basename(path), html))
+        cases.append((os.path.basename(path) + '+ld', _with_featured_product(html)))
+
+    for name, html in cases:
+        for store in STORES:
+            soup_time, soup_items = _time_parse(soup, store, html, args.repeat)
+            lxml_time, lxml_items = _time_parse(lxml, store, html, args.repeat)
+            streamed_items = lxml.parse_page(store, _streamed(store, html.encode('utf-8')), 'Benchmark', 'Men')
+            same = _comparable(soup_items) == _comparable(lxml_items) == _comparable(streamed_items)
+            mismatches += not same
+            print(f"{name:<20} {store:<11} {len(lxml_items):>5} "
+                  f"{soup_time * 1000:>9.1f} {lxml_time * 1000:>9.1f} {soup_time / lxml_time:>7.1f}x  "
+                  f"{'yes' if same else 'NO'}")
+
+    if mismatches:
+        print(f"\n{mismatches} parser/fixture combinations produced different items")
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,114 @@
+"""
+Brand matching shared by deal scoring and JB Hi-Fi brand extraction.
+All brand patterns are compiled once at import into a single Aho-Corasick
+automaton, so one pass over a string yields both its canonical brand and its
+tier. Lookups are memoised per distinct string.
+"""
+from collections import deque, namedtuple
+from functools import lru_cache
+from typing import Dict, List, Optional, Tuple
+
+# Tier lists match on a case-insensitive substring of the brand ("boss" covers "Hugo Boss Orange")
+LUXURY_BRANDS = ['gucci', 'prada', 'burberry', 'versace', 'balenciaga', 'saint laurent', 'givenchy',
+                 'valentino', 'fendi', 'tom ford', 'alexander mcqueen', 'off-white', 'balmain']
+PREMIUM_BRANDS = ['hugo boss', 'boss', 'calvin klein', 'tommy hilfiger', 'ralph lauren', 'lacoste',
+                  'ted baker', 'paul smith', 'reiss', 'allsaints', 'armani', 'michael kors', 'diesel',
+                  'fred perry', 'gant', 'barbour', 'r.m. williams', 'country road', 'mj bale', 'calibre']
+
+# Common tech brands recognised in JB Hi-Fi product names; earlier entries win
+KNOWN_BRANDS = [
+    'Apple', 'Samsung', 'Sony', 'LG', 'Bose', 'JBL', 'Beats', 'Sennheiser',
+    'Microsoft', 'HP', 'Dell', 'Lenovo', 'ASUS', 'Acer', 'MSI', 'Razer',
+    'Logitech', 'Nintendo', 'PlayStation', 'Xbox', 'Canon', 'Nikon', 'GoPro',
+    'Fitbit', 'Garmin', 'Google', 'Amazon', 'Sonos', 'Bang & Olufsen',
+    'Marshall', 'Audio-Technica', 'Jabra', 'Skullcandy', 'Panasonic',
+    'TCL', 'Hisense', 'Philips', 'Pioneer', 'Denon', 'Yamaha', 'DJI',
+    'Fujifilm', 'Olympus', 'SanDisk', 'Western Digital', 'Seagate',
+    'Kingston', 'Corsair', 'HyperX', 'SteelSeries', 'Turtle Beach'
+]
+
+# Score bonus per tier (luxury beats premium when both match)
+TIER_BONUS = {'luxury': 25, 'premium': 18, 'standard': 10}
+
+BrandMatch = namedtuple('BrandMatch', 'canonical tier')
+
+
+class _Automaton:
+    """Aho-Corasick automaton over lowercased patterns; each pattern carries a payload"""
+
+    def __init__(self, patterns: List[Tuple[str, object]]):
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.out: List[list] = [[]]
+        for pattern, payload in patterns:
+            state = 0
+            for char in pattern:
+                nxt = self.goto[state].get(char)
+                if nxt is None:
+                    nxt = len(self.goto)
+                    self.goto[state][char] = nxt
+                    self.goto.append({})
+                    self.fail.append(0)
+                    self.out.append([])
+                state = nxt
+            self.out[state].append(payload)
+
+        # Breadth-first failure links; outputs of the failure state are inherited
+        queue = deque(self.goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, nxt in self.goto[state].items():
+                queue.append(nxt)
+                fallback = self.fail[state]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[nxt] = self.goto[fallback].get(char, 0)
+                self.out[nxt] = self.out[nxt] + self.out[self.fail[nxt]]
+
+    def payloads(self, text: str) -> list:
+        """Payloads of every pattern occurring in text (already lowercased)"""
+        found = []
+        state = 0
+        goto, fail, out = self.goto, self.fail, self.out
+        for char in text:
+            while state and char not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(char, 0)
+            if out[state]:
+                found.extend(out[state])
+        return found
+
+
+# Payloads: (rank, kind, value) - tiers rank by precedence, known brands by list order
+_AUTOMATON = _Automaton(
+    [(b, (0, 'tier', 'luxury')) for b in LUXURY_BRANDS]
+    + [(b, (1, 'tier', 'premium')) for b in PREMIUM_BRANDS]
+    + [(b.lower(), (i, 'brand', b)) for i, b in enumerate(KNOWN_BRANDS)])
+
+
+@lru_cache(maxsize=8192)
+def match_brand(value: str) -> BrandMatch:
+    """Canonical known brand (or None) and tier for a brand string or product name"""
+    canonical: Optional[Tuple[int, str]] = None
+    tier: Optional[Tuple[int, str]] = None
+    for rank, kind, payload in _AUTOMATON.payloads(value.lower()):
+        if kind == 'tier':
+            if tier is None or rank < tier[0]:
+                tier = (rank, payload)
+        elif canonical is None or rank < canonical[0]:
+            canonical = (rank, payload)
+    return BrandMatch(canonical[1] if canonical else None, tier[1] if tier else 'standard')
+
+
+def tier_bonus(brand: str) -> int:
+    """Deal-score bonus for a brand's tier"""
+    return TIER_BONUS[match_brand(brand or '').tier]
+
+
+def jbhifi_brand(product_name: str) -> str:
+    """Known brand mentioned in a JB Hi-Fi product name, else its first word"""
+    canonical = match_brand(product_name).canonical
+    if canonical:
+        return canonical
+    words = product_name.split()
+    return words[0] if words else 'Unknown'
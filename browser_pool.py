@@ -0,0 +1,134 @@
+"""
+Persistent Playwright browser pool for JS-rendered stores (David Jones).
+Launches Chromium once and hands out a bounded set of reusable pages instead of
+cold-starting a browser for every URL.
+"""
+import asyncio
+import logging
+from contextlib import asynccontextmanager
+
+logger = logging.getLogger(__name__)
+
+
+class _Slot:
+    """A reusable browser context + page and how many navigations it has served"""
+
+    def __init__(self):
+        self.context = None
+        self.page = None
+        self.uses = 0
+
+    def is_healthy(self) -> bool:
+        return self.page is not None and not self.page.is_closed()
+
+    async def close(self):
+        try:
+            if self.context is not None:
+                await self.context.close()
+        except Exception as e:
+            logger.debug(f"Error closing browser context: {e}")
+        self.context = None
+        self.page = None
+        self.uses = 0
+
+
+class BrowserPool:
+    """One Chromium instance shared by up to `size` concurrent pages.
+
+    Pages are created lazily, reused across URLs and recycled (fresh context)
+    after `recycle_after` navigations or whenever they fail a health check.
+    If the browser process dies it is relaunched on the next acquire.
+
+    Usage:
+        async with BrowserPool(size=3) as pool:
+            async with pool.page() as page:
+                await page.goto(url)
+    """
+
+    def __init__(self, size: int = 3, recycle_after: int = 20,
+                 user_agent: str = None, headless: bool = True):
+        self.size = size
+        self.recycle_after = recycle_after
+        self.user_agent = user_agent
+        self.headless = headless
+
+        self._playwright = None
+        self._browser = None
+        self._launch_lock = asyncio.Lock()
+        self._slots: asyncio.Queue = asyncio.Queue()
+        self._all_slots = []
+        for _ in range(size):
+            slot = _Slot()
+            self._all_slots.append(slot)
+            self._slots.put_nowait(slot)
+
+        self.launches = 0
+        self.recycles = 0
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def start(self):
+        """Launch the browser (no-op if it is already running)"""
+        await self._ensure_browser()
+
+    async def close(self):
+        """Close all pages, the browser and the Playwright driver"""
+        for slot in self._all_slots:
+            await slot.close()
+        if self._browser is not None:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logger.debug(f"Error closing browser: {e}")
+            self._browser = None
+        if self._playwright is not None:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _ensure_browser(self):
+        async with self._launch_lock:
+            if self._browser is not None and self._browser.is_connected():
+                return
+            if self._browser is not None:
+                logger.warning("Browser disconnected - relaunching")
+                for slot in self._all_slots:
+                    slot.context = None
+                    slot.page = None
+                    slot.uses = 0
+            if self._playwright is None:
+                from playwright.async_api import async_playwright
+                self._playwright = await async_playwright().start()
+            self._browser = await self._playwright.chromium.launch(headless=self.headless)
+            self.launches += 1
+            logger.info(f"Launched Chromium for browser pool ({self.size} pages)")
+
+    async def _prepare(self, slot: _Slot):
+        await self._ensure_browser()
+        if slot.is_healthy() and slot.uses < self.recycle_after:
+            return
+        if slot.context is not None:
+            self.recycles += 1
+            await slot.close()
+        slot.context = await self._browser.new_context(user_agent=self.user_agent)
+        slot.page = await slot.context.new_page()
+
+    @asynccontextmanager
+    async def page(self):
+        """Borrow a page; waits while all `size` pages are in use"""
+        slot = await self._slots.get()
+        try:
+            await self._prepare(slot)
+            slot.uses += 1
+            try:
+                yield slot.page
+            except Exception:
+                # Don't hand a page in an unknown state to the next caller
+                await slot.close()
+                raise
+        finally:
+            self._slots.put_nowait(slot)
@@ -0,0 +1,31 @@
+"""
+Category group mappings shared by the scraper and the store adapters.
+Broad UI group names map to the category keys they cover.
+"""
+from typing import FrozenSet
+
+# Category group mappings — broad UI group names → category key substrings to match
+CATEGORY_GROUPS = {
+    'tops': ['Tops', 'T-Shirts', 'T-Shirts & Singlets', 'Shirts', 'Shirts & Polos'],
+    'jeans': ['Jeans'],
+    'shoes': ['Shoes', 'Sneakers', 'Boots', 'Heels', 'Flats', 'Sandals', 'Sandals & Thongs',
+              'Mules & Slides', 'Trainers', 'Slip Ons & Loafers', 'Casual Shoes', 'Dress Shoes'],
+    'jackets': ['Jackets & Coats', 'Coats & Jackets'],
+    'dresses': ['Dresses'],
+    'pants': ['Pants', 'Trousers & Chinos', 'Trousers & Leggings'],
+    'shorts': ['Shorts'],
+    'knitwear': ['Knitwear', 'Jumpers & Cardigans', 'Sweats & Hoodies', 'Hoodies & Sweatshirts'],
+    'skirts': ['Skirts'],
+    'activewear': ['Activewear'],
+    'swimwear': ['Swimwear'],
+    'suits': ['Suits & Blazers', 'Suits'],
+    'electronics': ['Laptops', 'Headphones', 'Speakers', 'TVs', 'Phones', 'Gaming',
+                    'Cameras', 'Smart Home', 'Wearables', 'Audio'],
+}
+
+
+def groups_for_category(category_name: str) -> FrozenSet[str]:
+    """Groups a category key belongs to (exact key, or "<key> <suffix>" such as "Clothing Page 2")"""
+    return frozenset(
+        group for group, keys in CATEGORY_GROUPS.items()
+        if any(category_name == key or category_name.startswith(key + ' ') for key in keys))
@@ -0,0 +1,106 @@
+"""
+Compact typed record for a scraped deal.
+Prices are integer cents, the discount is computed once, and strings repeated
+across thousands of items (source, brand, category, gender) are interned.
+Dict/JSON conversion happens only at the edges: API output, storage and caches.
+"""
+import re
+import sys
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+# "$1,299.95" anywhere in the text, else a bare number such as "129.5"
+_PRICE_RE = re.compile(r'\$([\d,]+\.?\d*)')
+_NUMBER_RE = re.compile(r'\s*([\d,]+\.?\d*)\s*$')
+
+
+def parse_cents(price) -> Optional[int]:
+    """Price string or number -> integer cents; None for "N/A", empty or unparseable values"""
+    if price is None or isinstance(price, bool):
+        return None
+    if isinstance(price, (int, float)):
+        return round(price * 100)
+    match = _PRICE_RE.search(price) or _NUMBER_RE.match(price)
+    if not match:
+        return None
+    digits = match.group(1).replace(',', '')
+    if not digits or digits == '.':
+        return None
+    try:
+        return round(float(digits) * 100)
+    except ValueError:
+        return None
+
+
+def format_cents(cents: Optional[int]) -> str:
+    """Cents -> the "$1,299.95" strings the API and frontend expect"""
+    if cents is None:
+        return "N/A"
+    return f"${cents / 100:,.2f}"
+
+
+def discount_from_cents(current_cents: int, original_cents: Optional[int]) -> float:
+    """Discount percentage, rounded to 0.1 (0.0 when there is no original price)"""
+    if not original_cents or original_cents <= 0:
+        return 0.0
+    return round((1 - current_cents / original_cents) * 100, 1)
+
+
+def _intern(value) -> str:
+    return sys.intern(value) if isinstance(value, str) else value
+
+
+@dataclass(slots=True)
+class Deal:
+    source: str
+    brand: str
+    name: str
+    current_cents: int
+    original_cents: Optional[int]
+    discount_percent: float
+    category: str
+    gender: str
+    url: str
+    scraped_at: str
+
+    @classmethod
+    def create(cls, source: str, brand: str, name: str, current_cents: int, original_cents: Optional[int],
+               category: str, gender: str, url: str, scraped_at: str,
+               discount_percent: float = None) -> 'Deal':
+        """Build a Deal, interning the low-cardinality strings and computing the discount"""
+        if discount_percent is None:
+            discount_percent = discount_from_cents(current_cents, original_cents)
+        return cls(_intern(source), _intern(brand), name, current_cents, original_cents, discount_percent,
+                   _intern(category), _intern(gender), url, scraped_at)
+
+    @property
+    def current_price(self) -> str:
+        return format_cents(self.current_cents)
+
+    @property
+    def original_price(self) -> str:
+        return format_cents(self.original_cents)
+
+    def to_dict(self) -> Dict:
+        """The item dict served by the API / written to storage"""
+        return {
+            'source': self.source,
+            'brand': self.brand,
+            'name': self.name,
+            'current_price': format_cents(self.current_cents),
+            'original_price': format_cents(self.original_cents),
+            'discount_percent': self.discount_percent,
+            'category': self.category,
+            'gender': self.gender,
+            'url': self.url,
+            'scraped_at': self.scraped_at,
+        }
+
+    @classmethod
+    def from_dict(cls, item: Dict) -> 'Deal':
+        """Inverse of to_dict (also accepts legacy items with string prices)"""
+        return cls.create(
+            item.get('source', ''), item.get('brand', ''), item.get('name', ''),
+            parse_cents(item.get('current_price')), parse_cents(item.get('original_price')),
+            item.get('category', ''), item.get('gender', 'Men'), item.get('url', ''),
+            item.get('scraped_at', ''), discount_percent=item.get('discount_percent'))
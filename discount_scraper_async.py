@@ -4,12 +4,32 @@ Uses asyncio + aiohttp for parallel requests - 5-10x faster than sync version
 """
 import asyncio
 import aiohttp
-from bs4 import BeautifulSoup
 import json
 from datetime import datetime
-from typing import List, Dict
+from contextlib import aclosing
+from typing import AsyncIterator, List, Dict, Optional, Union
 import logging
-import re
+import os
+import time
+from collections import namedtuple
+from urllib.parse import urljoin
+
+from brands import jbhifi_brand, tier_bonus
+from browser_pool import BrowserPool
+from categories import CATEGORY_GROUPS  # noqa: F401 - re-exported for callers
+from deal import Deal, parse_cents
+from embedded_json import extract_products
+from extract_specs import StoreSpec
+from http_cache import HttpCache
+from page_store import PageStore, page_digest
+from pagination import discover_page_count, has_next_link, page_url, stops_category
+import parse_pool
+from soup_parsers import SoupParsersMixin
+from ranking import CategoryTopN
+from rate_control import AdaptiveRateController
+from run_metrics import CANCELLED, PageMetrics, RunMetrics
+from stores import get_adapter
+from stream_parse import STREAM_CHUNK_SIZE, StreamedPage, page_markup
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
@@ -25,632 +45,241 @@ HEADERS = {
     'Upgrade-Insecure-Requests': '1'
 }
 
+# Concurrent Playwright pages (one shared browser) when no browser-mode adapter
+# sets its own concurrency
+DJ_BROWSER_PAGES = 3
+
+# Adaptive per-host concurrency (see rate_control.HostLimiter for the knobs).
+# The connector only caps total sockets; per-host limits are learned at runtime.
+MAX_CONNECTIONS = 60
+HOST_LIMIT_DEFAULTS = {'initial': 4, 'min_limit': 1, 'max_limit': 16}
+# Host-specific limits; each store adapter adds its own `concurrency` at run start
+HOST_LIMIT_OVERRIDES = {}
+
+# On-disk cache of category pages (bodies + validators + parsed items)
+HTTP_CACHE_DIR = os.environ.get(
+    'SCRAPER_HTTP_CACHE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'http'))
+
+# Content-hash store of parsed pages; unchanged pages skip parsing and the
+# storage write, but are re-parsed after PAGE_STORE_MAX_AGE seconds regardless
+PAGE_STORE_DIR = os.environ.get(
+    'SCRAPER_PAGE_STORE_DIR',
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), '.cache', 'pages'))
+PAGE_STORE_MAX_AGE = 24 * 3600
+
+# Fetched pages waiting to be parsed; bounds how many raw pages sit in memory
+PAGE_QUEUE_SIZE = 8
+# Pages being fetched or fetched-but-unparsed at once (a fetch waits for a slot, which
+# is freed only once the parser is done with the page) - caps memory with a slow caller
+MAX_PENDING_PAGES = 24
+# Parsed pages waiting for the iter_items caller
+RESULT_QUEUE_SIZE = 8
+
+# Deals kept per category (best by deal score); None keeps everything
+TOP_N = 50
+
+PARSE_MODES = ('inline', 'process', 'pinned')
+PARSER_ENGINES = ('lxml', 'soup')
+
 # Store configuration - which stores to scrape
 ENABLED_STORES = ['iconic', 'asos', 'myer', 'jbhifi', 'davidjones']  # Add/remove stores here
 
-# Category group mappings — broad UI group names → category key substrings to match
-CATEGORY_GROUPS = {
-    'tops': ['Tops', 'T-Shirts', 'T-Shirts & Singlets', 'Shirts', 'Shirts & Polos'],
-    'jeans': ['Jeans'],
-    'shoes': ['Shoes', 'Sneakers', 'Boots', 'Heels', 'Flats', 'Sandals', 'Sandals & Thongs',
-              'Mules & Slides', 'Trainers', 'Slip Ons & Loafers', 'Casual Shoes', 'Dress Shoes'],
-    'jackets': ['Jackets & Coats', 'Coats & Jackets'],
-    'dresses': ['Dresses'],
-    'pants': ['Pants', 'Trousers & Chinos', 'Trousers & Leggings'],
-    'shorts': ['Shorts'],
-    'knitwear': ['Knitwear', 'Jumpers & Cardigans', 'Sweats & Hoodies', 'Hoodies & Sweatshirts'],
-    'skirts': ['Skirts'],
-    'activewear': ['Activewear'],
-    'swimwear': ['Swimwear'],
-    'suits': ['Suits & Blazers', 'Suits'],
-    'electronics': ['Laptops', 'Headphones', 'Speakers', 'TVs', 'Phones', 'Gaming',
-                    'Cameras', 'Smart Home', 'Wearables', 'Audio'],
-}
+# One page to fetch: `category` is the catalogue key, `url` the page-1 URL
+# (`page` > 1 is derived from it), `referer` None for Playwright stores
+PageJob = namedtuple('PageJob', 'store category gender url referer page')
+
 
+def _page_label(category: str, page: int) -> str:
+    """Category label stamped on a page's deals"""
+    return category if page == 1 else f"{category} Page {page}"
 
-class AsyncDiscountScraper:
+
+class AsyncDiscountScraper(SoupParsersMixin):
     """Async scraper that fetches all categories in parallel"""
 
-    def __init__(self):
-        self.iconic_url = "https://www.theiconic.com.au"
-        self.asos_url = "https://www.asos.com"
-        self.myer_url = "https://www.myer.com.au"
-        self.jbhifi_url = "https://www.jbhifi.com.au"
-        self.davidjones_url = "https://www.davidjones.com"
-
-        self.iconic_categories = {
-            # Clothing
-            'Shirts & Polos': 'mens-clothing-shirts-polos-sale/',
-            'T-Shirts & Singlets': 'mens-clothing-t-shirts-singlets-sale/',
-            'Coats & Jackets': 'mens-clothing-coats-jackets-sale/',
-            'Pants': 'mens-clothing-pants-sale/',
-            'Sweats & Hoodies': 'mens-clothing-sweats-hoodies-sale/',
-            'Jumpers & Cardigans': 'mens-clothing-jumpers-cardigans-sale/',
-            'Jeans': 'mens-clothing-jeans-sale/',
-            'Shorts': 'mens-clothing-shorts-sale/',
-            'Suits & Blazers': 'mens-clothing-suits-blazers-sale/',
-            'Swimwear': 'mens-clothing-swimwear-sale/',
-            'Loungewear': 'mens-clothing-loungewear-sale/',
-            'Underwear': 'mens-clothing-underwear-sale/',
-            'Socks': 'mens-clothing-socks-sale/',
-            'Sleepwear': 'mens-clothing-sleepwear-sale/',
-            'Base Layers': 'mens-clothing-base-layers-sale/',
-            'Underwear & Socks': 'mens-clothing-underwear-socks-sale/',
-            'Socks & Stockings': 'mens-clothing-socks-stockings-sale/',
-            # Shoes
-            'Sneakers': 'mens-shoes-sneakers-sale/',
-            'Boots': 'mens-shoes-boots-sale/',
-            'Casual Shoes': 'mens-shoes-casual-shoes-sale/',
-            'Dress Shoes': 'mens-shoes-dress-shoes-sale/',
-            'Sandals & Thongs': 'mens-shoes-sandals-thongs-sale/',
-            'Slip Ons & Loafers': 'mens-shoes-slip-ons-loafers-sale/',
-        }
-
-        # ASOS categories (AU site)
-        self.asos_categories = {
-            'T-Shirts': 'au/men/sale/t-shirts-vests/cat/?cid=5990',
-            'Shirts': 'au/men/sale/shirts/cat/?cid=5988',
-            'Hoodies & Sweatshirts': 'au/men/sale/hoodies-sweatshirts/cat/?cid=5979',
-            'Jackets & Coats': 'au/men/sale/jackets-coats/cat/?cid=3606',
-            'Jeans': 'au/men/sale/jeans/cat/?cid=4208',
-            'Trousers & Chinos': 'au/men/sale/trousers-chinos/cat/?cid=4910',
-            'Shorts': 'au/men/sale/shorts/cat/?cid=7078',
-            'Knitwear': 'au/men/sale/jumpers-cardigans/cat/?cid=7617',
-            'Shoes': 'au/men/sale/shoes/cat/?cid=6930',
-            'Trainers': 'au/men/sale/shoes/trainers/cat/?cid=5775',
-        }
-
-        # Myer categories
-        self.myer_categories = {
-            'Shirts': 'men/shirts',
-            'T-Shirts': 'men/t-shirts',
-            'Jackets & Coats': 'men/jackets-coats',
-            'Pants': 'men/pants',
-            'Jeans': 'men/jeans',
-            'Knitwear': 'men/knitwear',
-            'Shorts': 'men/shorts',
-            'Suits': 'men/suits',
-            'Shoes': 'men/shoes',
-        }
-
-        # JB Hi-Fi categories (electronics/tech deals)
-        self.jbhifi_categories = {
-            'Laptops': 'collections/computers-tablets-laptops?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
-            'Headphones': 'collections/headphones?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
-            'Speakers': 'collections/speakers?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
-            'TVs': 'collections/tvs?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
-            'Phones': 'collections/mobile-phones?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
-            'Gaming': 'collections/gaming?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
-            'Cameras': 'collections/cameras?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
-            'Smart Home': 'collections/smart-home?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
-            'Wearables': 'collections/wearable-technology?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
-            'Audio': 'collections/hi-fi-turntables?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
-        }
-
-        # David Jones categories (men's sale - multiple pages for more coverage)
-        self.davidjones_categories = {
-            # Clothing (12 pages)
-            'Clothing': 'sale/men/clothing',
-            'Clothing Page 2': 'sale/men/clothing?page=2',
-            'Clothing Page 3': 'sale/men/clothing?page=3',
-            'Clothing Page 4': 'sale/men/clothing?page=4',
-            'Clothing Page 5': 'sale/men/clothing?page=5',
-            'Clothing Page 6': 'sale/men/clothing?page=6',
-            'Clothing Page 7': 'sale/men/clothing?page=7',
-            'Clothing Page 8': 'sale/men/clothing?page=8',
-            'Clothing Page 9': 'sale/men/clothing?page=9',
-            'Clothing Page 10': 'sale/men/clothing?page=10',
-            'Clothing Page 11': 'sale/men/clothing?page=11',
-            'Clothing Page 12': 'sale/men/clothing?page=12',
-            # Shoes (6 pages)
-            'Shoes': 'sale/men/shoes',
-            'Shoes Page 2': 'sale/men/shoes?page=2',
-            'Shoes Page 3': 'sale/men/shoes?page=3',
-            'Shoes Page 4': 'sale/men/shoes?page=4',
-            'Shoes Page 5': 'sale/men/shoes?page=5',
-            'Shoes Page 6': 'sale/men/shoes?page=6',
-            # Accessories (4 pages)
-            'Accessories': 'sale/men/accessories',
-            'Accessories Page 2': 'sale/men/accessories?page=2',
-            'Accessories Page 3': 'sale/men/accessories?page=3',
-            'Accessories Page 4': 'sale/men/accessories?page=4',
-            # Bags (3 pages)
-            'Bags': 'sale/men/bags',
-            'Bags Page 2': 'sale/men/bags?page=2',
-            'Bags Page 3': 'sale/men/bags?page=3',
-            # Suits (3 pages)
-            'Suits': 'sale/men/suits',
-            'Suits Page 2': 'sale/men/suits?page=2',
-            'Suits Page 3': 'sale/men/suits?page=3',
-            # Underwear (2 pages)
-            'Underwear': 'sale/men/underwear',
-            'Underwear Page 2': 'sale/men/underwear?page=2',
-            # Clearance (3 pages - often best deals)
-            'Clearance': 'sale/men/clearance',
-            'Clearance Page 2': 'sale/men/clearance?page=2',
-            'Clearance Page 3': 'sale/men/clearance?page=3',
-        }
-
-
-    async def fetch_page(self, session: aiohttp.ClientSession, url: str, referer: str = None) -> str:
-        """Fetch a single page asynchronously"""
+    def __init__(self, browser_pool: BrowserPool = None,
+                 rate_controller: AdaptiveRateController = None,
+                 use_http_cache: bool = True, use_page_store: bool = True,
+                 parse_mode: str = 'inline', parse_workers: int = None,
+                 parser_engine: str = 'lxml', stream_parse: bool = True):
+        # Optional long-lived browser pool (e.g. shared by a daemon across runs).
+        # If None, each crawl launches one browser for the browser-rendered stores.
+        self.browser_pool = browser_pool
+        # Per-host AIMD limits; kept on the instance so learned limits survive across runs
+        self.rate_controller = rate_controller or AdaptiveRateController(
+            defaults=HOST_LIMIT_DEFAULTS, overrides=dict(HOST_LIMIT_OVERRIDES))
+        # Conditional-GET cache for aiohttp pages (Playwright pages are always rendered)
+        self.http_cache = HttpCache(HTTP_CACHE_DIR) if use_http_cache else None
+        # Page digest -> items from the last parse; product URLs from unchanged pages
+        # are collected per run for reporting
+        self.page_store = PageStore(PAGE_STORE_DIR, max_age=PAGE_STORE_MAX_AGE) if use_page_store else None
+        self.unchanged_urls = set()
+        # Where parse_*_category runs: 'inline' (event loop thread), 'process' (a
+        # ProcessPoolExecutor per run) or 'pinned' (one warm pool reused across runs)
+        if parse_mode not in PARSE_MODES:
+            raise ValueError(f"parse_mode must be one of {PARSE_MODES}, got {parse_mode!r}")
+        self.parse_mode = parse_mode
+        self.parse_workers = parse_workers or parse_pool.default_workers()
+        # 'lxml' runs the store adapters' compiled specs; 'soup' the reference BeautifulSoup parsers
+        if parser_engine not in PARSER_ENGINES:
+            raise ValueError(f"parser_engine must be one of {PARSER_ENGINES}, got {parser_engine!r}")
+        self.parser_engine = parser_engine
+        # Feed aiohttp bodies into an incremental lxml parser while they download
+        # (only the inline lxml engine parses the streamed tree; pages already in the
+        # page store are hashed first and parsed only when they changed)
+        self.stream_parse = stream_parse and parser_engine == 'lxml' and parse_mode == 'inline'
+        # Timestamp stamped on every Deal of the current run (set by iter_items)
+        self.scraped_at = None
+        # Per-page timings and counters of the latest crawl (see run_metrics)
+        self.metrics: Optional[RunMetrics] = None
+
+    async def fetch_page(self, session: aiohttp.ClientSession, url: str, referer: str = None,
+                         timeout: float = 15.0, spec: StoreSpec = None,
+                         metrics: PageMetrics = None) -> Union[str, StreamedPage]:
+        """Fetch a single page asynchronously
+
+        With a `spec`, a 200 body is parsed while it streams in and returned as a
+        StreamedPage; otherwise (and for 304s served from the cache) as text.
+        Status, bytes and stage timings go to `metrics` when given.
+        """
         headers = HEADERS.copy()
         if referer:
             headers['Referer'] = referer
+        if self.http_cache is not None:
+            headers.update(self.http_cache.conditional_headers(url))
 
         try:
-            async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=15)) as response:
-                if response.status == 200:
-                    return await response.text()
-                else:
-                    logger.warning(f"Got status {response.status} for {url}")
-                    return ""
+            async with self.rate_controller.slot(url) as outcome:
+                async with session.get(url, headers=headers, timeout=aiohttp.ClientTimeout(total=timeout),
+                                       trace_request_ctx=metrics) as response:
+                    outcome.status = response.status
+                    outcome.retry_after = response.headers.get('Retry-After')
+                    if metrics is not None:
+                        metrics.status = response.status
+                    if response.status == 304 and self.http_cache is not None:
+                        cached = self.http_cache.load(url)
+                        if cached is not None:
+                            if metrics is not None:
+                                metrics.cached = True
+                            return cached
+                        logger.warning(f"Got 304 for {url} but the cached body is missing")
+                        return ""
+                    if response.status == 200:
+                        download_start = time.perf_counter()
+                        page = None
+                        if spec is not None:
+                            page = StreamedPage(spec, encoding=response.charset)
+                            async for chunk in response.content.iter_chunked(STREAM_CHUNK_SIZE):
+                                page.feed(chunk)
+                            page.close()
+                            body, encoding = page.body, page.encoding
+                        else:
+                            body = await response.read()
+                            encoding = response.get_encoding()
+                        if metrics is not None:
+                            # Streamed pages include the incremental parse that overlaps the download
+                            metrics.download_ms = round((time.perf_counter() - download_start) * 1000, 2)
+                            metrics.bytes = len(body)
+                        if self.http_cache is not None:
+                            self.http_cache.store(url, body,
+                                                  etag=response.headers.get('ETag'),
+                                                  last_modified=response.headers.get('Last-Modified'),
+                                                  encoding=encoding)
+                        return page if page is not None else body.decode(encoding, errors='replace')
+                    else:
+                        logger.warning(f"Got status {response.status} for {url}")
+                        return ""
         except Exception as e:
             logger.error(f"Error fetching {url}: {e}")
+            if metrics is not None:
+                metrics.error = str(e) or type(e).__name__
             return ""
 
-    async def fetch_page_playwright(self, url: str) -> str:
-        """Fetch a JS-rendered page using Playwright (used for David Jones)"""
+    async def fetch_page_playwright(self, url: str, timeout: float = 30.0, wait_selector: str = 'article',
+                                    metrics: PageMetrics = None) -> str:
+        """Fetch a JS-rendered page using Playwright (browser-mode stores such as David Jones)
+
+        Uses self.browser_pool when set; otherwise launches a single-use browser.
+        """
+        if self.browser_pool is None:
+            async with BrowserPool(size=1, user_agent=HEADERS['User-Agent']) as pool:
+                return await self._render_page(pool, url, timeout, wait_selector, metrics)
+        return await self._render_page(self.browser_pool, url, timeout, wait_selector, metrics)
+
+    async def _render_page(self, pool: BrowserPool, url: str, timeout: float, wait_selector: str,
+                           metrics: PageMetrics = None) -> str:
         try:
-            from playwright.async_api import async_playwright
-            async with async_playwright() as p:
-                browser = await p.chromium.launch(headless=True)
-                page = await browser.new_page(user_agent=HEADERS['User-Agent'])
-                await page.goto(url, wait_until='networkidle', timeout=30000)
-                # Wait for product cards to appear
-                await page.wait_for_selector('article', timeout=15000)
+            async with self.rate_controller.slot(url) as outcome, pool.page() as page:
+                render_start = time.perf_counter()
+                response = await page.goto(url, wait_until='networkidle', timeout=timeout * 1000)
+                if response is not None:
+                    outcome.status = response.status
+                    outcome.retry_after = response.headers.get('retry-after')
+                    if metrics is not None:
+                        metrics.status = response.status
+                # Wait for product cards to appear (half the page budget)
+                if wait_selector:
+                    await page.wait_for_selector(wait_selector, timeout=timeout * 500)
                 html = await page.content()
-                await browser.close()
+                if metrics is not None:
+                    metrics.render_ms = round((time.perf_counter() - render_start) * 1000, 2)
+                    metrics.bytes = len(html.encode('utf-8'))
                 return html
         except Exception as e:
             logger.error(f"Playwright error fetching {url}: {e}")
+            if metrics is not None:
+                metrics.error = str(e) or type(e).__name__
             return ""
 
-    def parse_iconic_category(self, html: str, category_name: str, gender: str = 'Men') -> List[Dict]:
-        """Parse Iconic HTML for a single category"""
-        items = []
-        if not html:
-            return items
-
-        soup = BeautifulSoup(html, 'lxml')
+    def _make_item(self, source: str, brand: str, name: str, current_cents: int, original_cents: Optional[int],
+                   category: str, gender: str, url: str, discount_percent: float = None) -> Deal:
+        """Deal for one product; the discount is derived from the prices unless the store states it"""
+        return Deal.create(source, brand, name, current_cents, original_cents, category, gender, url,
+                           self.scraped_at or datetime.now().isoformat(), discount_percent)
 
-        # Find all brand spans - each one represents a product
-        brand_spans = soup.find_all('span', class_='brand')
-
-        for brand_elem in brand_spans:
-            try:
-                brand_name = brand_elem.get_text(strip=True)
-                if not brand_name:
-                    continue
-
-                # Navigate up to find the product card container (the anchor tag parent)
-                product_link = brand_elem.find_parent('a')
-                if not product_link:
-                    continue
-
-                # Get the URL directly from the anchor
-                url = product_link.get('href', '')
-                if not url or url == '#':
-                    continue
-                if not url.startswith('http'):
-                    url = f"{self.iconic_url}{url}"
-
-                # Find name within the same anchor
-                name_elem = product_link.find('span', class_='name')
-                if not name_elem:
-                    continue
-                product_name = name_elem.get_text(strip=True)
-
-                # Find prices - need to look for exact class matches
-                # The prices should be within the same product link or its parent
-                product_container = product_link.parent
-
-                # Find original price (class contains both 'price' and 'original')
-                original_price = "N/A"
-                original_price_elem = product_container.find('span', class_=lambda x: x and 'price' in x and 'original' in x)
-                if original_price_elem:
-                    price_text = original_price_elem.get_text(strip=True)
-                    original_price = price_text if '$' in price_text else "N/A"
-
-                # Find current/final price (class contains both 'price' and 'final')
-                current_price_elem = product_container.find('span', class_=lambda x: x and 'price' in x and 'final' in x)
-                if not current_price_elem:
-                    continue
-                current_price_text = current_price_elem.get_text(strip=True)
-                current_price = current_price_text if '$' in current_price_text else "N/A"
-
-                if current_price == "N/A":
-                    continue
-
-                discount_percent = self._calculate_discount(current_price, original_price)
-
-                items.append({
-                    'source': 'The Iconic',
-                    'brand': brand_name,
-                    'name': product_name,
-                    'current_price': current_price,
-                    'original_price': original_price,
-                    'discount_percent': discount_percent,
-                    'category': category_name,
-                    'gender': gender,
-                    'url': url,
-                    'scraped_at': datetime.now().isoformat()
-                })
-            except Exception as e:
-                logger.warning(f"Error parsing Iconic product: {e}")
-                continue
-
-        return items
-
-    def parse_asos_category(self, html: str, category_name: str, gender: str = 'Men') -> List[Dict]:
-        """Parse ASOS HTML for a single category"""
+    def _parse_embedded(self, html: str, source: str, base_url: str, category_name: str, gender: str,
+                        default_brand: str = 'Unknown', require_discount: bool = False) -> List[Deal]:
+        """Items from a product grid embedded as JSON; empty when the page has none (parse the DOM).
+        Product JSON that is not grid-shaped (one featured product) does not count."""
         items = []
-        if not html:
-            return items
-
-        soup = BeautifulSoup(html, 'lxml')
-
-        # ASOS uses article elements for products
-        products = soup.find_all('article', {'data-auto-id': 'productTile'})
-        if not products:
-            # Fallback to other selectors
-            products = soup.find_all('div', class_=lambda x: x and 'productTile' in str(x))
-
-        for product in products[:50]:
-            try:
-                # Find product link
-                link = product.find('a', href=True)
-                if not link:
-                    continue
-
-                url = link.get('href', '')
-                if not url.startswith('http'):
-                    url = f"{self.asos_url}{url}"
-
-                # Find brand and name
-                # ASOS structure: brand is in h2, name is in a p or div
-                brand_elem = product.find('h2') or product.find('span', class_=lambda x: x and 'brand' in str(x).lower())
-                name_elem = product.find('p') or product.find('div', class_=lambda x: x and 'title' in str(x).lower())
-
-                brand_name = brand_elem.get_text(strip=True) if brand_elem else 'ASOS'
-                product_name = name_elem.get_text(strip=True) if name_elem else ''
-
-                if not product_name:
-                    # Try to get from link title
-                    product_name = link.get('title', '') or link.get_text(strip=True)
-
-                # Find prices - ASOS uses various price containers
-                price_container = product.find('div', class_=lambda x: x and 'price' in str(x).lower())
-                if not price_container:
-                    price_container = product
-
-                # Look for sale price and original price
-                sale_price_elem = price_container.find('span', class_=lambda x: x and ('sale' in str(x).lower() or 'current' in str(x).lower()))
-                original_price_elem = price_container.find('span', class_=lambda x: x and ('rrp' in str(x).lower() or 'previous' in str(x).lower()))
-
-                if not sale_price_elem:
-                    # Try to find any price
-                    all_prices = price_container.find_all('span', string=re.compile(r'\$[\d,]+\.?\d*'))
-                    if len(all_prices) >= 2:
-                        sale_price_elem = all_prices[0]
-                        original_price_elem = all_prices[1]
-                    elif len(all_prices) == 1:
-                        sale_price_elem = all_prices[0]
-
-                if not sale_price_elem:
-                    continue
-
-                current_price = sale_price_elem.get_text(strip=True)
-                original_price = original_price_elem.get_text(strip=True) if original_price_elem else "N/A"
-
-                # Clean up prices
-                current_price = self._clean_price(current_price)
-                original_price = self._clean_price(original_price)
-
-                if not current_price or current_price == "N/A":
-                    continue
-
-                discount_percent = self._calculate_discount(current_price, original_price)
-
-                items.append({
-                    'source': 'ASOS',
-                    'brand': brand_name,
-                    'name': product_name,
-                    'current_price': current_price,
-                    'original_price': original_price,
-                    'discount_percent': discount_percent,
-                    'category': category_name,
-                    'gender': gender,
-                    'url': url,
-                    'scraped_at': datetime.now().isoformat()
-                })
-            except Exception as e:
-                logger.warning(f"Error parsing ASOS product: {e}")
+        records = html.embedded_products() if isinstance(html, StreamedPage) else extract_products(html)
+        for record in records:
+            url = record['url']
+            if not url.startswith('http'):
+                url = urljoin(base_url, url)
+            brand_name = record['brand'] or (
+                self._extract_jbhifi_brand(record['name']) if source == 'JB Hi-Fi' else default_brand)
+            deal = self._make_item(source, brand_name, record['name'], parse_cents(record['current_price']),
+                                   parse_cents(record['original_price']), category_name, gender, url)
+            if require_discount and deal.discount_percent <= 0:
                 continue
-
+            items.append(deal)
         return items
 
-    def parse_myer_category(self, html: str, category_name: str, gender: str = 'Men') -> List[Dict]:
-        """Parse Myer HTML for a single category"""
-        items = []
-        if not html:
-            return items
-
-        soup = BeautifulSoup(html, 'lxml')
-
-        # Myer uses product tiles
-        products = soup.find_all('div', class_=lambda x: x and 'product' in str(x).lower() and 'tile' in str(x).lower())
-        if not products:
-            products = soup.find_all('article', class_=lambda x: x and 'product' in str(x).lower())
+    def parse_iconic_category(self, html: str, category_name: str, gender: str = 'Men') -> List[Deal]:
+        """Parse Iconic HTML for a single category"""
+        return get_adapter('iconic').parse(self, html, category_name, gender)
 
-        for product in products[:50]:
-            try:
-                # Find product link
-                link = product.find('a', href=True)
-                if not link:
-                    continue
-
-                url = link.get('href', '')
-                if not url.startswith('http'):
-                    url = f"{self.myer_url}{url}"
-
-                # Find brand and name
-                brand_elem = product.find(class_=lambda x: x and 'brand' in str(x).lower())
-                name_elem = product.find(class_=lambda x: x and ('name' in str(x).lower() or 'title' in str(x).lower()))
-
-                brand_name = brand_elem.get_text(strip=True) if brand_elem else 'Unknown'
-                product_name = name_elem.get_text(strip=True) if name_elem else link.get_text(strip=True)
-
-                # Find prices
-                sale_price_elem = product.find(class_=lambda x: x and ('sale' in str(x).lower() or 'now' in str(x).lower()))
-                original_price_elem = product.find(class_=lambda x: x and ('was' in str(x).lower() or 'rrp' in str(x).lower()))
-
-                if not sale_price_elem:
-                    # Look for any price element
-                    price_elem = product.find(class_=lambda x: x and 'price' in str(x).lower())
-                    if price_elem:
-                        sale_price_elem = price_elem
-
-                if not sale_price_elem:
-                    continue
-
-                current_price = sale_price_elem.get_text(strip=True)
-                original_price = original_price_elem.get_text(strip=True) if original_price_elem else "N/A"
-
-                current_price = self._clean_price(current_price)
-                original_price = self._clean_price(original_price)
-
-                if not current_price or current_price == "N/A":
-                    continue
-
-                discount_percent = self._calculate_discount(current_price, original_price)
-
-                items.append({
-                    'source': 'Myer',
-                    'brand': brand_name,
-                    'name': product_name,
-                    'current_price': current_price,
-                    'original_price': original_price,
-                    'discount_percent': discount_percent,
-                    'category': category_name,
-                    'gender': gender,
-                    'url': url,
-                    'scraped_at': datetime.now().isoformat()
-                })
-            except Exception as e:
-                logger.warning(f"Error parsing Myer product: {e}")
-                continue
+    def parse_asos_category(self, html: str, category_name: str, gender: str = 'Men') -> List[Deal]:
+        """Parse ASOS HTML for a single category"""
+        return get_adapter('asos').parse(self, html, category_name, gender)
 
-        return items
+    def parse_myer_category(self, html: str, category_name: str, gender: str = 'Men') -> List[Deal]:
+        """Parse Myer HTML for a single category"""
+        return get_adapter('myer').parse(self, html, category_name, gender)
 
-    def parse_jbhifi_category(self, html: str, category_name: str) -> List[Dict]:
+    def parse_jbhifi_category(self, html: str, category_name: str, gender: str = 'Unisex') -> List[Deal]:
         """Parse JB Hi-Fi HTML for a single category"""
-        items = []
-        if not html:
-            return items
-
-        soup = BeautifulSoup(html, 'lxml')
-
-        # JB Hi-Fi uses product tiles/cards
-        products = soup.find_all('div', class_=lambda x: x and 'product' in str(x).lower())
-        if not products:
-            products = soup.find_all('article', class_=lambda x: x and 'product' in str(x).lower())
-
-        for product in products[:50]:
-            try:
-                # Find product link
-                link = product.find('a', href=True)
-                if not link:
-                    continue
-
-                url = link.get('href', '')
-                if not url.startswith('http'):
-                    url = f"{self.jbhifi_url}{url}"
-
-                # Find product name/title
-                name_elem = product.find('span', class_=lambda x: x and 'title' in str(x).lower())
-                if not name_elem:
-                    name_elem = product.find('h2') or product.find('h3') or product.find(class_=lambda x: x and 'name' in str(x).lower())
-
-                product_name = name_elem.get_text(strip=True) if name_elem else link.get('title', '') or link.get_text(strip=True)
-
-                if not product_name or len(product_name) < 3:
-                    continue
-
-                # Extract brand from product name (usually first word or known brands)
-                brand_name = self._extract_jbhifi_brand(product_name)
-
-                # Find prices - JB uses sale-price and was-price classes
-                sale_price_elem = product.find(class_=lambda x: x and ('sale' in str(x).lower() or 'current' in str(x).lower() or 'now' in str(x).lower()))
-                original_price_elem = product.find(class_=lambda x: x and ('was' in str(x).lower() or 'original' in str(x).lower() or 'rrp' in str(x).lower()))
-
-                if not sale_price_elem:
-                    # Try to find any price element
-                    price_elem = product.find(class_=lambda x: x and 'price' in str(x).lower())
-                    if price_elem:
-                        sale_price_elem = price_elem
-
-                if not sale_price_elem:
-                    continue
-
-                current_price = sale_price_elem.get_text(strip=True)
-                original_price = original_price_elem.get_text(strip=True) if original_price_elem else "N/A"
-
-                current_price = self._clean_price(current_price)
-                original_price = self._clean_price(original_price)
-
-                if not current_price or current_price == "N/A":
-                    continue
-
-                discount_percent = self._calculate_discount(current_price, original_price)
-
-                # Only include items with actual discounts
-                if discount_percent <= 0:
-                    continue
-
-                items.append({
-                    'source': 'JB Hi-Fi',
-                    'brand': brand_name,
-                    'name': product_name,
-                    'current_price': current_price,
-                    'original_price': original_price,
-                    'discount_percent': discount_percent,
-                    'category': category_name,
-                    'gender': 'Unisex',
-                    'url': url,
-                    'scraped_at': datetime.now().isoformat()
-                })
-            except Exception as e:
-                logger.warning(f"Error parsing JB Hi-Fi product: {e}")
-                continue
+        return get_adapter('jbhifi').parse(self, html, category_name, gender)
 
-        return items
+    def parse_davidjones_category(self, html: str, category_name: str, gender: str = 'Men') -> List[Deal]:
+        """Parse David Jones HTML for a single category"""
+        return get_adapter('davidjones').parse(self, html, category_name, gender)
 
     def _extract_jbhifi_brand(self, product_name: str) -> str:
         """Extract brand name from JB Hi-Fi product name"""
-        # Common tech brands
-        known_brands = [
-            'Apple', 'Samsung', 'Sony', 'LG', 'Bose', 'JBL', 'Beats', 'Sennheiser',
-            'Microsoft', 'HP', 'Dell', 'Lenovo', 'ASUS', 'Acer', 'MSI', 'Razer',
-            'Logitech', 'Nintendo', 'PlayStation', 'Xbox', 'Canon', 'Nikon', 'GoPro',
-            'Fitbit', 'Garmin', 'Google', 'Amazon', 'Sonos', 'Bang & Olufsen',
-            'Marshall', 'Audio-Technica', 'Jabra', 'Skullcandy', 'Panasonic',
-            'TCL', 'Hisense', 'Philips', 'Pioneer', 'Denon', 'Yamaha', 'DJI',
-            'Fujifilm', 'Olympus', 'SanDisk', 'Western Digital', 'Seagate',
-            'Kingston', 'Corsair', 'HyperX', 'SteelSeries', 'Turtle Beach'
-        ]
-
-        product_upper = product_name.upper()
-        for brand in known_brands:
-            if brand.upper() in product_upper:
-                return brand
-
-        # Try to extract first word as brand
-        words = product_name.split()
-        if words:
-            return words[0]
-
-        return 'Unknown'
-
-    def parse_davidjones_category(self, html: str, category_name: str, gender: str = 'Men') -> List[Dict]:
-        """Parse David Jones HTML for a single category"""
-        items = []
-        if not html:
-            return items
-
-        soup = BeautifulSoup(html, 'lxml')
-
-        # DJ uses CSS modules with hashed class names — BS4 passes one class string at a time to callable
-        def has_class_suffix(suffix):
-            return lambda x: x and x.endswith(suffix)
-
-        products = soup.find_all('article')
-
-        for product in products[:60]:
-            try:
-                link = product.find('a', href=True)
-                if not link:
-                    continue
-
-                url = link.get('href', '')
-                if not url or not url.startswith('/product/'):
-                    continue
-                url = f"{self.davidjones_url}{url}"
-
-                # Brand: <p> with class ending in '__brand'
-                brand_elem = product.find('p', class_=has_class_suffix('__brand'))
-                brand_name = brand_elem.get_text(strip=True) if brand_elem else 'Unknown'
-
-                # Name: <h2> with class ending in '__name'
-                name_elem = product.find('h2', class_=has_class_suffix('__name'))
-                product_name = name_elem.get_text(strip=True) if name_elem else ''
-                if not product_name:
-                    continue
-
-                # Discount label: e.g. "SAVE 20%" in SpecialOfferDescription span
-                offer_elem = product.find('span', class_=has_class_suffix('__ctaInfo'))
-                if not offer_elem:
-                    continue
-                offer_text = offer_elem.get_text(strip=True)
-                discount_match = re.search(r'(\d+)%', offer_text)
-                if not discount_match:
-                    continue
-                discount_percent = int(discount_match.group(1))
-
-                # Price: visible span with '__price' suffix (aria-hidden to avoid screen-reader duplicate)
-                price_elem = product.find('span', attrs={'aria-hidden': 'true'}, class_=has_class_suffix('__price'))
-                if not price_elem:
-                    continue
-                current_price = self._clean_price(price_elem.get_text(strip=True))
-                if not current_price or current_price == "N/A":
-                    continue
-
-                # Derive original price from discount
-                try:
-                    sale_val = float(current_price.replace('$', '').replace(',', ''))
-                    original_val = round(sale_val / (1 - discount_percent / 100), 2)
-                    original_price = f"${original_val:.2f}"
-                except Exception:
-                    original_price = "N/A"
-
-                items.append({
-                    'source': 'David Jones',
-                    'brand': brand_name,
-                    'name': product_name,
-                    'current_price': current_price,
-                    'original_price': original_price,
-                    'discount_percent': discount_percent,
-                    'category': category_name,
-                    'gender': gender,
-                    'url': url,
-                    'scraped_at': datetime.now().isoformat()
-                })
-            except Exception as e:
-                logger.warning(f"Error parsing David Jones product: {e}")
-                continue
-
-        return items
-
-    def _clean_price(self, price_str: str) -> str:
-        """Extract and clean price from string"""
-        if not price_str:
-            return "N/A"
-        # Find price pattern
-        match = re.search(r'\$[\d,]+\.?\d*', price_str)
-        if match:
-            return match.group()
-        return "N/A"
-
-    def _calculate_discount(self, current: str, original: str) -> float:
-        """Calculate discount percentage"""
-        try:
-            current_num = float(current.replace('$', '').replace(',', ''))
-            original_num = float(original.replace('$', '').replace(',', ''))
-            if original_num > 0:
-                return round((1 - current_num / original_num) * 100, 1)
-        except:
-            pass
-        return 0.0
+        return jbhifi_brand(product_name)
 
     def _extract_url(self, product, base_url: str) -> str:
         """Extract product URL - looks for first valid product link"""
@@ -664,188 +293,388 @@ class AsyncDiscountScraper:
                 return f"{base_url}{url}"
         return ""
 
-    def _deal_score_proxy(self, item: Dict) -> float:
+    def _deal_score_proxy(self, deal: Deal) -> float:
         """Lightweight deal score for backend sorting (discount % + brand tier bonus)"""
-        discount = float(item.get('discount_percent') or 0)
-        brand = (item.get('brand') or '').lower()
-        luxury = ['gucci','prada','burberry','versace','balenciaga','saint laurent','givenchy',
-                  'valentino','fendi','tom ford','alexander mcqueen','off-white','balmain']
-        premium = ['hugo boss','boss','calvin klein','tommy hilfiger','ralph lauren','lacoste',
-                   'ted baker','paul smith','reiss','allsaints','armani','michael kors','diesel',
-                   'fred perry','gant','barbour','r.m. williams','country road','mj bale','calibre']
-        if any(b in brand for b in luxury):
-            tier_bonus = 25
-        elif any(b in brand for b in premium):
-            tier_bonus = 18
+        discount = float(deal.discount_percent or 0)
+        tier = tier_bonus(deal.brand)
+        if deal.original_cents is not None:
+            savings_bonus = min(15, ((deal.original_cents - deal.current_cents) / 30000) * 15)
         else:
-            tier_bonus = 10
-        try:
-            current = float(item['current_price'].replace('$','').replace(',',''))
-            original = float(item['original_price'].replace('$','').replace(',',''))
-            savings_bonus = min(15, ((original - current) / 300) * 15)
-        except Exception:
             savings_bonus = 0
-        return (discount / 70) * 40 + tier_bonus + savings_bonus
-
-    def _category_matches(self, category_name: str, category_groups: List[str]) -> bool:
-        """Check if a category key matches any of the requested groups"""
-        if not category_groups:
-            return True  # No filter = include all
-        for group in category_groups:
-            group_keys = CATEGORY_GROUPS.get(group, [])
-            # Match if the category name starts with any key in the group
-            # (handles "Clothing Page 2" matching "Clothing" for DJ)
-            for key in group_keys:
-                if category_name == key or category_name.startswith(key + ' '):
-                    return True
-        return False
+        return (discount / 70) * 40 + tier + savings_bonus
+
+    def _build_jobs(self, stores: List[str], category_groups: List[str]) -> List[PageJob]:
+        """First-page jobs for a run; later pages are scheduled once page 1 is parsed"""
+        jobs = []
+        for store in stores:
+            try:
+                adapter = get_adapter(store)
+            except KeyError as e:
+                logger.warning(f"Skipping store: {e}")
+                continue
+            for category_name, url in adapter.category_urls(category_groups):
+                jobs.append(PageJob(store, category_name, adapter.gender, url, adapter.referer, 1))
+        return jobs
+
+    def parse_page(self, store: str, html: str, category_name: str, gender: str) -> List[Deal]:
+        """Dispatch a page to its store's parser"""
+        if self.parser_engine == 'soup':
+            if isinstance(html, StreamedPage):
+                html = html.text
+            return getattr(self, f'parse_{store}_category_soup')(html, category_name, gender)
+        return get_adapter(store).parse(self, html, category_name, gender)
+
+    async def _process_page(self, store: str, category_name: str, gender: str, url: str,
+                            html: str, scraped_at: str, executor=None, revalidated: bool = False) -> List[Deal]:
+        """Turn one fetched page into deals (reusing stored items when the page is unchanged)
+
+        `revalidated` is set when this fetch got a 304 and `html` is the cached body.
+        """
+        # Same normalised content as the last parse - reuse its items
+        digest = page_digest(page_markup(html)) if self.page_store is not None and html else None
+        stored_items = self.page_store.lookup(store, url, digest) if digest else None
+        if stored_items is not None:
+            deals = self._restore_items(stored_items, category_name, scraped_at)
+            self.unchanged_urls.update(deal.url for deal in deals)
+            return deals
+
+        # Server said not modified (304) to this fetch - reuse the parsed items cached with the body
+        cached_items = None
+        if self.http_cache is not None and revalidated and html:
+            cached_items = self.http_cache.load_items(url)
+        if cached_items is not None:
+            items = self._restore_items(cached_items, category_name, scraped_at)
+        elif executor is None:
+            items = self.parse_page(store, html, category_name, gender)
+        else:
+            loop = asyncio.get_running_loop()
+            if isinstance(html, StreamedPage):
+                html = html.text
+            records = await loop.run_in_executor(
+                executor, parse_pool.parse_in_worker, store, html, category_name, gender, self.parser_engine)
+            items = parse_pool.records_to_items(records, category_name, scraped_at)
+
+        # Browser-rendered pages never go through the HTTP cache
+        cache_items = (self.http_cache is not None and cached_items is None
+                       and get_adapter(store).fetch_mode == 'http')
+        if digest or cache_items:
+            item_dicts = [deal.to_dict() for deal in items]
+            if digest:
+                self.page_store.save(store, url, digest, item_dicts)
+            if cache_items:
+                self.http_cache.store_items(url, item_dicts)
+        return items
+
+    def _restore_items(self, item_dicts: List[Dict], category_name: str, scraped_at: str) -> List[Deal]:
+        """Deals from stored item dicts, stamped with this run's category label and time"""
+        deals = [Deal.from_dict(item) for item in item_dicts]
+        for deal in deals:
+            deal.category = category_name
+            deal.scraped_at = scraped_at
+        return deals
 
     async def scrape_all(self, stores: List[str] = None,
-                         category_groups: List[str] = None) -> List[Dict]:
-        """Scrape all sources in parallel
+                         category_groups: List[str] = None, top_n: Optional[int] = TOP_N) -> List[Dict]:
+        """Scrape all sources in parallel and return item dicts (see scrape_deals)"""
+        deals = await self.scrape_deals(stores=stores, category_groups=category_groups, top_n=top_n)
+        return [deal.to_dict() for deal in deals]
+
+    async def scrape_deals(self, stores: List[str] = None,
+                           category_groups: List[str] = None, top_n: Optional[int] = TOP_N) -> List[Deal]:
+        """Best deals per category from one crawl, ranked by deal score
+
+        Collects iter_items into per-category top-N heaps, so only the kept
+        deals (not every page or item) stay in memory.
 
         Args:
-            stores: List of stores to scrape. Options: 'iconic', 'asos', 'myer', 'jbhifi', 'davidjones'
-                    If None, uses ENABLED_STORES configuration.
+            stores: List of store keys to scrape (see stores.STORE_MODULES). Only these
+                    adapters are loaded. If None, uses ENABLED_STORES configuration.
             category_groups: List of category group keys (e.g. 'tops', 'jeans', 'shoes').
-                             See CATEGORY_GROUPS for valid values.
+                             See categories.CATEGORY_GROUPS for valid values.
                              If None or empty, includes all categories.
+            top_n: Deals kept per category, best deal score first (None keeps all).
+        """
+        start_time = datetime.now()
+        # Best deals per category, selected while pages are still arriving
+        top = CategoryTopN(self._deal_score_proxy, top_n)
+        async with aclosing(self.iter_items(stores=stores, category_groups=category_groups)) as deals:
+            async for deal in deals:
+                top.add(deal)
+
+        for cat, (kept, seen) in top.dropped().items():
+            logger.info(f"{cat}: kept top {kept} of {seen} items")
+
+        # Per-category winners merged into the final ranking
+        all_items = top.ranked()
+        if self.metrics is not None:
+            self.metrics.count_kept(all_items)
+
+        total_time = (datetime.now() - start_time).total_seconds()
+        logger.info(f"Total scraping complete: {len(all_items)} items in {total_time:.2f}s")
+
+        return all_items
+
+    async def iter_items(self, stores: List[str] = None,
+                         category_groups: List[str] = None) -> AsyncIterator[Deal]:
+        """Crawl the stores and yield each page's deals as soon as it is parsed
+
+        aiohttp stores and browser-rendered stores fetch concurrently and push
+        finished pages through a bounded queue; each page's HTML is dropped right
+        after parsing. A fetch only starts once one of MAX_PENDING_PAGES slots is
+        free, and a slot is released when the parser is done with that page, so
+        at most MAX_PENDING_PAGES fetched and RESULT_QUEUE_SIZE parsed pages are
+        held at a time. A slow consumer stalls the fetchers, and memory is bounded
+        by these limits rather than by catalogue size.
+
+        Leaving the loop early cancels the crawl once the generator is closed;
+        wrap it in contextlib.aclosing to close the session and browser promptly.
+
+        Args:
+            stores: Store keys to scrape (default ENABLED_STORES).
+            category_groups: Category group keys to include (None or empty: all).
         """
         if stores is None:
             stores = ENABLED_STORES
 
-        all_items = []
         start_time = datetime.now()
+        scraped_at = self.scraped_at = start_time.isoformat()
+        metrics = self.metrics = RunMetrics()
+        self.unchanged_urls = set()
+        if self.page_store is not None:
+            self.page_store.reset_run()
+        if self.http_cache is not None:
+            self.http_cache.reset_run()
+        jobs = self._build_jobs(stores, category_groups)
+        adapters = {job.store: get_adapter(job.store) for job in jobs}
+        # Each store's own concurrency budget (explicit controller overrides win)
+        for adapter in adapters.values():
+            if adapter.concurrency:
+                self.rate_controller.overrides.setdefault(adapter.host, adapter.concurrency)
+        browser_adapters = [a for a in adapters.values() if a.fetch_mode == 'browser']
+
+        # One shared browser for the browser-mode stores unless the caller supplied a long-lived pool
+        owns_pool = self.browser_pool is None and bool(browser_adapters)
+        if owns_pool:
+            pool_size = max((a.concurrency or {}).get('max_limit', DJ_BROWSER_PAGES) for a in browser_adapters)
+            self.browser_pool = BrowserPool(size=pool_size, user_agent=HEADERS['User-Agent'])
 
         # Create connector with connection pooling
-        connector = aiohttp.TCPConnector(limit=30, limit_per_host=10)
-
-        async with aiohttp.ClientSession(connector=connector) as session:
-            # Build list of all tasks with metadata
-            tasks = []  # List of (store, category_name, gender, fetch_coroutine)
-
-            if 'iconic' in stores:
-                for category_name, category_path in self.iconic_categories.items():
-                    if not self._category_matches(category_name, category_groups):
-                        continue
-                    url = f"{self.iconic_url}/{category_path}"
-                    tasks.append(('iconic', category_name, 'Men', self.fetch_page(session, url, self.iconic_url)))
-
-            if 'asos' in stores:
-                for category_name, category_path in self.asos_categories.items():
-                    if not self._category_matches(category_name, category_groups):
-                        continue
-                    url = f"{self.asos_url}/{category_path}"
-                    tasks.append(('asos', category_name, 'Men', self.fetch_page(session, url, self.asos_url)))
-
-            if 'myer' in stores:
-                for category_name, category_path in self.myer_categories.items():
-                    if not self._category_matches(category_name, category_groups):
-                        continue
-                    url = f"{self.myer_url}/{category_path}?sortBy=OnSale"
-                    tasks.append(('myer', category_name, 'Men', self.fetch_page(session, url, self.myer_url)))
-
-            if 'jbhifi' in stores:
-                for category_name, category_path in self.jbhifi_categories.items():
-                    if not self._category_matches(category_name, category_groups):
-                        continue
-                    url = f"{self.jbhifi_url}/{category_path}"
-                    tasks.append(('jbhifi', category_name, 'Unisex', self.fetch_page(session, url, self.jbhifi_url)))
-
-            # Execute non-DJ requests in parallel
-            logger.info(f"Fetching {len(tasks)} pages from non-DJ stores in parallel...")
-            task_results = await asyncio.gather(*[t[3] for t in tasks], return_exceptions=True)
-            fetch_time = (datetime.now() - start_time).total_seconds()
-            logger.info(f"Non-DJ pages fetched in {fetch_time:.2f}s")
-
-            # David Jones: sequential Playwright (3 concurrent max to avoid timeouts)
-            dj_tasks = []
-            if 'davidjones' in stores:
-                dj_urls = [
-                    (category_name, f"{self.davidjones_url}/{category_path}")
-                    for category_name, category_path in self.davidjones_categories.items()
-                    if self._category_matches(category_name, category_groups)
-                ]
-                logger.info(f"Fetching {len(dj_urls)} David Jones pages (3 at a time)...")
-                sem = asyncio.Semaphore(3)
-
-                async def fetch_dj(cat, url):
-                    async with sem:
-                        return await self.fetch_page_playwright(url)
-
-                dj_results = await asyncio.gather(
-                    *[fetch_dj(cat, url) for cat, url in dj_urls],
-                    return_exceptions=True
-                )
-                for (category_name, _), html in zip(dj_urls, dj_results):
-                    dj_tasks.append(('davidjones', category_name, 'Men', html))
-
-            # Track counts per store
-            store_counts = {}
-
-            # Process results — non-DJ stores then DJ
-            all_tasks_results = list(zip(tasks, task_results)) + [
-                ((store, cat, gender, None), html)
-                for (store, cat, gender, html) in dj_tasks
-            ]
-
-            for (store, category_name, gender, _), html in all_tasks_results:
-                if isinstance(html, Exception):
-                    logger.error(f"Error fetching {store}/{category_name}: {html}")
-                    continue
-
-                # Parse based on store
-                if store == 'iconic':
-                    items = self.parse_iconic_category(html, category_name, gender)
-                elif store == 'asos':
-                    items = self.parse_asos_category(html, category_name, gender)
-                elif store == 'myer':
-                    items = self.parse_myer_category(html, category_name, gender)
-                elif store == 'jbhifi':
-                    items = self.parse_jbhifi_category(html, category_name)
-                elif store == 'davidjones':
-                    items = self.parse_davidjones_category(html, category_name, gender)
-                else:
-                    items = []
-
-                if items:
-                    logger.info(f"{store}/{category_name}: {len(items)} items")
-                    store_counts[store] = store_counts.get(store, 0) + len(items)
-
-                all_items.extend(items)
-
-            # Log per-store totals
-            for store, count in store_counts.items():
-                logger.info(f"Total from {store}: {count} items")
-
-        # Limit to top 50 per category by deal score proxy
-        TOP_N = 50
-        by_category: Dict[str, List[Dict]] = {}
-        for item in all_items:
-            cat = item.get('category', 'Other')
-            by_category.setdefault(cat, []).append(item)
-
-        all_items = []
-        for cat, cat_items in by_category.items():
-            cat_items.sort(key=self._deal_score_proxy, reverse=True)
-            all_items.extend(cat_items[:TOP_N])
-            if len(cat_items) > TOP_N:
-                logger.info(f"{cat}: kept top {TOP_N} of {len(cat_items)} items")
-
-        # Final sort by deal score proxy
-        all_items.sort(key=self._deal_score_proxy, reverse=True)
+        connector = aiohttp.TCPConnector(limit=MAX_CONNECTIONS, limit_per_host=0)
 
-        total_time = (datetime.now() - start_time).total_seconds()
-        logger.info(f"Total scraping complete: {len(all_items)} items in {total_time:.2f}s")
+        executor = None
+        if self.parse_mode == 'process':
+            executor = parse_pool.new_executor(self.parse_workers)
+        elif self.parse_mode == 'pinned':
+            executor = parse_pool.pinned_executor(self.parse_workers)
 
-        return all_items
+        try:
+            async with aiohttp.ClientSession(connector=connector, trace_configs=[metrics.trace_config()]) as session:
+                # Finished pages wait here for the parser; producers block when it is full
+                pages: asyncio.Queue = asyncio.Queue(maxsize=PAGE_QUEUE_SIZE)
+                # Parsed pages wait here for the caller; None marks the end of the crawl
+                results: asyncio.Queue = asyncio.Queue(maxsize=RESULT_QUEUE_SIZE)
+                # Per (store, category): product URLs seen so far, fetch tasks by page,
+                # and the page at which the crawl stopped
+                crawls: Dict[tuple, Dict] = {}
+                # Held from before a fetch until its page is parsed (see MAX_PENDING_PAGES)
+                pending = asyncio.Semaphore(MAX_PENDING_PAGES)
+                outstanding = 0
+                all_done = asyncio.Event()
+
+                def finish_one():
+                    nonlocal outstanding
+                    outstanding -= 1
+                    if outstanding == 0:
+                        all_done.set()
+
+                async def produce(job: PageJob):
+                    adapter = adapters[job.store]
+                    fetch_url = job.url if job.page == 1 else page_url(adapter.page_param, job.url, job.page)
+                    await pending.acquire()
+                    record = metrics.page(job.store, adapter.source, job.category,
+                                          _page_label(job.category, job.page), job.page, fetch_url)
+                    try:
+                        try:
+                            if adapter.fetch_mode == 'browser':
+                                html = await self.fetch_page_playwright(fetch_url, adapter.timeout,
+                                                                        adapter.wait_selector, record)
+                            else:
+                                # Pages the store holds a digest for are downloaded whole and hashed
+                                # before any parse (_process_page); only new pages parse while streaming
+                                stream = self.stream_parse and not (
+                                    self.page_store is not None and self.page_store.has_entry(job.store, fetch_url))
+                                html = await self.fetch_page(session, fetch_url, job.referer, adapter.timeout,
+                                                             adapter.spec if stream else None, record)
+                        except asyncio.CancelledError:
+                            record.error = CANCELLED
+                            record.finished = time.monotonic()
+                            raise
+                        except Exception as e:
+                            html = e
+                            record.error = str(e) or type(e).__name__
+                        await pages.put((job, fetch_url, html, record))
+                    except BaseException:
+                        # Never handed to the parser: give the slot back here
+                        pending.release()
+                        raise
+
+                def on_fetch_done(task: asyncio.Task):
+                    # A page cancelled before reaching the queue will never be consumed
+                    if task.cancelled():
+                        finish_one()
+
+                def schedule(job: PageJob):
+                    nonlocal outstanding
+                    outstanding += 1
+                    crawl = crawls.setdefault((job.store, job.category), {'seen': set(), 'tasks': {}, 'stop': None})
+                    task = crawl['tasks'][job.page] = asyncio.create_task(produce(job))
+                    task.add_done_callback(on_fetch_done)
+
+                def schedule_more(job: PageJob, html: str, new_urls: int, fetched: bool):
+                    """Queue follow-up pages, or stop the category when a fetched page adds nothing new"""
+                    crawl = crawls[(job.store, job.category)]
+                    adapter = adapters[job.store]
+                    max_pages = adapter.max_pages
+                    if stops_category(job.page, fetched, new_urls):
+                        crawl['stop'] = job.page
+                        for page, task in crawl['tasks'].items():
+                            if page > job.page:
+                                task.cancel()
+                        return
+                    if job.page == 1:
+                        page_count = discover_page_count(adapter.page_param, html, job.url)
+                        if page_count:
+                            # Known page count: fetch the rest in parallel (host limits still apply)
+                            for page in range(2, min(page_count, max_pages) + 1):
+                                schedule(job._replace(page=page))
+                            return
+                    # Unknown page count: follow rel="next" one page at a time
+                    if job.page + 1 not in crawl['tasks'] and job.page < max_pages and has_next_link(html):
+                        schedule(job._replace(page=job.page + 1))
+
+                # Track counts per store
+                store_counts = {}
+
+                async def consume():
+                    while True:
+                        job, fetch_url, html, record = await pages.get()
+                        try:
+                            crawl = crawls[(job.store, job.category)]
+                            if crawl['stop'] is not None and job.page > crawl['stop']:
+                                record.error = CANCELLED
+                                continue
+                            if isinstance(html, Exception):
+                                logger.error(f"Error fetching {job.store}/{job.category} page {job.page}: {html}")
+                                continue
+                            if not html:
+                                # 429/5xx, a 304 without its cached body, a network error: nothing to
+                                # parse, and no sign the listing ran out - the other pages still run
+                                record.error = record.error or f"status {record.status}"
+                                logger.error(f"Failed to fetch {job.store}/{job.category} page {job.page} "
+                                             f"({record.error})")
+                                continue
+
+                            category_name = record.label
+                            parse_start = time.perf_counter()
+                            try:
+                                items = await self._process_page(job.store, category_name, job.gender, fetch_url,
+                                                                 html, scraped_at, executor, record.cached)
+                            except Exception as e:
+                                logger.error(f"Error parsing {job.store}/{category_name}: {e}")
+                                record.error = f"parse: {e}"
+                                continue
+                            finally:
+                                record.parse_ms = round((time.perf_counter() - parse_start) * 1000, 2)
+                            record.unchanged = self.page_store is not None and fetch_url in self.page_store.unchanged
+
+                            # The same product can reappear on later pages as the listing shifts
+                            items = [deal for deal in items if deal.url not in crawl['seen']]
+                            crawl['seen'].update(deal.url for deal in items)
+                            record.items = len(items)
+                            fetched = record.error is None and (record.status == 200 or record.cached)
+                            schedule_more(job, page_markup(html), len(items), fetched)
+
+                            if items:
+                                logger.info(f"{job.store}/{category_name}: {len(items)} items")
+                                store_counts[job.store] = store_counts.get(job.store, 0) + len(items)
+                                await results.put(items)
+                        finally:
+                            del html
+                            pending.release()
+                            record.finished = time.monotonic()
+                            finish_one()
+
+                for job in jobs:
+                    schedule(job)
+                logger.info(f"Fetching {len(jobs)} categories ({sum(adapters[j.store].fetch_mode == 'browser' for j in jobs)} via Playwright)...")
+
+                async def end_of_crawl():
+                    await all_done.wait()
+                    await results.put(None)
+
+                # One parser inline; one per worker when parsing is offloaded
+                consumers = [asyncio.create_task(consume()) for _ in range(1 if executor is None else self.parse_workers)]
+                if not jobs:
+                    all_done.set()
+                consumers.append(asyncio.create_task(end_of_crawl()))
+                try:
+                    while (items := await results.get()) is not None:
+                        for deal in items:
+                            yield deal
+                        del items
+                finally:
+                    for task in consumers:
+                        task.cancel()
+                    for crawl in crawls.values():
+                        for task in crawl['tasks'].values():
+                            task.cancel()
+                    await asyncio.gather(*consumers, return_exceptions=True)
+
+                pages_fetched = sum(not task.cancelled() for crawl in crawls.values() for task in crawl['tasks'].values())
+                logger.info(f"Crawled {pages_fetched} pages across {len(crawls)} categories")
+
+                fetch_time = (datetime.now() - start_time).total_seconds()
+                logger.info(f"All pages fetched and parsed in {fetch_time:.2f}s")
+        finally:
+            if owns_pool:
+                await self.browser_pool.close()
+                self.browser_pool = None
+            if self.parse_mode == 'process':
+                # Every parse has been awaited (or cancelled) by now; don't block the event loop
+                # joining the workers, they exit in the background
+                executor.shutdown(wait=False, cancel_futures=True)
+
+        # Log per-store totals
+        for store, count in store_counts.items():
+            logger.info(f"Total from {store}: {count} items")
+
+        if self.http_cache is not None and self.http_cache.revalidated:
+            logger.info(f"HTTP cache: {len(self.http_cache.revalidated)} pages not modified, "
+                        f"{self.http_cache.bytes_saved / 1e6:.1f} MB reused")
+
+        if self.page_store is not None and self.page_store.unchanged:
+            logger.info(f"Page store: {len(self.page_store.unchanged)} of {pages_fetched} pages unchanged "
+                        f"(parse skipped for {len(self.unchanged_urls)} items)")
+
+        concurrency = self.rate_controller.report()
+        for host, stats in concurrency.items():
+            logger.info(f"Concurrency {host}: limit {stats['limit']} (peak {stats['peak_limit']}), "
+                        f"{stats['requests']} requests, {stats['throttled']} throttled, {stats['errors']} errors")
+
+        metrics.extra['concurrency'] = concurrency
+        metrics.finish()
+        units = metrics.units()
+        if units:
+            slowest = units[0]
+            logger.info(f"Slowest category: {slowest['store']}/{slowest['category']} "
+                        f"({slowest['wall_ms'] / 1000:.2f}s over {slowest['pages']} pages)")
 
 
 def scrape_all_sync(stores: List[str] = None,
-                    category_groups: List[str] = None) -> List[Dict]:
+                    category_groups: List[str] = None, top_n: Optional[int] = TOP_N) -> List[Dict]:
     """Synchronous wrapper for async scraping - use this from sync code"""
     scraper = AsyncDiscountScraper()
-    return asyncio.run(scraper.scrape_all(stores=stores, category_groups=category_groups))
+    return asyncio.run(scraper.scrape_all(stores=stores, category_groups=category_groups, top_n=top_n))
 
 
 if __name__ == "__main__":
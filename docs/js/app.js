@@ -4,6 +4,9 @@ const API_URL = window.location.hostname === 'localhost'
     ? 'http://localhost:8080/api/scrape'
     : '/api/scrape';
 
+// Static snapshots published by run_scraper (docs/data); the API is the fallback
+const STATIC_DATA_URL = 'data';
+
 let cachedItems = [];
 let filteredItems = [];
 let lastScrapedTime = null;
@@ -374,18 +377,23 @@ async function scrapeDeals() {
 
         // Build query string from scrape config
         const config = getScrapeConfig();
-        const params = new URLSearchParams();
-        if (config.categories.length) params.set('categories', config.categories.join(','));
-        if (config.stores.length) params.set('stores', config.stores.join(','));
-        const url = params.toString() ? `${API_URL}?${params}` : API_URL;
+        let data = await loadStaticShards(config);
 
-        const response = await fetch(url);
+        if (!data) {
+            const params = new URLSearchParams();
+            if (config.categories.length) params.set('categories', config.categories.join(','));
+            if (config.stores.length) params.set('stores', config.stores.join(','));
+            const url = params.toString() ? `${API_URL}?${params}` : API_URL;
 
-        if (!response.ok) {
-            throw new Error(`API error: ${response.status}`);
-        }
+            const response = await fetch(url);
+
+            if (!response.ok) {
+                const failure = await response.json().catch(() => ({}));
+                throw new Error(failure.error || `API error: ${response.status}`);
+            }
 
-        const data = await response.json();
+            data = await response.json();
+        }
         const elapsed = ((Date.now() - startTime) / 1000).toFixed(1);
 
         if (data.success && data.items) {
@@ -436,6 +444,56 @@ async function scrapeDeals() {
     }
 }
 
+// Static shards: one per store and per category group, named in data/manifest.json.
+// Returns an API-shaped response, or null when the selection needs the API
+// (stores and categories combined, no manifest, or no gzip support).
+async function loadStaticShards(config) {
+    let names;
+    if (config.stores.length && config.categories.length) return null;
+    if (config.stores.length) names = config.stores.map(s => `store-${s}`);
+    else if (config.categories.length) names = config.categories.map(c => `category-${c}`);
+    else names = ['all'];
+
+    try {
+        const resp = await fetch(`${STATIC_DATA_URL}/manifest.json`, { cache: 'no-cache' });
+        if (!resp.ok) return null;
+        const manifest = await resp.json();
+        const entries = names.map(name => manifest.shards && manifest.shards[name]);
+        if (entries.some(entry => !entry)) return null;
+
+        const shards = await Promise.all(entries.map(entry => fetchShard(entry.file)));
+        if (shards.some(shard => !shard)) return null;
+
+        // Category groups can share items: keep the first copy of each product
+        const seen = new Set();
+        const items = [];
+        shards.forEach(shard => shard.items.forEach(item => {
+            const key = `${item.source}|${item.url}`;
+            if (seen.has(key)) return;
+            seen.add(key);
+            items.push(item);
+        }));
+        return { success: true, items, total: items.length, timestamp: manifest.timestamp, cached: true };
+    } catch (e) {
+        console.warn('Static data unavailable, using the API:', e);
+        return null;
+    }
+}
+
+async function fetchShard(file) {
+    const resp = await fetch(`${STATIC_DATA_URL}/${file}`);
+    if (!resp.ok) return null;
+    const bytes = new Uint8Array(await resp.arrayBuffer());
+    // Served with Content-Encoding: gzip the browser has already inflated it; hosts
+    // that do not set the header (GitHub Pages) hand over the raw .gz bytes
+    if (bytes[0] === 0x1f && bytes[1] === 0x8b) {
+        if (typeof DecompressionStream === 'undefined') return null;
+        const stream = new Blob([bytes]).stream().pipeThrough(new DecompressionStream('gzip'));
+        return JSON.parse(await new Response(stream).text());
+    }
+    return JSON.parse(new TextDecoder().decode(bytes));
+}
+
 // Filter and display items
 function filterAndDisplay() {
     const category = document.getElementById('category').value;
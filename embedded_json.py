@@ -0,0 +1,187 @@
+"""
+Fast path for store pages that ship their product grid as embedded JSON
+(JSON-LD, __NEXT_DATA__ / initial-state blobs). Finds the payloads with a regex
+scan and a JSON decoder - no DOM is built - and maps product-shaped objects to
+plain records. Only grid-shaped payloads count (an ItemList, or about a page of
+products): a lone featured-product JSON-LD must not stand in for the grid.
+Callers fall back to DOM parsing when nothing grid-shaped is found.
+"""
+import json
+import re
+from typing import Dict, List, Optional, Tuple
+
+# <script type="application/ld+json"> / type="application/json" (incl. id="__NEXT_DATA__")
+_JSON_SCRIPT_RE = re.compile(
+    r'<script\b[^>]*\btype=["\']application/(?:ld\+)?json["\'][^>]*>(.*?)</script>',
+    re.IGNORECASE | re.DOTALL)
+
+# window.__INITIAL_STATE__ = {...}; and friends - decoded with raw_decode from the brace
+# (the literal "__" prefix keeps the scan fast on MB-sized pages)
+_STATE_ASSIGN_RE = re.compile(
+    r'__(?:INITIAL_STATE|PRELOADED_STATE|NEXT_DATA|APOLLO_STATE|NUXT)__\s*=\s*(?=[{\[])')
+
+_NAME_KEYS = ('name', 'productName', 'title')
+_URL_KEYS = ('url', 'productUrl', 'pdpUrl', 'link', 'href')
+_BRAND_KEYS = ('brand', 'brandName', 'designer')
+_PRICE_KEYS = ('price', 'salePrice', 'currentPrice', 'finalPrice', 'nowPrice')
+_ORIGINAL_KEYS = ('originalPrice', 'wasPrice', 'previousPrice', 'rrp', 'listPrice', 'regularPrice')
+
+# Stop walking absurdly large state trees
+_MAX_NODES = 200000
+
+# Fewer products than this outside an ItemList are a widget (featured / recommended
+# products), not the grid - category pages carry 24-60
+MIN_GRID_PRODUCTS = 12
+
+_decoder = json.JSONDecoder()
+
+
+def find_json_blobs(html: str) -> List:
+    """Decoded JSON payloads embedded in the page (undecodable ones are skipped)"""
+    blobs = []
+    if not html:
+        return blobs
+    for match in _JSON_SCRIPT_RE.finditer(html):
+        payload = match.group(1).strip()
+        if not payload:
+            continue
+        try:
+            blobs.append(json.loads(payload))
+        except ValueError:
+            continue
+    for match in _STATE_ASSIGN_RE.finditer(html):
+        try:
+            value, _ = _decoder.raw_decode(html, match.end())
+        except ValueError:
+            continue
+        blobs.append(value)
+    return blobs
+
+
+def _to_number(value) -> Optional[float]:
+    if isinstance(value, bool) or value is None:
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        cleaned = re.sub(r'[^\d.]', '', value.replace(',', ''))
+        try:
+            return float(cleaned) if cleaned else None
+        except ValueError:
+            return None
+    if isinstance(value, dict):
+        # {"value": 12.5, "text": "$12.50"} / {"amount": ...}
+        for key in ('value', 'amount', 'price'):
+            if key in value:
+                return _to_number(value[key])
+    return None
+
+
+def _first(obj: Dict, keys) -> object:
+    for key in keys:
+        value = obj.get(key)
+        if value not in (None, '', [], {}):
+            return value
+    return None
+
+
+def _prices(obj: Dict):
+    """(current, original) as floats from the common price shapes"""
+    current = original = None
+
+    offers = obj.get('offers')
+    if isinstance(offers, list) and offers:
+        offers = offers[0]
+    if isinstance(offers, dict):
+        current = _to_number(offers.get('price') or offers.get('lowPrice'))
+        spec = offers.get('priceSpecification')
+        if isinstance(spec, dict):
+            original = _to_number(spec.get('price'))
+
+    price = obj.get('price')
+    if current is None and isinstance(price, dict) and ('current' in price or 'previous' in price):
+        # ASOS-style {"current": {...}, "previous": {...}, "rrp": {...}}
+        current = _to_number(price.get('current'))
+        original = _to_number(price.get('previous')) or _to_number(price.get('rrp'))
+    if current is None:
+        current = _to_number(_first(obj, _PRICE_KEYS))
+    if original is None:
+        original = _to_number(_first(obj, _ORIGINAL_KEYS))
+    return current, original
+
+
+def _product_record(obj: Dict) -> Optional[Dict]:
+    name = _first(obj, _NAME_KEYS)
+    url = _first(obj, _URL_KEYS)
+    if not isinstance(name, str) or not isinstance(url, str):
+        return None
+    current, original = _prices(obj)
+    if current is None or current <= 0:
+        return None
+    brand = _first(obj, _BRAND_KEYS)
+    if isinstance(brand, dict):
+        brand = brand.get('name')
+    return {
+        'brand': brand.strip() if isinstance(brand, str) else None,
+        'name': name.strip(),
+        'url': url,
+        'current_price': current,
+        'original_price': original if original and original > current else None,
+    }
+
+
+def script_blobs(script_type: Optional[str], body: Optional[str]) -> Tuple[List, List]:
+    """(JSON payloads, state-assignment payloads) of one parsed <script> element,
+    read the way find_json_blobs reads them from raw HTML"""
+    json_blobs, state_blobs = [], []
+    body = body or ''
+    if (script_type or '').strip().lower() in ('application/json', 'application/ld+json'):
+        payload = body.strip()
+        if payload:
+            try:
+                json_blobs.append(json.loads(payload))
+            except ValueError:
+                pass
+    for match in _STATE_ASSIGN_RE.finditer(body):
+        try:
+            value, _ = _decoder.raw_decode(body, match.end())
+        except ValueError:
+            continue
+        state_blobs.append(value)
+    return json_blobs, state_blobs
+
+
+def _is_item_list(node: Dict) -> bool:
+    return node.get('@type') == 'ItemList' or 'itemListElement' in node
+
+
+def products_from_blobs(blobs: List) -> List[Dict]:
+    """Product records of the page's grid in decoded JSON payloads, de-duplicated by URL,
+    in order: the products inside ItemLists when there are any, else every product when
+    there are at least MIN_GRID_PRODUCTS, else none"""
+    listed, loose = [], []
+    seen = set()
+    visited = 0
+    stack = [(blob, False) for blob in reversed(blobs)]
+    while stack and visited < _MAX_NODES:
+        node, in_list = stack.pop()
+        visited += 1
+        if isinstance(node, dict):
+            record = _product_record(node)
+            if record is not None:
+                if (in_list, record['url']) not in seen:
+                    seen.add((in_list, record['url']))
+                    (listed if in_list else loose).append(record)
+                continue
+            in_list = in_list or _is_item_list(node)
+            stack.extend((value, in_list) for value in reversed(list(node.values())))
+        elif isinstance(node, list):
+            stack.extend((value, in_list) for value in reversed(node))
+    if listed:
+        return listed
+    return loose if len(loose) >= MIN_GRID_PRODUCTS else []
+
+
+def extract_products(html: str) -> List[Dict]:
+    """Grid product records from embedded JSON, de-duplicated by URL, in document order"""
+    return products_from_blobs(find_json_blobs(html))
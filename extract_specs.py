@@ -0,0 +1,177 @@
+"""
+Declarative extraction specs, compiled once into lxml XPath.
+Each spec names the product containers and, per field, the XPath alternatives
+to try (first hit wins). Store adapters (stores/<key>.py) define their SPEC with
+these building blocks; the selectors mirror the BeautifulSoup lookups in
+soup_parsers.py, so both engines return the same items.
+"""
+import re
+from typing import Dict, List, Optional, Tuple
+
+from lxml import etree
+
+_UPPER = 'ABCDEFGHIJKLMNOPQRSTUVWXYZ'
+_LOWER = 'abcdefghijklmnopqrstuvwxyz'
+
+
+# XPath building blocks matching bs4's class_ semantics (each class token,
+# then the whole class string, is tested against the filter)
+def class_token(token: str) -> str:
+    """class_='token' - exact class token"""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {token} ')"
+
+
+def class_contains(*subs: str) -> str:
+    """class_=lambda x: all(s in x) - case-sensitive substrings of the class attribute"""
+    return ' and '.join(f"contains(@class, '{s}')" for s in subs)
+
+
+def class_icontains(sub: str) -> str:
+    """class_=lambda x: s in str(x).lower()"""
+    return f"contains(translate(@class, '{_UPPER}', '{_LOWER}'), '{sub}')"
+
+
+def class_suffix(suffix: str) -> str:
+    """class_=lambda x: x.endswith(suffix) - some class token ends with suffix"""
+    return f"contains(concat(normalize-space(@class), ' '), '{suffix} ')"
+
+
+def any_of(*conditions: str) -> str:
+    return '(' + ' or '.join(conditions) + ')'
+
+
+class Field:
+    """One extracted field: XPath alternatives relative to the product node
+    (or to another field's element via `within`), optionally an attribute"""
+
+    def __init__(self, *xpaths: str, attr: str = None, within: str = None):
+        self.sources = xpaths
+        self.xpaths = [etree.XPath(x) for x in xpaths]
+        self.attr = attr
+        self.within = within
+
+
+# Container alternatives of the form //tag[predicate] ...
+_CONTAINER_RE = re.compile(r'^//([\w*]+)(\[.*\])?$')
+# ... and field XPaths that leave the container
+_OUTSIDE_AXES_RE = re.compile(r'^\(?/|\.\.|\b(?:ancestor|parent|preceding|following)(?:-or-self|-sibling)?::')
+
+
+def _single_predicate(predicate: str) -> bool:
+    """True for '' or one bracketed predicate whose brackets only close at the end"""
+    depth = 0
+    for index, char in enumerate(predicate):
+        depth += (char == '[') - (char == ']')
+        if depth == 0 and index != len(predicate) - 1:
+            return False
+    return depth == 0
+
+
+class StoreSpec:
+    """Compiled spec: product container alternatives + named fields"""
+
+    def __init__(self, products: List[str], fields: Dict[str, Field], limit: int = None):
+        self.product_sources = products
+        self.products_xpaths = [etree.XPath(x) for x in products]
+        self.fields = fields
+        self.limit = limit
+        self.container_tests = self._container_tests()
+
+    def _container_tests(self) -> Optional[List[Tuple[str, etree.XPath]]]:
+        """(tag, self-test) per container alternative when every field is looked up
+        inside the container - such products can be extracted as soon as the
+        container's closing tag is parsed. None when any field reaches outside."""
+        for field in self.fields.values():
+            if any(_OUTSIDE_AXES_RE.search(source) for source in field.sources):
+                return None
+        tests = []
+        for source in self.product_sources:
+            match = _CONTAINER_RE.match(source)
+            if match is None:
+                return None
+            tag, predicate = match.groups()
+            predicate = predicate or ''
+            # One predicate (not //a[...]//b[...]) that does not look ahead in the document
+            if 'following' in predicate or not _single_predicate(predicate):
+                return None
+            tests.append((tag, etree.XPath(f"self::{tag}{predicate}")))
+        return tests
+
+    def products(self, root) -> list:
+        """Product nodes from the first container alternative that matches"""
+        if root is None:
+            return []
+        for xpath in self.products_xpaths:
+            nodes = xpath(root)
+            if nodes:
+                return nodes[:self.limit] if self.limit else nodes
+        return []
+
+    def extracted(self, page) -> List[Tuple]:
+        """(product node, fields) pairs for a page: HTML text/bytes, or a
+        stream_parse.StreamedPage whose products were extracted while it downloaded"""
+        if page is None or isinstance(page, (str, bytes)):
+            return [(node, self.extract(node)) for node in self.products(parse_document(page))]
+        return page.extracted(self)
+
+    def extract(self, node) -> Dict:
+        """Field name -> element (or attribute value); None when nothing matched"""
+        values = {}
+        for name, field in self.fields.items():
+            context = node if field.within is None else values.get(field.within)
+            value = None
+            if context is not None:
+                for xpath in field.xpaths:
+                    hits = xpath(context)
+                    if hits:
+                        value = hits[0]
+                        break
+            if value is not None and field.attr is not None:
+                value = value.get(field.attr)
+            values[name] = value
+        return values
+
+
+_TEXT = etree.XPath('descendant::text()[not(parent::script) and not(parent::style)]')
+_DOLLAR_SPANS = etree.XPath('descendant::span')
+
+
+def parse_document(html):
+    """Parse HTML (str or bytes) with lxml; None for an empty document"""
+    if not html:
+        return None
+    try:
+        return etree.HTML(html)
+    except ValueError:
+        # str input with an XML encoding declaration - let lxml sniff the bytes instead
+        return etree.HTML(html.encode('utf-8'))
+
+
+def text(element) -> str:
+    """Equivalent of bs4 get_text(strip=True)"""
+    if element is None:
+        return ''
+    return ''.join(s.strip() for s in _TEXT(element))
+
+
+def own_string(element) -> Optional[str]:
+    """Equivalent of bs4 Tag.string: the single string child, recursing through single children"""
+    while True:
+        if len(element) == 0:
+            return element.text
+        if element.text or len(element) != 1 or element[0].tail:
+            return None
+        element = element[0]
+        if not isinstance(element.tag, str):
+            # Comment / processing instruction: bs4 returns its text
+            return element.text
+
+
+def spans_with_string(element, pattern: re.Pattern) -> list:
+    """Equivalent of bs4 find_all('span', string=pattern)"""
+    matches = []
+    for span in _DOLLAR_SPANS(element):
+        value = own_string(span)
+        if value is not None and pattern.search(value):
+            matches.append(span)
+    return matches
@@ -0,0 +1,104 @@
+"""
+On-disk HTTP cache for category pages with conditional revalidation.
+Stores each body with its ETag/Last-Modified validators (and the items parsed
+from it) so the next run can send If-None-Match/If-Modified-Since and reuse
+both the bytes and the parsed items on a 304.
+"""
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class HttpCache:
+    """URL-keyed cache: <sha1>.json holds validators + parsed items, <sha1>.body the raw bytes"""
+
+    def __init__(self, directory: str):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+        # URLs answered with 304 during the current run, and bytes saved by them
+        self.revalidated = set()
+        self.bytes_saved = 0
+
+    def reset_run(self):
+        self.revalidated.clear()
+        self.bytes_saved = 0
+
+    def _path(self, url: str, suffix: str) -> str:
+        key = hashlib.sha1(url.encode()).hexdigest()
+        return os.path.join(self.directory, f"{key}.{suffix}")
+
+    def _read_meta(self, url: str) -> Optional[Dict]:
+        try:
+            with open(self._path(url, 'json'), 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return meta if meta.get('url') == url else None
+
+    def _write(self, path: str, data: bytes):
+        tmp = f"{path}.tmp"
+        with open(tmp, 'wb') as f:
+            f.write(data)
+        os.replace(tmp, path)
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        """Validator headers for a revalidation request (empty if nothing cached)"""
+        meta = self._read_meta(url)
+        if not meta or not os.path.exists(self._path(url, 'body')):
+            return {}
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+        return headers
+
+    def store(self, url: str, body: bytes, etag: str = None, last_modified: str = None,
+              encoding: str = 'utf-8'):
+        """Save a 200 response; skipped when the server sent no validators"""
+        self.revalidated.discard(url)
+        if not etag and not last_modified:
+            return
+        try:
+            self._write(self._path(url, 'body'), body)
+            meta = {'url': url, 'etag': etag, 'last_modified': last_modified,
+                    'encoding': encoding, 'items': None}
+            self._write(self._path(url, 'json'), json.dumps(meta).encode())
+        except OSError as e:
+            logger.warning(f"HTTP cache write failed for {url}: {e}")
+
+    def load(self, url: str) -> Optional[str]:
+        """Decoded cached body after a 304; records the URL as revalidated"""
+        meta = self._read_meta(url)
+        if not meta:
+            return None
+        try:
+            with open(self._path(url, 'body'), 'rb') as f:
+                body = f.read()
+        except OSError:
+            return None
+        self.revalidated.add(url)
+        self.bytes_saved += len(body)
+        return body.decode(meta.get('encoding') or 'utf-8', errors='replace')
+
+    def load_items(self, url: str) -> Optional[List[Dict]]:
+        """Items parsed from the cached body, only if the URL was revalidated this run"""
+        if url not in self.revalidated:
+            return None
+        meta = self._read_meta(url)
+        return meta.get('items') if meta else None
+
+    def store_items(self, url: str, items: List[Dict]):
+        """Attach parsed items to the cached body so a later 304 can skip parsing"""
+        meta = self._read_meta(url)
+        if not meta:
+            return
+        meta['items'] = items
+        try:
+            self._write(self._path(url, 'json'), json.dumps(meta).encode())
+        except OSError as e:
+            logger.warning(f"HTTP cache write failed for {url}: {e}")
@@ -0,0 +1,97 @@
+"""
+Content-addressed store of category pages for incremental scraping.
+Each (store, page URL) maps to a hash of its normalised product-grid HTML and
+the items extracted from it. When a fetched page hashes the same as last time
+its items are reused without a parse (the price index, not this store, decides
+which snapshots to write). Store-side cache headers are unreliable, so this
+does not depend on ETag/Last-Modified.
+"""
+import hashlib
+import json
+import logging
+import os
+import re
+import time
+from typing import Dict, List, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+# Markup that changes between identical listings: scripts other than JSON data
+# (nonces, tracking, build ids), styles and comments; then per-request attributes.
+# Both patterns start with a literal so the scan stays fast on MB-sized pages.
+_VOLATILE_BLOCK_RE = re.compile(
+    r'<(?:script\b(?![^>]*application/(?:ld\+)?json)[^>]*>.*?</script>'
+    r'|(style|noscript)\b[^>]*>.*?</\1>'
+    r'|!--.*?-->)',
+    re.DOTALL | re.IGNORECASE)
+_VOLATILE_ATTR_RE = re.compile(r' (?:nonce|data-(?:csrf[\w-]*|request-id|timestamp))="[^"]*"')
+_BETWEEN_TAGS_RE = re.compile(r'>\s+<')
+# Same patterns for raw response bodies (streamed pages are never decoded to str)
+_BYTES_PATTERNS = tuple(re.compile(p.pattern.encode(), p.flags & ~re.UNICODE)
+                        for p in (_VOLATILE_BLOCK_RE, _VOLATILE_ATTR_RE, _BETWEEN_TAGS_RE))
+
+
+def page_digest(html: Union[str, bytes]) -> str:
+    """Hash of the page with volatile markup and inter-tag whitespace removed"""
+    if isinstance(html, bytes):
+        block_re, attr_re, between_re = _BYTES_PATTERNS
+        normalised = between_re.sub(b'><', attr_re.sub(b'', block_re.sub(b'', html)))
+    else:
+        normalised = _VOLATILE_ATTR_RE.sub('', _VOLATILE_BLOCK_RE.sub('', html))
+        normalised = _BETWEEN_TAGS_RE.sub('><', normalised).encode('utf-8', errors='replace')
+    return hashlib.blake2b(normalised, digest_size=16).hexdigest()
+
+
+class PageStore:
+    """<sha1(store::url)>.json holds the page digest, when it was last parsed, and its items"""
+
+    def __init__(self, directory: str, max_age: float = None):
+        self.directory = directory
+        # Entries older than this (seconds) are re-parsed anyway, so unchanged
+        # products still get a fresh snapshot now and then
+        self.max_age = max_age
+        os.makedirs(directory, exist_ok=True)
+        # Page URLs reused unchanged during the current run
+        self.unchanged = set()
+
+    def _path(self, store: str, url: str) -> str:
+        key = hashlib.sha1(f"{store}::{url}".encode()).hexdigest()
+        return os.path.join(self.directory, f"{key}.json")
+
+    def has_entry(self, store: str, url: str) -> bool:
+        """True when a fresh entry exists for the page (cheap: a stat, the entry is not read)"""
+        try:
+            modified = os.path.getmtime(self._path(store, url))
+        except OSError:
+            return False
+        return self.max_age is None or time.time() - modified <= self.max_age
+
+    def lookup(self, store: str, url: str, digest: str) -> Optional[List[Dict]]:
+        """Items stored for this page if its digest is unchanged (and the entry is fresh)"""
+        try:
+            with open(self._path(store, url), 'r', encoding='utf-8') as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if entry.get('url') != url or entry.get('digest') != digest:
+            return None
+        if self.max_age is not None and time.time() - entry.get('parsed_at', 0) > self.max_age:
+            return None
+        self.unchanged.add(url)
+        return entry.get('items')
+
+    def save(self, store: str, url: str, digest: str, items: List[Dict]):
+        """Record the digest and items of a freshly parsed page"""
+        self.unchanged.discard(url)
+        path = self._path(store, url)
+        entry = {'store': store, 'url': url, 'digest': digest, 'parsed_at': time.time(), 'items': items}
+        try:
+            tmp = f"{path}.tmp"
+            with open(tmp, 'w', encoding='utf-8') as f:
+                json.dump(entry, f)
+            os.replace(tmp, path)
+        except OSError as e:
+            logger.warning(f"Page store write failed for {url}: {e}")
+
+    def reset_run(self):
+        self.unchanged.clear()
@@ -0,0 +1,60 @@
+"""
+Pagination helpers for paged category listings.
+Builds page-N URLs from a store's page parameter, discovers how many pages a category has from
+the links on its first page (falling back to rel="next") and decides when a crawl has run out.
+"""
+import re
+from typing import Optional, Tuple, Union
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+_NEXT_LINK_RE = re.compile(r'<(?:link|a)\b[^>]*\brel=["\']next["\']', re.IGNORECASE)
+_NEXT_LINK_BYTES_RE = re.compile(_NEXT_LINK_RE.pattern.encode(), re.IGNORECASE)
+
+
+def page_url(page_param: Tuple[str, int], url: str, page: int) -> str:
+    """URL of 1-based `page` for a category whose first page is `url`
+
+    `page_param` is the store's (query parameter, index of the first page).
+    """
+    param, first_index = page_param
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True) if k != param]
+    if page > 1 or first_index != 1:
+        query.append((param, str(page - 1 + first_index)))
+    return urlunsplit(parts._replace(query=urlencode(query, safe='[]')))
+
+
+def discover_page_count(page_param: Tuple[str, int], html: Union[str, bytes], url: str) -> Optional[int]:
+    """Highest page number linked from this category's own pager, or None if there is none.
+
+    Only links that contain the category's path count, so site-wide links such
+    as '/womens-sale/?page=1' in the navigation are ignored.
+    """
+    if not html:
+        return None
+    param, first_index = page_param
+    path = urlsplit(url).path.rstrip('/')
+    pattern = re.escape(path) + r'/?[?#][^"\'\s<>]*?(?:[?&]|&amp;)?\b' + re.escape(param) + r'=(\d+)'
+    # Streamed pages hand over the raw body
+    pattern = re.compile(pattern.encode() if isinstance(html, bytes) else pattern)
+    indexes = [int(m) for m in pattern.findall(html)]
+    if not indexes:
+        return None
+    return max(indexes) - first_index + 1
+
+
+def stops_category(page: int, fetched: bool, new_urls: int) -> bool:
+    """True when a later page was fetched and added no product not seen on earlier pages.
+
+    A page that failed (429, 5xx, network error) says nothing about the listing,
+    so it never ends the category's crawl.
+    """
+    return page > 1 and fetched and not new_urls
+
+
+def has_next_link(html: Union[str, bytes]) -> bool:
+    """True when the page advertises a rel="next" link"""
+    if not html:
+        return False
+    pattern = _NEXT_LINK_BYTES_RE if isinstance(html, bytes) else _NEXT_LINK_RE
+    return pattern.search(html) is not None
@@ -0,0 +1,85 @@
+"""
+Process-pool offload for the CPU-bound parse_*_category functions.
+Workers import bs4/lxml once (initializer), parse a page and send back compact
+tuples instead of pickled Deals; the parent re-attaches category/scraped_at.
+"""
+import atexit
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import List
+
+from deal import Deal
+
+logger = logging.getLogger(__name__)
+
+# Field order of the compact records returned by workers
+RECORD_FIELDS = ('source', 'brand', 'name', 'current_cents', 'original_cents',
+                 'discount_percent', 'gender', 'url')
+
+_worker_scraper = None
+_pinned_executor = None
+_pinned_workers = None
+
+
+def _init_worker():
+    """Import the parser stack and build a scraper once per worker process"""
+    global _worker_scraper
+    from discount_scraper_async import AsyncDiscountScraper
+    _worker_scraper = AsyncDiscountScraper(use_http_cache=False, use_page_store=False)
+    # Warm-up parse so bs4's tree builder and lxml are fully initialised
+    _worker_scraper.parse_iconic_category('<html><body></body></html>', '')
+
+
+def parse_in_worker(store: str, html: str, category_name: str, gender: str,
+                    engine: str = 'lxml') -> List[tuple]:
+    """Run one store parser in a worker and return compact records"""
+    if _worker_scraper is None:
+        _init_worker()
+    _worker_scraper.parser_engine = engine
+    items = _worker_scraper.parse_page(store, html, category_name, gender)
+    return [tuple(getattr(deal, field) for field in RECORD_FIELDS) for deal in items]
+
+
+def records_to_items(records: List[tuple], category_name: str, scraped_at: str) -> List[Deal]:
+    """Expand compact worker records back into Deals"""
+    return [Deal.create(source, brand, name, current_cents, original_cents, category_name, gender, url,
+                        scraped_at, discount_percent)
+            for source, brand, name, current_cents, original_cents, discount_percent, gender, url in records]
+
+
+def default_workers() -> int:
+    return os.cpu_count() or 1
+
+
+def new_executor(workers: int = None) -> ProcessPoolExecutor:
+    """Per-run pool; workers are warmed by the initializer"""
+    return ProcessPoolExecutor(max_workers=workers or default_workers(), initializer=_init_worker)
+
+
+def pinned_executor(workers: int = None) -> ProcessPoolExecutor:
+    """Process-wide pool reused across runs so worker imports/state stay warm
+    (shut down by shutdown_pinned, at the latest when the interpreter exits).
+    Asking for a different number of workers replaces the pool."""
+    global _pinned_executor, _pinned_workers
+    workers = workers or default_workers()
+    if _pinned_executor is not None and _pinned_workers != workers:
+        logger.warning(f"Resizing pinned parse pool from {_pinned_workers} to {workers} workers")
+        # Pages already submitted to the old pool still finish
+        _pinned_executor.shutdown(wait=False)
+        _pinned_executor = None
+    if _pinned_executor is None:
+        _pinned_executor = new_executor(workers)
+        _pinned_workers = workers
+        atexit.register(shutdown_pinned)
+    return _pinned_executor
+
+
+def shutdown_pinned():
+    """Stop the pinned pool's workers (the next pinned_executor call starts a new pool)"""
+    global _pinned_executor, _pinned_workers
+    if _pinned_executor is not None:
+        _pinned_executor.shutdown()
+        _pinned_executor = None
+        _pinned_workers = None
+        atexit.unregister(shutdown_pinned)
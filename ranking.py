@@ -0,0 +1,45 @@
+"""
+Streaming top-N selection per category.
+Each category keeps a bounded min-heap of (score, -seq, deal) so memory stays
+O(categories x N) however many pages are crawled; the per-category winners are
+combined into the final ranking with a k-way merge.
+"""
+import heapq
+from itertools import count
+from typing import Callable, Dict, List, Optional
+
+from deal import Deal
+
+
+class CategoryTopN:
+    """Keeps the `limit` best deals per category as they are produced"""
+
+    def __init__(self, score: Callable[[Deal], float], limit: Optional[int] = 50):
+        # limit=None keeps every deal (ranking only)
+        self.score = score
+        self.limit = limit
+        self.heaps: Dict[str, list] = {}
+        self.seen: Dict[str, int] = {}
+        self._seq = count()
+
+    def add(self, deal: Deal):
+        """Score a deal once and keep it if it ranks in its category's top N"""
+        category = deal.category or 'Other'
+        heap = self.heaps.setdefault(category, [])
+        self.seen[category] = self.seen.get(category, 0) + 1
+        # -seq: among equal scores the earlier deal ranks higher (as a stable sort would)
+        entry = (self.score(deal), -next(self._seq), deal)
+        if self.limit is None or len(heap) < self.limit:
+            heapq.heappush(heap, entry)
+        elif entry[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, entry)
+
+    def dropped(self) -> Dict[str, tuple]:
+        """Category -> (kept, seen) for categories that hit the limit"""
+        return {category: (len(self.heaps[category]), seen)
+                for category, seen in self.seen.items() if seen > len(self.heaps[category])}
+
+    def ranked(self) -> List[Deal]:
+        """All kept deals, best first, merged across categories"""
+        runs = [sorted(heap, reverse=True) for heap in self.heaps.values()]
+        return [entry[2] for entry in heapq.merge(*runs, key=lambda entry: entry[:2], reverse=True)]
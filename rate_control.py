@@ -0,0 +1,173 @@
+"""
+Adaptive per-host concurrency control (AIMD) for store requests.
+Every fetch goes through a host slot; limits grow while latency stays flat and
+back off on throttling signals (429/503, other 5xx, timeouts, rising latency).
+"""
+import asyncio
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Dict
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Status codes that mean "slow down" rather than "broken page"
+THROTTLE_STATUSES = {429, 503}
+
+
+class RequestOutcome:
+    """Filled in by the caller inside a slot so the limiter can learn from it"""
+
+    __slots__ = ('status', 'retry_after')
+
+    def __init__(self):
+        self.status = None       # HTTP status, or None if the request raised
+        self.retry_after = None  # Raw Retry-After header value, if any
+
+
+class HostLimiter:
+    """AIMD concurrency window for a single host.
+
+    - success with flat latency: limit += 1/limit (about +1 per full window)
+    - 429/503 or Retry-After: limit halves and new requests pause for the cooldown
+    - other 5xx / errors / latency above `latency_tolerance` x baseline: limit *= 0.75
+    Decreases are applied at most once per `decrease_interval` seconds so one
+    burst of failures from the same window only counts once.
+    """
+
+    def __init__(self, host: str, initial: int = 4, min_limit: int = 1, max_limit: int = 16,
+                 latency_tolerance: float = 2.0, decrease_interval: float = 1.0,
+                 cooldown: float = 2.0):
+        self.host = host
+        self.limit = float(initial)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_tolerance = latency_tolerance
+        self.decrease_interval = decrease_interval
+        self.cooldown = cooldown
+
+        self.in_flight = 0
+        self.blocked_until = 0.0
+        self.min_latency = None
+        self.ewma_latency = None
+        self._last_decrease = 0.0
+        self._cond = asyncio.Condition()
+
+        # Stats for report()
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+        self.peak_limit = self.limit
+
+    async def acquire(self):
+        async with self._cond:
+            while True:
+                wait = self.blocked_until - time.monotonic()
+                if wait > 0:
+                    try:
+                        await asyncio.wait_for(self._cond.wait(), timeout=wait)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                if self.in_flight < int(self.limit):
+                    self.in_flight += 1
+                    return
+                await self._cond.wait()
+
+    async def release(self, outcome: RequestOutcome, latency: float):
+        async with self._cond:
+            self.in_flight -= 1
+            self.requests += 1
+            self._record(outcome, latency)
+            self._cond.notify_all()
+
+    def _record(self, outcome: RequestOutcome, latency: float):
+        status = outcome.status
+        now = time.monotonic()
+
+        if status in THROTTLE_STATUSES or outcome.retry_after is not None:
+            self.throttled += 1
+            self.blocked_until = max(self.blocked_until, now + self._retry_after_seconds(outcome.retry_after))
+            self._decrease(0.5, now, f"throttled ({status})")
+            return
+
+        if status is None or status >= 500:
+            self.errors += 1
+            self._decrease(0.75, now, f"error ({status})")
+            return
+
+        # Latency tracking only on successful responses
+        if self.min_latency is None or latency < self.min_latency:
+            self.min_latency = latency
+        self.ewma_latency = latency if self.ewma_latency is None else 0.8 * self.ewma_latency + 0.2 * latency
+
+        if self.ewma_latency > self.min_latency * self.latency_tolerance + 0.25:
+            self._decrease(0.75, now, f"latency {self.ewma_latency:.2f}s vs {self.min_latency:.2f}s")
+        elif self.limit < self.max_limit:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+            self.peak_limit = max(self.peak_limit, self.limit)
+
+    def _decrease(self, factor: float, now: float, reason: str):
+        if now - self._last_decrease < self.decrease_interval:
+            return
+        self._last_decrease = now
+        new_limit = max(self.min_limit, self.limit * factor)
+        if int(new_limit) < int(self.limit):
+            logger.info(f"{self.host}: concurrency {int(self.limit)} -> {int(new_limit)} ({reason})")
+        self.limit = new_limit
+
+    def _retry_after_seconds(self, value) -> float:
+        try:
+            return min(60.0, max(0.0, float(value)))
+        except (TypeError, ValueError):
+            return self.cooldown
+
+    def stats(self) -> Dict:
+        return {
+            'limit': int(self.limit),
+            'peak_limit': int(self.peak_limit),
+            'requests': self.requests,
+            'throttled': self.throttled,
+            'errors': self.errors,
+            'min_latency': round(self.min_latency, 3) if self.min_latency is not None else None,
+            'avg_latency': round(self.ewma_latency, 3) if self.ewma_latency is not None else None,
+        }
+
+
+class AdaptiveRateController:
+    """Hands out per-host slots; one HostLimiter per hostname.
+
+    Args:
+        defaults: HostLimiter keyword args used for hosts without an override.
+        overrides: hostname -> HostLimiter keyword args (e.g. to cap a browser-rendered host).
+    """
+
+    def __init__(self, defaults: Dict = None, overrides: Dict[str, Dict] = None):
+        self.defaults = defaults or {}
+        self.overrides = overrides or {}
+        self._limiters: Dict[str, HostLimiter] = {}
+
+    def limiter(self, url: str) -> HostLimiter:
+        host = urlparse(url).hostname or url
+        limiter = self._limiters.get(host)
+        if limiter is None:
+            kwargs = {**self.defaults, **self.overrides.get(host, {})}
+            limiter = self._limiters[host] = HostLimiter(host, **kwargs)
+        return limiter
+
+    @asynccontextmanager
+    async def slot(self, url: str):
+        """Wait for a free slot on the URL's host and report the outcome on exit"""
+        limiter = self.limiter(url)
+        await limiter.acquire()
+        outcome = RequestOutcome()
+        start = time.monotonic()
+        try:
+            yield outcome
+        finally:
+            await limiter.release(outcome, time.monotonic() - start)
+
+    def report(self) -> Dict[str, Dict]:
+        """Current limits and counters per host"""
+        return {host: limiter.stats() for host, limiter in sorted(self._limiters.items())}
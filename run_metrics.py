@@ -0,0 +1,221 @@
+"""
+Per-page timings and counters for one scrape, and the run report built from them.
+Every fetched page gets a PageMetrics record: network stages come from an
+aiohttp TraceConfig (DNS, connect, time to first byte), the scraper fills in
+download/render/parse time, bytes, status and item counts. Records roll up
+per (store, category) so the slowest unit of a run stands out.
+"""
+import time
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import aiohttp
+
+# Stage durations summed per unit and in the run totals
+STAGES = ('dns_ms', 'connect_ms', 'ttfb_ms', 'download_ms', 'render_ms', 'parse_ms')
+# PageMetrics.error for fetches abandoned because the crawl of the category stopped
+CANCELLED = 'cancelled'
+
+
+@dataclass
+class PageMetrics:
+    """One fetched page; durations in milliseconds, None when the stage did not happen"""
+    store: str
+    category: str        # catalogue key (the unit)
+    label: str           # category label stamped on the page's deals ("Shirts Page 2")
+    page: int
+    url: str
+    status: Optional[int] = None
+    error: Optional[str] = None
+    bytes: int = 0
+    dns_ms: Optional[float] = None
+    connect_ms: Optional[float] = None
+    ttfb_ms: Optional[float] = None
+    download_ms: Optional[float] = None
+    render_ms: Optional[float] = None
+    parse_ms: Optional[float] = None
+    items: int = 0
+    kept: int = 0
+    cached: bool = False     # body served from the HTTP cache after a 304
+    unchanged: bool = False  # items reused from the page store
+    started: float = field(default=0.0, repr=False)
+    finished: float = field(default=0.0, repr=False)
+
+
+def _ms(seconds: float) -> float:
+    return round(seconds * 1000, 2)
+
+
+class RunMetrics:
+    """Collects PageMetrics for a run and renders the JSON / Prometheus reports"""
+
+    def __init__(self):
+        self.started_at = datetime.now().isoformat()
+        self.finished_at = None
+        self._start = time.monotonic()
+        self._end = None
+        self.pages: List[PageMetrics] = []
+        # (source, category label) -> page record, to attribute kept deals
+        self._by_label: Dict[tuple, PageMetrics] = {}
+        # Extra run-level sections (concurrency, caches) added by the scraper
+        self.extra: Dict = {}
+
+    def page(self, store: str, source: str, category: str, label: str, page: int, url: str) -> PageMetrics:
+        record = PageMetrics(store, category, label, page, url, started=time.monotonic())
+        self.pages.append(record)
+        self._by_label[(source, label)] = record
+        return record
+
+    def count_kept(self, deals):
+        """Attribute the deals that survived top-N selection to their pages"""
+        for record in self.pages:
+            record.kept = 0
+        for deal in deals:
+            record = self._by_label.get((deal.source, deal.category))
+            if record is not None:
+                record.kept += 1
+
+    def finish(self):
+        self._end = time.monotonic()
+        self.finished_at = datetime.now().isoformat()
+
+    def trace_config(self) -> aiohttp.TraceConfig:
+        """aiohttp hooks timing DNS, connect and TTFB into the request's PageMetrics
+        (pass the record as session.get(..., trace_request_ctx=record))"""
+        trace = aiohttp.TraceConfig()
+
+        async def on_request_start(session, ctx, params):
+            ctx.request_start = ctx.ready = time.monotonic()
+
+        async def on_dns_start(session, ctx, params):
+            ctx.dns_start = time.monotonic()
+
+        async def on_dns_end(session, ctx, params):
+            record = ctx.trace_request_ctx
+            if isinstance(record, PageMetrics):
+                record.dns_ms = _ms(time.monotonic() - ctx.dns_start)
+
+        async def on_connect_start(session, ctx, params):
+            ctx.connect_start = time.monotonic()
+
+        async def on_connect_end(session, ctx, params):
+            ctx.ready = time.monotonic()
+            record = ctx.trace_request_ctx
+            if isinstance(record, PageMetrics):
+                # The connector resolves the host inside the connect step; report TCP/TLS only
+                record.connect_ms = max(0.0, round(_ms(ctx.ready - ctx.connect_start) - (record.dns_ms or 0), 2))
+
+        async def on_request_end(session, ctx, params):
+            # Response headers received: first byte measured from a usable connection
+            record = ctx.trace_request_ctx
+            if isinstance(record, PageMetrics):
+                record.ttfb_ms = _ms(time.monotonic() - ctx.ready)
+
+        trace.on_request_start.append(on_request_start)
+        trace.on_dns_resolvehost_start.append(on_dns_start)
+        trace.on_dns_resolvehost_end.append(on_dns_end)
+        trace.on_connection_create_start.append(on_connect_start)
+        trace.on_connection_create_end.append(on_connect_end)
+        trace.on_request_end.append(on_request_end)
+        return trace
+
+    def units(self) -> List[Dict]:
+        """Per (store, category) roll-up, longest wall time first"""
+        grouped: Dict[tuple, List[PageMetrics]] = {}
+        for record in self.pages:
+            grouped.setdefault((record.store, record.category), []).append(record)
+        units = []
+        for (store, category), records in grouped.items():
+            unit = {
+                'store': store,
+                'category': category,
+                'pages': len(records),
+                'statuses': _count(_status_key(r) for r in records),
+                'bytes': sum(r.bytes for r in records),
+                'items': sum(r.items for r in records),
+                'kept': sum(r.kept for r in records),
+                'wall_ms': _ms(max(r.finished or r.started for r in records) - min(r.started for r in records)),
+            }
+            for stage in STAGES:
+                unit[stage] = round(sum(getattr(r, stage) or 0 for r in records), 2)
+            units.append(unit)
+        units.sort(key=lambda u: u['wall_ms'], reverse=True)
+        return units
+
+    def report(self) -> Dict:
+        """Machine-readable run report (JSON-serialisable)"""
+        end = self._end if self._end is not None else time.monotonic()
+        totals = {
+            'pages': len(self.pages),
+            'bytes': sum(r.bytes for r in self.pages),
+            'items': sum(r.items for r in self.pages),
+            'kept': sum(r.kept for r in self.pages),
+            'cached_pages': sum(r.cached for r in self.pages),
+            'unchanged_pages': sum(r.unchanged for r in self.pages),
+            'errors': sum(r.error not in (None, CANCELLED) for r in self.pages),
+        }
+        for stage in STAGES:
+            totals[stage] = round(sum(getattr(r, stage) or 0 for r in self.pages), 2)
+        pages = []
+        for record in self.pages:
+            row = asdict(record)
+            del row['started'], row['finished']
+            pages.append(row)
+        return {
+            'started_at': self.started_at,
+            'finished_at': self.finished_at,
+            'duration_s': round(end - self._start, 3),
+            'totals': totals,
+            'units': self.units(),
+            'pages': pages,
+            **self.extra,
+        }
+
+    def prometheus(self, prefix: str = 'scraper') -> str:
+        """The per-unit roll-up in Prometheus text exposition format"""
+        lines = []
+
+        def metric(name: str, kind: str, help_text: str, samples):
+            lines.append(f"# HELP {prefix}_{name} {help_text}")
+            lines.append(f"# TYPE {prefix}_{name} {kind}")
+            for labels, value in samples:
+                label_text = ','.join(f'{k}="{_escape(v)}"' for k, v in labels.items())
+                lines.append(f"{prefix}_{name}{{{label_text}}} {value}")
+
+        units = self.units()
+        key = lambda u: {'store': u['store'], 'category': u['category']}
+        metric('stage_seconds', 'gauge', 'Time spent per stage, summed over the pages of a store category',
+               [({**key(u), 'stage': stage[:-3]}, round(u[stage] / 1000, 6)) for u in units for stage in STAGES])
+        metric('unit_wall_seconds', 'gauge', 'Wall time from the first fetch to the last parse of a store category',
+               [(key(u), round(u['wall_ms'] / 1000, 6)) for u in units])
+        metric('bytes', 'gauge', 'Response bytes downloaded per store category',
+               [(key(u), u['bytes']) for u in units])
+        metric('pages', 'gauge', 'Pages fetched per store category and HTTP status',
+               [({**key(u), 'status': status}, count) for u in units for status, count in u['statuses'].items()])
+        metric('items', 'gauge', 'Items extracted and kept after top-N per store category',
+               [({**key(u), 'kind': kind}, u[kind]) for u in units for kind in ('items', 'kept')])
+        end = self._end if self._end is not None else time.monotonic()
+        lines.append(f"# HELP {prefix}_run_duration_seconds Duration of the scrape")
+        lines.append(f"# TYPE {prefix}_run_duration_seconds gauge")
+        lines.append(f"{prefix}_run_duration_seconds {round(end - self._start, 3)}")
+        return '\n'.join(lines) + '\n'
+
+
+def _status_key(record: PageMetrics) -> str:
+    if record.status is not None:
+        return str(record.status)
+    if record.error == CANCELLED:
+        return 'cancelled'
+    return 'error' if record.error else 'none'
+
+
+def _count(values) -> Dict[str, int]:
+    counts: Dict[str, int] = {}
+    for value in values:
+        counts[value] = counts.get(value, 0) + 1
+    return counts
+
+
+def _escape(value) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -1,7 +1,9 @@
 """
-Local scraper — runs all stores (including DJ via Playwright) and pushes to Supabase.
+Local scraper — runs all stores (including DJ via Playwright) and pushes to Supabase
+(or to a local SQLite file with SCRAPER_STORAGE=sqlite).
 Schedule this with Windows Task Scheduler to keep data fresh.
 """
+import asyncio
 import os
 import sys
 import json
@@ -12,25 +14,72 @@ root = os.path.dirname(os.path.abspath(__file__))
 sys.path.insert(0, root)
 sys.path.insert(0, os.path.join(root, 'api'))
 
-from discount_scraper_async import scrape_all_sync
-from supabase_client import save_price_history, _product_id
+from discount_scraper_async import AsyncDiscountScraper
+from static_shards import publish_shards
+from price_index import PriceIndex
+from storage import STORAGE_BACKEND, STORAGE_TARGET, get_recent_snapshots, save_price_history, _product_id
+
+# Static JSON shards for the frontend (served from docs/ by Vercel / GitHub Pages)
+STATIC_DATA_DIR = os.environ.get('SCRAPER_STATIC_DIR', os.path.join(root, 'docs', 'data'))
+# Last price written per product, one file per backend; rebuilt from storage when missing
+# or written for another database
+PRICE_INDEX_PATH = os.environ.get(
+    'SCRAPER_PRICE_INDEX', os.path.join(root, '.cache', f'price_index.{STORAGE_BACKEND}.json'))
+
+
+def write_run_report(scraper):
+    """Per-page timings and counters (also for runs that found nothing);
+    SCRAPER_PROMETHEUS_FILE adds a copy for a node_exporter textfile collector"""
+    report_path = os.path.join(root, 'run_report.json')
+    with open(report_path, 'w') as f:
+        json.dump(scraper.metrics.report(), f, indent=2)
+    print(f'Run report saved to {report_path}', flush=True)
+    prometheus_path = os.environ.get('SCRAPER_PROMETHEUS_FILE')
+    if prometheus_path:
+        with open(prometheus_path, 'w') as f:
+            f.write(scraper.metrics.prometheus())
+        print(f'Prometheus metrics saved to {prometheus_path}', flush=True)
+
 
 if __name__ == '__main__':
     print(f'[{datetime.now().strftime("%Y-%m-%d %H:%M:%S")}] Starting scrape...', flush=True)
 
-    items = scrape_all_sync()
+    scraper = AsyncDiscountScraper()
+    items = asyncio.run(scraper.scrape_all())
     print(f'Scraped {len(items)} items', flush=True)
 
     if not items:
-        print('No items scraped — skipping Supabase write', flush=True)
+        write_run_report(scraper)
+        print(f'No items scraped — skipping {STORAGE_BACKEND} write', flush=True)
         sys.exit(1)
 
     # Attach product_id to each item
     for item in items:
         item['product_id'] = _product_id(item)
 
-    saved = save_price_history(items)
-    print(f'Pushed {saved} snapshots to Supabase', flush=True)
+    manifest = publish_shards(items, STATIC_DATA_DIR)
+    print(f'Published {len(manifest["shards"])} static shards to {STATIC_DATA_DIR}', flush=True)
+
+    # Items from unchanged pages still go to storage: the page store is updated before the
+    # write, so a failed write must not hide them - the price index skips what is stored
+    unchanged_items = sum(1 for item in items if item['url'] in scraper.unchanged_urls)
+    if unchanged_items:
+        unchanged_pages = len(scraper.page_store.unchanged) if scraper.page_store is not None else 0
+        print(f'{unchanged_pages} unchanged pages ({unchanged_items} items)', flush=True)
+
+    index = PriceIndex(PRICE_INDEX_PATH, target=STORAGE_TARGET)
+    if not index.load():
+        index.rebuild(get_recent_snapshots(index.heartbeat))
+        print(f'Price index rebuilt from {STORAGE_BACKEND} ({len(index)} products)', flush=True)
+
+    summary = save_price_history(items, index)
+    index.save()
+    print(f'Pushed {summary["written"]} snapshots to {STORAGE_BACKEND} '
+          f'({summary["skipped_unchanged"]} unchanged skipped)', flush=True)
+
+    summary['unchanged_page_items'] = unchanged_items
+    scraper.metrics.extra['storage'] = summary
+    write_run_report(scraper)
 
     # Save a local JSON backup too
     backup_path = os.path.join(root, 'last_scrape.json')
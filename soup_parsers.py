@@ -0,0 +1,344 @@
+"""
+BeautifulSoup implementations of the store parsers.
+Kept as the reference for the compiled lxml spec engine (extract_specs.py) and
+selectable with AsyncDiscountScraper(parser_engine='soup').
+"""
+from bs4 import BeautifulSoup
+from typing import List
+import logging
+import re
+
+from deal import Deal, parse_cents
+from stores import get_adapter
+
+logger = logging.getLogger(__name__)
+
+
+class SoupParsersMixin:
+    """parse_*_category_soup methods; relies on the store adapters' base URLs and the scraper's _make_item"""
+
+    def parse_iconic_category_soup(self, html: str, category_name: str, gender: str = 'Men') -> List[Deal]:
+        """Parse Iconic HTML for a single category"""
+        items = []
+        if not html:
+            return items
+
+        soup = BeautifulSoup(html, 'lxml')
+
+        # Find all brand spans - each one represents a product
+        brand_spans = soup.find_all('span', class_='brand')
+
+        for brand_elem in brand_spans:
+            try:
+                brand_name = brand_elem.get_text(strip=True)
+                if not brand_name:
+                    continue
+
+                # Navigate up to find the product card container (the anchor tag parent)
+                product_link = brand_elem.find_parent('a')
+                if not product_link:
+                    continue
+
+                # Get the URL directly from the anchor
+                url = product_link.get('href', '')
+                if not url or url == '#':
+                    continue
+                if not url.startswith('http'):
+                    url = f"{get_adapter('iconic').base_url}{url}"
+
+                # Find name within the same anchor
+                name_elem = product_link.find('span', class_='name')
+                if not name_elem:
+                    continue
+                product_name = name_elem.get_text(strip=True)
+
+                # Find prices - need to look for exact class matches
+                # The prices should be within the same product link or its parent
+                product_container = product_link.parent
+
+                # Find original price (class contains both 'price' and 'original')
+                original_cents = None
+                original_price_elem = product_container.find('span', class_=lambda x: x and 'price' in x and 'original' in x)
+                if original_price_elem:
+                    original_cents = parse_cents(original_price_elem.get_text(strip=True))
+
+                # Find current/final price (class contains both 'price' and 'final')
+                current_price_elem = product_container.find('span', class_=lambda x: x and 'price' in x and 'final' in x)
+                if not current_price_elem:
+                    continue
+                current_cents = parse_cents(current_price_elem.get_text(strip=True))
+
+                if current_cents is None:
+                    continue
+
+                items.append(self._make_item('The Iconic', brand_name, product_name, current_cents, original_cents,
+                                             category_name, gender, url))
+            except Exception as e:
+                logger.warning(f"Error parsing Iconic product: {e}")
+                continue
+
+        return items
+
+    def parse_asos_category_soup(self, html: str, category_name: str, gender: str = 'Men') -> List[Deal]:
+        """Parse ASOS HTML for a single category"""
+        items = []
+        if not html:
+            return items
+
+        soup = BeautifulSoup(html, 'lxml')
+
+        # ASOS uses article elements for products
+        products = soup.find_all('article', {'data-auto-id': 'productTile'})
+        if not products:
+            # Fallback to other selectors
+            products = soup.find_all('div', class_=lambda x: x and 'productTile' in str(x))
+
+        for product in products:
+            try:
+                # Find product link
+                link = product.find('a', href=True)
+                if not link:
+                    continue
+
+                url = link.get('href', '')
+                if not url.startswith('http'):
+                    url = f"{get_adapter('asos').base_url}{url}"
+
+                # Find brand and name
+                # ASOS structure: brand is in h2, name is in a p or div
+                brand_elem = product.find('h2') or product.find('span', class_=lambda x: x and 'brand' in str(x).lower())
+                name_elem = product.find('p') or product.find('div', class_=lambda x: x and 'title' in str(x).lower())
+
+                brand_name = brand_elem.get_text(strip=True) if brand_elem else 'ASOS'
+                product_name = name_elem.get_text(strip=True) if name_elem else ''
+
+                if not product_name:
+                    # Try to get from link title
+                    product_name = link.get('title', '') or link.get_text(strip=True)
+
+                # Find prices - ASOS uses various price containers
+                price_container = product.find('div', class_=lambda x: x and 'price' in str(x).lower())
+                if not price_container:
+                    price_container = product
+
+                # Look for sale price and original price
+                sale_price_elem = price_container.find('span', class_=lambda x: x and ('sale' in str(x).lower() or 'current' in str(x).lower()))
+                original_price_elem = price_container.find('span', class_=lambda x: x and ('rrp' in str(x).lower() or 'previous' in str(x).lower()))
+
+                if not sale_price_elem:
+                    # Try to find any price
+                    all_prices = price_container.find_all('span', string=re.compile(r'\$[\d,]+\.?\d*'))
+                    if len(all_prices) >= 2:
+                        sale_price_elem = all_prices[0]
+                        original_price_elem = all_prices[1]
+                    elif len(all_prices) == 1:
+                        sale_price_elem = all_prices[0]
+
+                if not sale_price_elem:
+                    continue
+
+                current_cents = parse_cents(sale_price_elem.get_text(strip=True))
+                original_cents = parse_cents(original_price_elem.get_text(strip=True)) if original_price_elem else None
+
+                if current_cents is None:
+                    continue
+
+                items.append(self._make_item('ASOS', brand_name, product_name, current_cents, original_cents,
+                                             category_name, gender, url))
+            except Exception as e:
+                logger.warning(f"Error parsing ASOS product: {e}")
+                continue
+
+        return items
+
+    def parse_myer_category_soup(self, html: str, category_name: str, gender: str = 'Men') -> List[Deal]:
+        """Parse Myer HTML for a single category"""
+        items = []
+        if not html:
+            return items
+
+        soup = BeautifulSoup(html, 'lxml')
+
+        # Myer uses product tiles
+        products = soup.find_all('div', class_=lambda x: x and 'product' in str(x).lower() and 'tile' in str(x).lower())
+        if not products:
+            products = soup.find_all('article', class_=lambda x: x and 'product' in str(x).lower())
+
+        for product in products:
+            try:
+                # Find product link
+                link = product.find('a', href=True)
+                if not link:
+                    continue
+
+                url = link.get('href', '')
+                if not url.startswith('http'):
+                    url = f"{get_adapter('myer').base_url}{url}"
+
+                # Find brand and name
+                brand_elem = product.find(class_=lambda x: x and 'brand' in str(x).lower())
+                name_elem = product.find(class_=lambda x: x and ('name' in str(x).lower() or 'title' in str(x).lower()))
+
+                brand_name = brand_elem.get_text(strip=True) if brand_elem else 'Unknown'
+                product_name = name_elem.get_text(strip=True) if name_elem else link.get_text(strip=True)
+
+                # Find prices
+                sale_price_elem = product.find(class_=lambda x: x and ('sale' in str(x).lower() or 'now' in str(x).lower()))
+                original_price_elem = product.find(class_=lambda x: x and ('was' in str(x).lower() or 'rrp' in str(x).lower()))
+
+                if not sale_price_elem:
+                    # Look for any price element
+                    price_elem = product.find(class_=lambda x: x and 'price' in str(x).lower())
+                    if price_elem:
+                        sale_price_elem = price_elem
+
+                if not sale_price_elem:
+                    continue
+
+                current_cents = parse_cents(sale_price_elem.get_text(strip=True))
+                original_cents = parse_cents(original_price_elem.get_text(strip=True)) if original_price_elem else None
+
+                if current_cents is None:
+                    continue
+
+                items.append(self._make_item('Myer', brand_name, product_name, current_cents, original_cents,
+                                             category_name, gender, url))
+            except Exception as e:
+                logger.warning(f"Error parsing Myer product: {e}")
+                continue
+
+        return items
+
+    def parse_jbhifi_category_soup(self, html: str, category_name: str, gender: str = 'Unisex') -> List[Deal]:
+        """Parse JB Hi-Fi HTML for a single category"""
+        items = []
+        if not html:
+            return items
+
+        soup = BeautifulSoup(html, 'lxml')
+
+        # JB Hi-Fi uses product tiles/cards
+        products = soup.find_all('div', class_=lambda x: x and 'product' in str(x).lower())
+        if not products:
+            products = soup.find_all('article', class_=lambda x: x and 'product' in str(x).lower())
+
+        for product in products[:50]:
+            try:
+                # Find product link
+                link = product.find('a', href=True)
+                if not link:
+                    continue
+
+                url = link.get('href', '')
+                if not url.startswith('http'):
+                    url = f"{get_adapter('jbhifi').base_url}{url}"
+
+                # Find product name/title
+                name_elem = product.find('span', class_=lambda x: x and 'title' in str(x).lower())
+                if not name_elem:
+                    name_elem = product.find('h2') or product.find('h3') or product.find(class_=lambda x: x and 'name' in str(x).lower())
+
+                product_name = name_elem.get_text(strip=True) if name_elem else link.get('title', '') or link.get_text(strip=True)
+
+                if not product_name or len(product_name) < 3:
+                    continue
+
+                # Extract brand from product name (usually first word or known brands)
+                brand_name = self._extract_jbhifi_brand(product_name)
+
+                # Find prices - JB uses sale-price and was-price classes
+                sale_price_elem = product.find(class_=lambda x: x and ('sale' in str(x).lower() or 'current' in str(x).lower() or 'now' in str(x).lower()))
+                original_price_elem = product.find(class_=lambda x: x and ('was' in str(x).lower() or 'original' in str(x).lower() or 'rrp' in str(x).lower()))
+
+                if not sale_price_elem:
+                    # Try to find any price element
+                    price_elem = product.find(class_=lambda x: x and 'price' in str(x).lower())
+                    if price_elem:
+                        sale_price_elem = price_elem
+
+                if not sale_price_elem:
+                    continue
+
+                current_cents = parse_cents(sale_price_elem.get_text(strip=True))
+                original_cents = parse_cents(original_price_elem.get_text(strip=True)) if original_price_elem else None
+
+                if current_cents is None:
+                    continue
+
+                deal = self._make_item('JB Hi-Fi', brand_name, product_name, current_cents, original_cents,
+                                       category_name, gender, url)
+
+                # Only include items with actual discounts
+                if deal.discount_percent <= 0:
+                    continue
+
+                items.append(deal)
+            except Exception as e:
+                logger.warning(f"Error parsing JB Hi-Fi product: {e}")
+                continue
+
+        return items
+
+    def parse_davidjones_category_soup(self, html: str, category_name: str, gender: str = 'Men') -> List[Deal]:
+        """Parse David Jones HTML for a single category"""
+        items = []
+        if not html:
+            return items
+
+        soup = BeautifulSoup(html, 'lxml')
+
+        # DJ uses CSS modules with hashed class names — BS4 passes one class string at a time to callable
+        def has_class_suffix(suffix):
+            return lambda x: x and x.endswith(suffix)
+
+        products = soup.find_all('article')
+
+        for product in products[:60]:
+            try:
+                link = product.find('a', href=True)
+                if not link:
+                    continue
+
+                url = link.get('href', '')
+                if not url or not url.startswith('/product/'):
+                    continue
+                url = f"{get_adapter('davidjones').base_url}{url}"
+
+                # Brand: <p> with class ending in '__brand'
+                brand_elem = product.find('p', class_=has_class_suffix('__brand'))
+                brand_name = brand_elem.get_text(strip=True) if brand_elem else 'Unknown'
+
+                # Name: <h2> with class ending in '__name'
+                name_elem = product.find('h2', class_=has_class_suffix('__name'))
+                product_name = name_elem.get_text(strip=True) if name_elem else ''
+                if not product_name:
+                    continue
+
+                # Discount label: e.g. "SAVE 20%" in SpecialOfferDescription span
+                offer_elem = product.find('span', class_=has_class_suffix('__ctaInfo'))
+                if not offer_elem:
+                    continue
+                offer_text = offer_elem.get_text(strip=True)
+                discount_match = re.search(r'(\d+)%', offer_text)
+                if not discount_match:
+                    continue
+                discount_percent = int(discount_match.group(1))
+
+                # Price: visible span with '__price' suffix (aria-hidden to avoid screen-reader duplicate)
+                price_elem = product.find('span', attrs={'aria-hidden': 'true'}, class_=has_class_suffix('__price'))
+                if not price_elem:
+                    continue
+                current_cents = parse_cents(price_elem.get_text(strip=True))
+                if current_cents is None:
+                    continue
+
+                # Derive original price from discount
+                original_cents = round(current_cents / (1 - discount_percent / 100)) if discount_percent < 100 else None
+
+                items.append(self._make_item('David Jones', brand_name, product_name, current_cents, original_cents,
+                                             category_name, gender, url, discount_percent=discount_percent))
+            except Exception as e:
+                logger.warning(f"Error parsing David Jones product: {e}")
+                continue
+
+        return items
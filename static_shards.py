@@ -0,0 +1,123 @@
+"""
+Precomputed, gzip-compressed JSON snapshots of a scrape for static hosting.
+run_scraper publishes one shard with every item, one per store and one per
+category group into docs/data/, plus manifest.json naming each shard's file.
+Shard file names carry their content hash, so the CDN can cache them forever;
+only the small manifest has to be revalidated. Shards have the same shape as
+an /api/scrape response, so the frontend reads either without a Python
+function or a database round trip.
+"""
+import gzip
+import hashlib
+import json
+import logging
+import os
+import sys
+from datetime import datetime
+from typing import Dict, List
+
+from categories import CATEGORY_GROUPS, groups_for_category
+
+# Store keys and names come from the API's catalog, so listing them does not import every store adapter
+_API_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'api')
+if _API_DIR not in sys.path:
+    sys.path.insert(0, _API_DIR)
+
+from catalog import STORE_SOURCES  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_NAME = 'manifest.json'
+# Characters of the sha256 kept in shard file names
+HASH_LENGTH = 16
+
+
+def _shard_bytes(items: List[Dict]) -> bytes:
+    # No run timestamp (that is in the manifest): a shard whose items did not change keeps its hash
+    body = {
+        'success': True,
+        'items': items,
+        'total': len(items),
+        'cached': False,
+        'source': 'static',
+    }
+    return json.dumps(body, separators=(',', ':'), default=str).encode('utf-8')
+
+
+def shard_items(items: List[Dict]) -> Dict[str, List[Dict]]:
+    """Shard name ('all', 'store-<key>', 'category-<group>') -> its items, in scrape order"""
+    store_for_source = {source: key for key, source in STORE_SOURCES.items()}
+    shards: Dict[str, List[Dict]] = {'all': list(items)}
+    for key in STORE_SOURCES:
+        shards[f'store-{key}'] = []
+    for group in CATEGORY_GROUPS:
+        shards[f'category-{group}'] = []
+
+    groups_cache: Dict[str, frozenset] = {}
+    for item in items:
+        store = store_for_source.get(item.get('source'))
+        if store is not None:
+            shards[f'store-{store}'].append(item)
+        category = item.get('category') or ''
+        groups = groups_cache.get(category)
+        if groups is None:
+            groups = groups_cache[category] = groups_for_category(category)
+        for group in groups:
+            shards[f'category-{group}'].append(item)
+    return shards
+
+
+def _read_manifest(out_dir: str) -> Dict:
+    try:
+        with open(os.path.join(out_dir, MANIFEST_NAME), encoding='utf-8') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def publish_shards(items: List[Dict], out_dir: str, timestamp: str = None) -> Dict:
+    """Write the shards and manifest into out_dir; returns the manifest.
+
+    Unchanged shards keep their file (same content, same hash). Files that
+    neither this manifest nor the previous one reference are removed, so a
+    client holding the old manifest can still load its shards.
+    """
+    timestamp = timestamp or datetime.now().isoformat()
+    os.makedirs(out_dir, exist_ok=True)
+    previous = _read_manifest(out_dir)
+
+    shards = {}
+    written = 0
+    for name, shard in shard_items(items).items():
+        raw = _shard_bytes(shard)
+        digest = hashlib.sha256(raw).hexdigest()
+        filename = f"{name}.{digest[:HASH_LENGTH]}.json.gz"
+        path = os.path.join(out_dir, filename)
+        if not os.path.exists(path):
+            # mtime=0 keeps the gzip bytes a pure function of the content
+            with open(path + '.tmp', 'wb') as f:
+                f.write(gzip.compress(raw, compresslevel=9, mtime=0))
+            os.replace(path + '.tmp', path)
+            written += 1
+        shards[name] = {
+            'file': filename,
+            'sha256': digest,
+            'items': len(shard),
+            'bytes': len(raw),
+            'gzip_bytes': os.path.getsize(path),
+        }
+
+    manifest = {'version': 1, 'timestamp': timestamp, 'total': len(items), 'shards': shards}
+    tmp = os.path.join(out_dir, MANIFEST_NAME + '.tmp')
+    with open(tmp, 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=1)
+    os.replace(tmp, os.path.join(out_dir, MANIFEST_NAME))
+
+    keep = {entry['file'] for entry in shards.values()}
+    keep.update(entry.get('file') for entry in previous.get('shards', {}).values())
+    for filename in os.listdir(out_dir):
+        if filename.endswith('.json.gz') and filename not in keep:
+            os.remove(os.path.join(out_dir, filename))
+
+    logger.info(f"Published {len(shards)} shards to {out_dir} ({written} new)")
+    return manifest
@@ -0,0 +1,34 @@
+"""
+Store registry. Each store is a self-contained adapter module (stores/<key>.py
+exposing ADAPTER); modules are imported on first use, so a run for one store
+never imports or configures the others.
+"""
+import importlib
+from typing import Dict, List
+
+from stores.base import StoreAdapter
+
+# Registry key -> adapter module
+STORE_MODULES = {
+    'iconic': 'stores.iconic',
+    'asos': 'stores.asos',
+    'myer': 'stores.myer',
+    'jbhifi': 'stores.jbhifi',
+    'davidjones': 'stores.davidjones',
+}
+
+_adapters: Dict[str, StoreAdapter] = {}
+
+
+def get_adapter(key: str) -> StoreAdapter:
+    """The adapter for a store key, importing its module on first use"""
+    adapter = _adapters.get(key)
+    if adapter is None:
+        if key not in STORE_MODULES:
+            raise KeyError(f"Unknown store {key!r}; known stores: {list(STORE_MODULES)}")
+        adapter = _adapters[key] = importlib.import_module(STORE_MODULES[key]).ADAPTER
+    return adapter
+
+
+def store_keys() -> List[str]:
+    return list(STORE_MODULES)
@@ -0,0 +1,116 @@
+"""
+ASOS (AU site, men's sale).
+"""
+import logging
+import re
+from typing import List
+
+from deal import Deal, parse_cents
+from extract_specs import (Field, StoreSpec, any_of, class_contains, class_icontains,
+                           spans_with_string, text)
+from stores.base import StoreAdapter
+
+logger = logging.getLogger(__name__)
+
+SOURCE = 'ASOS'
+BASE_URL = "https://www.asos.com"
+# Price pattern used by the "any $ span" fallback
+PRICE_RE = re.compile(r'\$[\d,]+\.?\d*')
+
+CATEGORIES = {
+    'T-Shirts': 'au/men/sale/t-shirts-vests/cat/?cid=5990',
+    'Shirts': 'au/men/sale/shirts/cat/?cid=5988',
+    'Hoodies & Sweatshirts': 'au/men/sale/hoodies-sweatshirts/cat/?cid=5979',
+    'Jackets & Coats': 'au/men/sale/jackets-coats/cat/?cid=3606',
+    'Jeans': 'au/men/sale/jeans/cat/?cid=4208',
+    'Trousers & Chinos': 'au/men/sale/trousers-chinos/cat/?cid=4910',
+    'Shorts': 'au/men/sale/shorts/cat/?cid=7078',
+    'Knitwear': 'au/men/sale/jumpers-cardigans/cat/?cid=7617',
+    'Shoes': 'au/men/sale/shoes/cat/?cid=6930',
+    'Trainers': 'au/men/sale/shoes/trainers/cat/?cid=5775',
+}
+
+SPEC = StoreSpec(
+    products=[
+        "//article[@data-auto-id='productTile']",
+        f"//div[{class_contains('productTile')}]",
+    ],
+    fields={
+        'link': Field("(.//a[@href])[1]"),
+        'brand': Field("(.//h2)[1]", f"(.//span[{class_icontains('brand')}])[1]"),
+        'name': Field("(.//p)[1]", f"(.//div[{class_icontains('title')}])[1]"),
+        'price_container': Field(f"(.//div[{class_icontains('price')}])[1]", "self::*"),
+        'current_price': Field(
+            f"(.//span[{any_of(class_icontains('sale'), class_icontains('current'))}])[1]",
+            within='price_container'),
+        'original_price': Field(
+            f"(.//span[{any_of(class_icontains('rrp'), class_icontains('previous'))}])[1]",
+            within='price_container'),
+    },
+)
+
+
+def parse(scraper, html: str, category_name: str, gender: str = 'Men') -> List[Deal]:
+    """Parse one category page; `scraper` supplies _parse_embedded/_make_item"""
+    # Fast path: product grid shipped as embedded JSON (falls back to the DOM)
+    items = scraper._parse_embedded(html, SOURCE, BASE_URL, category_name, gender, default_brand=SOURCE)
+    if items:
+        return items
+
+    for _, fields in SPEC.extracted(html):
+        try:
+            link = fields['link']
+            if link is None:
+                continue
+
+            url = link.get('href', '')
+            if not url.startswith('http'):
+                url = f"{BASE_URL}{url}"
+
+            brand_name = text(fields['brand']) if fields['brand'] is not None else SOURCE
+            product_name = text(fields['name']) if fields['name'] is not None else ''
+
+            if not product_name:
+                # Try to get from link title
+                product_name = link.get('title', '') or text(link)
+
+            sale_price_elem = fields['current_price']
+            original_price_elem = fields['original_price']
+
+            if sale_price_elem is None:
+                # Try to find any price
+                all_prices = spans_with_string(fields['price_container'], PRICE_RE)
+                if len(all_prices) >= 2:
+                    sale_price_elem = all_prices[0]
+                    original_price_elem = all_prices[1]
+                elif len(all_prices) == 1:
+                    sale_price_elem = all_prices[0]
+
+            if sale_price_elem is None:
+                continue
+
+            current_cents = parse_cents(text(sale_price_elem))
+            original_cents = parse_cents(text(original_price_elem)) if original_price_elem is not None else None
+
+            if current_cents is None:
+                continue
+
+            items.append(scraper._make_item(SOURCE, brand_name, product_name, current_cents, original_cents,
+                                            category_name, gender, url))
+        except Exception as e:
+            logger.warning(f"Error parsing ASOS product: {e}")
+            continue
+
+    return items
+
+
+ADAPTER = StoreAdapter(
+    key='asos',
+    source=SOURCE,
+    base_url=BASE_URL,
+    categories=CATEGORIES,
+    parse=parse,
+    spec=SPEC,
+    page_param=('page', 1),
+    max_pages=5,
+)
@@ -0,0 +1,70 @@
+"""
+StoreAdapter: everything the scraper needs to know about one store.
+"""
+from typing import Callable, Dict, FrozenSet, List, Tuple
+from urllib.parse import urlsplit
+
+from categories import groups_for_category
+from extract_specs import StoreSpec
+
+FETCH_MODES = ('http', 'browser')
+
+
+class StoreAdapter:
+    """One store: base URL, category catalogue, fetch mode, parser, request budget and pagination.
+
+    Args:
+        key: Registry key ('iconic', 'jbhifi', ...).
+        source: Display name stamped on items ('The Iconic').
+        base_url: Site root; category paths and relative product links are joined to it.
+        categories: Category key -> path below base_url.
+        parse: parse(scraper, html, category_name, gender) -> List[Deal].
+        spec: The parser's extraction spec; lets aiohttp pages be parsed while they stream in.
+        gender: Gender recorded for the store's items.
+        fetch_mode: 'http' (aiohttp) or 'browser' (Playwright-rendered).
+        url_suffix: Appended to every category URL (e.g. a sort parameter).
+        concurrency: HostLimiter keyword args for the store's host (None = controller defaults).
+        timeout: Seconds allowed for one page fetch/render.
+        page_param: (query parameter, index of the first page) for paged listings.
+        max_pages: Upper bound on pages fetched per category.
+        wait_selector: Browser mode only - element that signals the grid has rendered.
+    """
+
+    def __init__(self, key: str, source: str, base_url: str, categories: Dict[str, str],
+                 parse: Callable, spec: StoreSpec = None, gender: str = 'Men', fetch_mode: str = 'http',
+                 url_suffix: str = '', concurrency: Dict = None, timeout: float = 15.0,
+                 page_param: Tuple[str, int] = ('page', 1), max_pages: int = 5, wait_selector: str = None):
+        if fetch_mode not in FETCH_MODES:
+            raise ValueError(f"fetch_mode must be one of {FETCH_MODES}, got {fetch_mode!r}")
+        self.key = key
+        self.source = source
+        self.base_url = base_url
+        self.host = urlsplit(base_url).hostname
+        self.categories = categories
+        self.parse = parse
+        self.spec = spec
+        self.gender = gender
+        self.fetch_mode = fetch_mode
+        self.url_suffix = url_suffix
+        self.concurrency = concurrency
+        self.timeout = timeout
+        self.page_param = page_param
+        self.max_pages = max_pages
+        self.wait_selector = wait_selector
+        # Category key -> groups it belongs to, computed once per adapter
+        self.category_groups: Dict[str, FrozenSet[str]] = {
+            name: groups_for_category(name) for name in categories}
+
+    @property
+    def referer(self) -> str:
+        """Referer sent with aiohttp requests (browser-rendered stores navigate directly)"""
+        return self.base_url if self.fetch_mode == 'http' else None
+
+    def category_url(self, path: str) -> str:
+        return f"{self.base_url}/{path}{self.url_suffix}"
+
+    def category_urls(self, category_groups: List[str] = None) -> List[Tuple[str, str]]:
+        """(category key, page-1 URL) for the categories in any of the groups (all when None/empty)"""
+        wanted = frozenset(category_groups or ())
+        return [(name, self.category_url(path)) for name, path in self.categories.items()
+                if not wanted or self.category_groups[name] & wanted]
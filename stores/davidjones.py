@@ -0,0 +1,108 @@
+"""
+David Jones (men's sale). The grid is JS-rendered, so pages are fetched with
+Playwright; further pages are discovered at runtime.
+"""
+import logging
+import re
+from typing import List
+
+from deal import Deal, parse_cents
+from extract_specs import Field, StoreSpec, class_suffix, text
+from stores.base import StoreAdapter
+
+logger = logging.getLogger(__name__)
+
+SOURCE = 'David Jones'
+BASE_URL = "https://www.davidjones.com"
+
+CATEGORIES = {
+    'Clothing': 'sale/men/clothing',
+    'Shoes': 'sale/men/shoes',
+    'Accessories': 'sale/men/accessories',
+    'Bags': 'sale/men/bags',
+    'Suits': 'sale/men/suits',
+    'Underwear': 'sale/men/underwear',
+    # Clearance - often best deals
+    'Clearance': 'sale/men/clearance',
+}
+
+SPEC = StoreSpec(
+    # CSS modules with hashed class names - match on the class suffix
+    products=["//article"],
+    limit=60,
+    fields={
+        'link': Field("(.//a[@href])[1]"),
+        'brand': Field(f"(.//p[{class_suffix('__brand')}])[1]"),
+        'name': Field(f"(.//h2[{class_suffix('__name')}])[1]"),
+        'offer': Field(f"(.//span[{class_suffix('__ctaInfo')}])[1]"),
+        'current_price': Field(f"(.//span[@aria-hidden='true' and {class_suffix('__price')}])[1]"),
+    },
+)
+
+
+def parse(scraper, html: str, category_name: str, gender: str = 'Men') -> List[Deal]:
+    """Parse one category page; `scraper` supplies _parse_embedded/_make_item"""
+    # Fast path: product grid shipped as embedded JSON (falls back to the DOM)
+    items = scraper._parse_embedded(html, SOURCE, BASE_URL, category_name, gender)
+    if items:
+        return items
+
+    for _, fields in SPEC.extracted(html):
+        try:
+            link = fields['link']
+            if link is None:
+                continue
+
+            url = link.get('href', '')
+            if not url or not url.startswith('/product/'):
+                continue
+            url = f"{BASE_URL}{url}"
+
+            brand_name = text(fields['brand']) if fields['brand'] is not None else 'Unknown'
+
+            product_name = text(fields['name'])
+            if not product_name:
+                continue
+
+            # Discount label: e.g. "SAVE 20%" in SpecialOfferDescription span
+            if fields['offer'] is None:
+                continue
+            discount_match = re.search(r'(\d+)%', text(fields['offer']))
+            if not discount_match:
+                continue
+            discount_percent = int(discount_match.group(1))
+
+            # Price: visible span (aria-hidden to avoid screen-reader duplicate)
+            if fields['current_price'] is None:
+                continue
+            current_cents = parse_cents(text(fields['current_price']))
+            if current_cents is None:
+                continue
+
+            # Derive original price from discount
+            original_cents = round(current_cents / (1 - discount_percent / 100)) if discount_percent < 100 else None
+
+            items.append(scraper._make_item(SOURCE, brand_name, product_name, current_cents, original_cents,
+                                            category_name, gender, url, discount_percent=discount_percent))
+        except Exception as e:
+            logger.warning(f"Error parsing David Jones product: {e}")
+            continue
+
+    return items
+
+
+ADAPTER = StoreAdapter(
+    key='davidjones',
+    source=SOURCE,
+    base_url=BASE_URL,
+    categories=CATEGORIES,
+    parse=parse,
+    spec=SPEC,
+    fetch_mode='browser',
+    # Chromium pages are expensive: never more than a few renders at once
+    concurrency={'initial': 3, 'max_limit': 3},
+    timeout=30.0,
+    wait_selector='article',
+    page_param=('page', 1),
+    max_pages=12,
+)
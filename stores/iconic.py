@@ -0,0 +1,113 @@
+"""
+The Iconic (men's sale).
+"""
+import logging
+from typing import List
+
+from deal import Deal, parse_cents
+from extract_specs import Field, StoreSpec, class_contains, class_token, text
+from stores.base import StoreAdapter
+
+logger = logging.getLogger(__name__)
+
+SOURCE = 'The Iconic'
+BASE_URL = "https://www.theiconic.com.au"
+
+CATEGORIES = {
+    # Clothing
+    'Shirts & Polos': 'mens-clothing-shirts-polos-sale/',
+    'T-Shirts & Singlets': 'mens-clothing-t-shirts-singlets-sale/',
+    'Coats & Jackets': 'mens-clothing-coats-jackets-sale/',
+    'Pants': 'mens-clothing-pants-sale/',
+    'Sweats & Hoodies': 'mens-clothing-sweats-hoodies-sale/',
+    'Jumpers & Cardigans': 'mens-clothing-jumpers-cardigans-sale/',
+    'Jeans': 'mens-clothing-jeans-sale/',
+    'Shorts': 'mens-clothing-shorts-sale/',
+    'Suits & Blazers': 'mens-clothing-suits-blazers-sale/',
+    'Swimwear': 'mens-clothing-swimwear-sale/',
+    'Loungewear': 'mens-clothing-loungewear-sale/',
+    'Underwear': 'mens-clothing-underwear-sale/',
+    'Socks': 'mens-clothing-socks-sale/',
+    'Sleepwear': 'mens-clothing-sleepwear-sale/',
+    'Base Layers': 'mens-clothing-base-layers-sale/',
+    'Underwear & Socks': 'mens-clothing-underwear-socks-sale/',
+    'Socks & Stockings': 'mens-clothing-socks-stockings-sale/',
+    # Shoes
+    'Sneakers': 'mens-shoes-sneakers-sale/',
+    'Boots': 'mens-shoes-boots-sale/',
+    'Casual Shoes': 'mens-shoes-casual-shoes-sale/',
+    'Dress Shoes': 'mens-shoes-dress-shoes-sale/',
+    'Sandals & Thongs': 'mens-shoes-sandals-thongs-sale/',
+    'Slip Ons & Loafers': 'mens-shoes-slip-ons-loafers-sale/',
+}
+
+SPEC = StoreSpec(
+    # Each brand span is one product; fields hang off its nearest <a>
+    products=[f"//span[{class_token('brand')}]"],
+    fields={
+        'link': Field("ancestor::a[1]"),
+        'name': Field(f"(ancestor::a[1]//span[{class_token('name')}])[1]"),
+        'original_price': Field(f"(ancestor::a[1]/..//span[{class_contains('price', 'original')}])[1]"),
+        'current_price': Field(f"(ancestor::a[1]/..//span[{class_contains('price', 'final')}])[1]"),
+    },
+)
+
+
+def parse(scraper, html: str, category_name: str, gender: str = 'Men') -> List[Deal]:
+    """Parse one category page; `scraper` supplies _parse_embedded/_make_item"""
+    # Fast path: product grid shipped as embedded JSON (falls back to the DOM)
+    items = scraper._parse_embedded(html, SOURCE, BASE_URL, category_name, gender)
+    if items:
+        return items
+
+    # Each brand span represents a product
+    for brand_elem, fields in SPEC.extracted(html):
+        try:
+            brand_name = text(brand_elem)
+            if not brand_name:
+                continue
+
+            # The product card is the anchor around the brand span
+            product_link = fields['link']
+            if product_link is None:
+                continue
+            url = product_link.get('href', '')
+            if not url or url == '#':
+                continue
+            if not url.startswith('http'):
+                url = f"{BASE_URL}{url}"
+
+            if fields['name'] is None:
+                continue
+            product_name = text(fields['name'])
+
+            original_cents = None
+            if fields['original_price'] is not None:
+                original_cents = parse_cents(text(fields['original_price']))
+
+            if fields['current_price'] is None:
+                continue
+            current_cents = parse_cents(text(fields['current_price']))
+
+            if current_cents is None:
+                continue
+
+            items.append(scraper._make_item(SOURCE, brand_name, product_name, current_cents, original_cents,
+                                            category_name, gender, url))
+        except Exception as e:
+            logger.warning(f"Error parsing Iconic product: {e}")
+            continue
+
+    return items
+
+
+ADAPTER = StoreAdapter(
+    key='iconic',
+    source=SOURCE,
+    base_url=BASE_URL,
+    categories=CATEGORIES,
+    parse=parse,
+    spec=SPEC,
+    page_param=('page', 1),
+    max_pages=5,
+)
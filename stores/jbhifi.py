@@ -0,0 +1,113 @@
+"""
+JB Hi-Fi (electronics/tech deals). Listings are on-sale filtered, zero-indexed pages.
+"""
+import logging
+from typing import List
+
+from deal import Deal, parse_cents
+from extract_specs import Field, StoreSpec, any_of, class_icontains, text
+from stores.base import StoreAdapter
+
+logger = logging.getLogger(__name__)
+
+SOURCE = 'JB Hi-Fi'
+BASE_URL = "https://www.jbhifi.com.au"
+
+CATEGORIES = {
+    'Laptops': 'collections/computers-tablets-laptops?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
+    'Headphones': 'collections/headphones?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
+    'Speakers': 'collections/speakers?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
+    'TVs': 'collections/tvs?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
+    'Phones': 'collections/mobile-phones?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
+    'Gaming': 'collections/gaming?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
+    'Cameras': 'collections/cameras?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
+    'Smart Home': 'collections/smart-home?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
+    'Wearables': 'collections/wearable-technology?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
+    'Audio': 'collections/hi-fi-turntables?q=&hPP=60&idx=shopify_products_price_asc&p=0&fR[named_tags.on_sale][0]=true',
+}
+
+SPEC = StoreSpec(
+    products=[
+        f"//div[{class_icontains('product')}]",
+        f"//article[{class_icontains('product')}]",
+    ],
+    limit=50,
+    fields={
+        'link': Field("(.//a[@href])[1]"),
+        'name': Field(
+            f"(.//span[{class_icontains('title')}])[1]",
+            "(.//h2)[1]",
+            "(.//h3)[1]",
+            f"(.//*[{class_icontains('name')}])[1]"),
+        'current_price': Field(
+            f"(.//*[{any_of(class_icontains('sale'), class_icontains('current'), class_icontains('now'))}])[1]",
+            f"(.//*[{class_icontains('price')}])[1]"),
+        'original_price': Field(
+            f"(.//*[{any_of(class_icontains('was'), class_icontains('original'), class_icontains('rrp'))}])[1]"),
+    },
+)
+
+
+def parse(scraper, html: str, category_name: str, gender: str = 'Unisex') -> List[Deal]:
+    """Parse one category page; `scraper` supplies _parse_embedded/_make_item"""
+    # Fast path: product grid shipped as embedded JSON (falls back to the DOM)
+    items = scraper._parse_embedded(html, SOURCE, BASE_URL, category_name, gender,
+                                    require_discount=True)
+    if items:
+        return items
+
+    for _, fields in SPEC.extracted(html):
+        try:
+            link = fields['link']
+            if link is None:
+                continue
+
+            url = link.get('href', '')
+            if not url.startswith('http'):
+                url = f"{BASE_URL}{url}"
+
+            name_elem = fields['name']
+            product_name = text(name_elem) if name_elem is not None else link.get('title', '') or text(link)
+
+            if not product_name or len(product_name) < 3:
+                continue
+
+            # Extract brand from product name (usually first word or known brands)
+            brand_name = scraper._extract_jbhifi_brand(product_name)
+
+            if fields['current_price'] is None:
+                continue
+
+            current_cents = parse_cents(text(fields['current_price']))
+            original_cents = (parse_cents(text(fields['original_price']))
+                              if fields['original_price'] is not None else None)
+
+            if current_cents is None:
+                continue
+
+            deal = scraper._make_item(SOURCE, brand_name, product_name, current_cents, original_cents,
+                                      category_name, gender, url)
+
+            # Only include items with actual discounts
+            if deal.discount_percent <= 0:
+                continue
+
+            items.append(deal)
+        except Exception as e:
+            logger.warning(f"Error parsing JB Hi-Fi product: {e}")
+            continue
+
+    return items
+
+
+ADAPTER = StoreAdapter(
+    key='jbhifi',
+    source=SOURCE,
+    base_url=BASE_URL,
+    categories=CATEGORIES,
+    parse=parse,
+    spec=SPEC,
+    gender='Unisex',
+    page_param=('p', 0),
+    max_pages=3,
+)
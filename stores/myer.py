@@ -0,0 +1,94 @@
+"""
+Myer (men's, sorted with sale items first).
+"""
+import logging
+from typing import List
+
+from deal import Deal, parse_cents
+from extract_specs import Field, StoreSpec, any_of, class_icontains, text
+from stores.base import StoreAdapter
+
+logger = logging.getLogger(__name__)
+
+SOURCE = 'Myer'
+BASE_URL = "https://www.myer.com.au"
+
+CATEGORIES = {
+    'Shirts': 'men/shirts',
+    'T-Shirts': 'men/t-shirts',
+    'Jackets & Coats': 'men/jackets-coats',
+    'Pants': 'men/pants',
+    'Jeans': 'men/jeans',
+    'Knitwear': 'men/knitwear',
+    'Shorts': 'men/shorts',
+    'Suits': 'men/suits',
+    'Shoes': 'men/shoes',
+}
+
+SPEC = StoreSpec(
+    products=[
+        f"//div[{class_icontains('product')} and {class_icontains('tile')}]",
+        f"//article[{class_icontains('product')}]",
+    ],
+    fields={
+        'link': Field("(.//a[@href])[1]"),
+        'brand': Field(f"(.//*[{class_icontains('brand')}])[1]"),
+        'name': Field(f"(.//*[{any_of(class_icontains('name'), class_icontains('title'))}])[1]"),
+        'current_price': Field(
+            f"(.//*[{any_of(class_icontains('sale'), class_icontains('now'))}])[1]",
+            f"(.//*[{class_icontains('price')}])[1]"),
+        'original_price': Field(f"(.//*[{any_of(class_icontains('was'), class_icontains('rrp'))}])[1]"),
+    },
+)
+
+
+def parse(scraper, html: str, category_name: str, gender: str = 'Men') -> List[Deal]:
+    """Parse one category page; `scraper` supplies _parse_embedded/_make_item"""
+    # Fast path: product grid shipped as embedded JSON (falls back to the DOM)
+    items = scraper._parse_embedded(html, SOURCE, BASE_URL, category_name, gender)
+    if items:
+        return items
+
+    for _, fields in SPEC.extracted(html):
+        try:
+            link = fields['link']
+            if link is None:
+                continue
+
+            url = link.get('href', '')
+            if not url.startswith('http'):
+                url = f"{BASE_URL}{url}"
+
+            brand_name = text(fields['brand']) if fields['brand'] is not None else 'Unknown'
+            product_name = text(fields['name']) if fields['name'] is not None else text(link)
+
+            if fields['current_price'] is None:
+                continue
+
+            current_cents = parse_cents(text(fields['current_price']))
+            original_cents = (parse_cents(text(fields['original_price']))
+                              if fields['original_price'] is not None else None)
+
+            if current_cents is None:
+                continue
+
+            items.append(scraper._make_item(SOURCE, brand_name, product_name, current_cents, original_cents,
+                                            category_name, gender, url))
+        except Exception as e:
+            logger.warning(f"Error parsing Myer product: {e}")
+            continue
+
+    return items
+
+
+ADAPTER = StoreAdapter(
+    key='myer',
+    source=SOURCE,
+    base_url=BASE_URL,
+    categories=CATEGORIES,
+    parse=parse,
+    spec=SPEC,
+    url_suffix='?sortBy=OnSale',
+    page_param=('pageNumber', 1),
+    max_pages=5,
+)
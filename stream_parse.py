@@ -0,0 +1,121 @@
+"""
+Incremental parsing of a page while its body is still downloading.
+Response chunks go straight into an lxml pull parser, so the tree is built as
+bytes arrive and no str copy of the page is made. When the header names no
+charset, lxml's own sniffing replaces aiohttp's detection pass over the body.
+Specs whose containers are self-contained (StoreSpec.container_tests) have
+their products extracted as each container's closing tag is parsed; the rest
+run on the finished tree. Embedded JSON scripts are collected on the way for
+the fast path.
+"""
+import logging
+from typing import Dict, List, Tuple, Union
+
+from lxml import etree
+
+from embedded_json import products_from_blobs, script_blobs
+from extract_specs import StoreSpec
+
+logger = logging.getLogger(__name__)
+
+# Bytes read from the response per feed() call
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+class StreamedPage:
+    """A page parsed from body chunks: feed() each chunk, then close()"""
+
+    def __init__(self, spec: StoreSpec, encoding: str = None):
+        self.spec = spec
+        self.encoding = encoding
+        self.root = None
+        self.body = b''
+        self._chunks = []
+        self._tests = spec.container_tests
+        # Only container and script end events are needed
+        if self._tests is None:
+            tags = ['script']
+        elif any(tag == '*' for tag, _ in self._tests):
+            tags = None
+        else:
+            tags = sorted({tag for tag, _ in self._tests} | {'script'})
+        try:
+            self._parser = etree.HTMLPullParser(events=('end',), tag=tags, encoding=encoding)
+        except LookupError:
+            # Unknown charset in the header - let lxml sniff the document instead
+            self.encoding = None
+            self._parser = etree.HTMLPullParser(events=('end',), tag=tags)
+        # Per container alternative: (node, fields) in the order containers closed
+        self._matches = [[] for _ in self._tests or ()]
+        self._json_blobs = []
+        self._state_blobs = []
+
+    def __bool__(self) -> bool:
+        return bool(self.body)
+
+    def feed(self, chunk: bytes):
+        self._chunks.append(chunk)
+        self._parser.feed(chunk)
+        self._drain()
+
+    def close(self):
+        """Finish the tree and release the chunk list (the joined body is kept)"""
+        try:
+            self.root = self._parser.close()
+        except etree.XMLSyntaxError:
+            # Empty or unparseable document
+            self.root = None
+        self._drain()
+        self.body = b''.join(self._chunks)
+        self._chunks = None
+        if self.root is not None and not self.encoding:
+            self.encoding = self.root.getroottree().docinfo.encoding
+        self.encoding = self.encoding or 'utf-8'
+
+    def _drain(self):
+        for _, element in self._parser.read_events():
+            if element.tag == 'script':
+                json_blobs, state_blobs = script_blobs(element.get('type'), element.text)
+                self._json_blobs.extend(json_blobs)
+                self._state_blobs.extend(state_blobs)
+                continue
+            for index, (_, test) in enumerate(self._tests or ()):
+                if test(element):
+                    self._matches[index].append((element, self.spec.extract(element)))
+
+    @property
+    def text(self) -> str:
+        """The decoded page, for consumers that need a str (soup parser, process pool)"""
+        try:
+            return self.body.decode(self.encoding, errors='replace')
+        except LookupError:
+            return self.body.decode('utf-8', errors='replace')
+
+    def embedded_products(self) -> List[Dict]:
+        """embedded_json.extract_products for the scripts seen while streaming"""
+        return products_from_blobs(self._json_blobs + self._state_blobs)
+
+    def extracted(self, spec: StoreSpec) -> List[Tuple]:
+        """(product node, fields) pairs, as StoreSpec.extracted yields them on the finished tree"""
+        if spec is self.spec and self._tests is not None:
+            for matches in self._matches:
+                if not matches:
+                    continue
+                if _nested(matches):
+                    # Closing order is not document order - use the finished tree
+                    break
+                return matches[:spec.limit] if spec.limit else matches
+            else:
+                return []
+        return [(node, spec.extract(node)) for node in spec.products(self.root)]
+
+
+def _nested(matches: List[Tuple]) -> bool:
+    """True when one matched container sits inside another"""
+    nodes = {node for node, _ in matches}
+    return any(ancestor in nodes for node, _ in matches for ancestor in node.iterancestors())
+
+
+def page_markup(page: Union[str, StreamedPage]) -> Union[str, bytes]:
+    """Raw markup of a fetched page (str, or the body bytes of a streamed page)"""
+    return page.body if isinstance(page, StreamedPage) else page
@@ -0,0 +1,40 @@
+-- Latest price per product, for supabase_client.get_latest_items.
+-- Run once in the Supabase SQL editor (safe to re-run); until it has been run,
+-- /api/scrape answers 500 with "latest_items query failed".
+--
+-- One row per product: the product row joined to its newest price_history
+-- snapshot. The lateral lookup walks the (product_id, scraped_at desc) index,
+-- so filters on product columns (source, base_category, gender_key) are
+-- applied before any snapshot is read and PostgREST can page the result with
+-- limit / keyset filters instead of shipping raw history rows.
+
+create index if not exists price_history_product_scraped_idx
+    on price_history (product_id, scraped_at desc);
+
+drop view if exists latest_items;
+create view latest_items as
+select
+    p.id                                                as product_id,
+    p.source,
+    p.brand,
+    p.name,
+    p.url,
+    p.category,
+    -- "Shirts Page 2" -> "Shirts": the key the category groups are defined on
+    regexp_replace(p.category, ' Page [0-9]+$', '')     as base_category,
+    p.gender,
+    lower(p.gender)                                     as gender_key,
+    h.current_price,
+    h.original_price,
+    h.discount_percent,
+    h.scraped_at
+from products p
+cross join lateral (
+    select current_price, original_price, discount_percent, scraped_at
+    from price_history
+    where product_id = p.id
+    order by scraped_at desc
+    limit 1
+) h;
+
+grant select on latest_items to anon, authenticated;
@@ -0,0 +1,16 @@
+-- Hour bucket for price_history, for supabase_client.write_price_history.
+-- Run once in the Supabase SQL editor (safe to re-run); until it has been run,
+-- snapshot batches fail with 400 (on_conflict names an unknown column).
+--
+-- At most one snapshot per product per hour. Snapshot batches are upserted on
+-- (product_id, hour) with the newest row winning, as the SQLite backend does,
+-- so a rerun within the hour updates that hour's row instead of failing the
+-- whole batch with 409. PostgREST's on_conflict needs plain columns, hence the
+-- generated column (UTC, so the expression is immutable).
+
+alter table price_history
+    add column if not exists hour timestamp
+    generated always as (date_trunc('hour', scraped_at at time zone 'utc')) stored;
+
+create unique index if not exists price_history_product_hour_key
+    on price_history (product_id, hour);
@@ -0,0 +1,62 @@
+import os
+
+import pytest
+
+from brands import KNOWN_BRANDS, LUXURY_BRANDS, PREMIUM_BRANDS, jbhifi_brand, match_brand, tier_bonus
+from discount_scraper_async import AsyncDiscountScraper
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'iconic_page.html')
+
+
+# The per-item substring scans brands.py replaced
+def baseline_tier_bonus(brand):
+    brand = (brand or '').lower()
+    if any(b in brand for b in LUXURY_BRANDS):
+        return 25
+    if any(b in brand for b in PREMIUM_BRANDS):
+        return 18
+    return 10
+
+
+def baseline_jbhifi_brand(product_name):
+    product_upper = product_name.upper()
+    for brand in KNOWN_BRANDS:
+        if brand.upper() in product_upper:
+            return brand
+    words = product_name.split()
+    return words[0] if words else 'Unknown'
+
+
+def _fixture_titles():
+    with open(FIXTURE, encoding='utf-8') as f:
+        deals = AsyncDiscountScraper(use_http_cache=False, use_page_store=False).parse_iconic_category(
+            f.read(), 'Shirts & Polos', 'Men')
+    return sorted({deal.brand for deal in deals} | {f'{deal.brand} {deal.name}' for deal in deals})
+
+
+TITLES = [
+    # Overlapping patterns: 'boss' inside 'hugo boss', 'hp' inside 'headphones'/'iphone'
+    'Hugo Boss Orange', 'BOSS', 'Boss Green by Hugo Boss', 'Bossini',
+    'Gucci x Boss', 'Prada Linea Rossa', 'Saint Laurent', 'Off-White Tee', 'Calibre',
+    'Sony WH-1000XM5 Headphones', 'Apple iPhone 15', 'HP Pavilion', 'Dell XPS with HP Dock',
+    'Samsung Galaxy Buds', 'LG OLED TV', 'Beats Studio Buds by Apple', 'Bang & Olufsen Beoplay',
+    'Western Digital 2TB', 'SteelSeries Arctis', 'Turtle Beach Stealth', 'HyperX Cloud',
+    'Audio-Technica ATH-M50x', 'JBL Flip 6', 'Xbox Series X', 'PlayStation 5 Slim',
+    'Generic USB Cable', '', '   ',
+]
+
+
+@pytest.mark.parametrize('title', TITLES + _fixture_titles())
+def test_matches_the_baseline_scans(title):
+    assert tier_bonus(title) == baseline_tier_bonus(title)
+    assert jbhifi_brand(title) == baseline_jbhifi_brand(title)
+
+
+def test_fixture_has_titles():
+    assert len(_fixture_titles()) > 20
+
+
+def test_luxury_beats_premium_and_list_order_beats_position():
+    assert match_brand('boss by gucci') == (None, 'luxury')
+    # 'Apple' comes before 'Beats' in KNOWN_BRANDS even though 'Beats' appears first
+    assert match_brand('Beats Studio Buds by Apple').canonical == 'Apple'
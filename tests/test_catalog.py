@@ -0,0 +1,11 @@
+import catalog
+import categories
+
+
+def test_category_groups_mirror_the_scraper():
+    assert catalog.CATEGORY_GROUPS == categories.CATEGORY_GROUPS
+
+
+def test_store_sources_match_the_adapters():
+    from stores import get_adapter, store_keys
+    assert catalog.STORE_SOURCES == {key: get_adapter(key).source for key in store_keys()}
@@ -0,0 +1,30 @@
+import json
+
+from embedded_json import MIN_GRID_PRODUCTS, extract_products
+
+
+def _product(i):
+    return {'@type': 'Product', 'name': f'Shirt {i}', 'url': f'/shirt-{i}.html',
+            'offers': {'@type': 'Offer', 'price': '40.00'}}
+
+
+def _page(*blobs):
+    scripts = ''.join(f'<script type="application/ld+json">{json.dumps(blob)}</script>' for blob in blobs)
+    return f'<html><head>{scripts}</head><body></body></html>'
+
+
+def test_lone_featured_product_is_not_a_grid():
+    assert extract_products(_page(_product(0))) == []
+    assert extract_products(_page([_product(i) for i in range(MIN_GRID_PRODUCTS - 1)])) == []
+
+
+def test_page_sized_product_list_is_a_grid():
+    records = extract_products(_page({'products': [_product(i) for i in range(MIN_GRID_PRODUCTS)]}))
+    assert len(records) == MIN_GRID_PRODUCTS
+
+
+def test_item_list_wins_over_featured_product():
+    item_list = {'@type': 'ItemList', 'itemListElement': [
+        {'@type': 'ListItem', 'position': i + 1, 'item': _product(i)} for i in range(3)]}
+    records = extract_products(_page(_product(99), item_list))
+    assert [record['name'] for record in records] == ['Shirt 0', 'Shirt 1', 'Shirt 2']
@@ -0,0 +1,39 @@
+import asyncio
+
+from discount_scraper_async import AsyncDiscountScraper
+from http_cache import HttpCache
+
+URL = 'https://www.theiconic.com.au/mens-clothing-shirts-polos-sale/'
+ITEM = {'source': 'The Iconic', 'brand': 'Brand', 'name': 'Cached Shirt', 'current_price': '$40.00',
+        'original_price': '$80.00', 'discount_percent': 50, 'category': 'Shirts & Polos',
+        'gender': 'Men', 'url': 'https://www.theiconic.com.au/cached.html', 'scraped_at': '2026-01-01T00:00:00'}
+
+
+def _scraper(tmp_path):
+    scraper = AsyncDiscountScraper(use_http_cache=False, use_page_store=False)
+    scraper.http_cache = HttpCache(str(tmp_path))
+    scraper.http_cache.store(URL, b'<html></html>', etag='"v1"')
+    scraper.http_cache.store_items(URL, [ITEM])
+    return scraper
+
+
+def _process(scraper, html, revalidated):
+    return asyncio.run(scraper._process_page('iconic', 'Shirts & Polos', 'Men', URL, html,
+                                             '2026-02-01T00:00:00', None, revalidated))
+
+
+def test_cached_items_only_for_a_304_in_this_fetch(tmp_path):
+    scraper = _scraper(tmp_path)
+    body = scraper.http_cache.load(URL)  # a 304 in an earlier run
+    assert [deal.name for deal in _process(scraper, body, revalidated=True)] == ['Cached Shirt']
+
+    # Same instance, next run: the URL is no longer "revalidated"
+    scraper.http_cache.reset_run()
+    assert scraper.http_cache.revalidated == set() and scraper.http_cache.bytes_saved == 0
+    assert _process(scraper, '<html><body></body></html>', revalidated=False) == []
+
+
+def test_failed_fetch_never_serves_cached_items(tmp_path):
+    scraper = _scraper(tmp_path)
+    scraper.http_cache.load(URL)
+    assert _process(scraper, '', revalidated=True) == []
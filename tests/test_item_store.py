@@ -0,0 +1,78 @@
+import json
+import os
+import shutil
+import subprocess
+
+import numpy as np
+import pytest
+
+from item_store import ItemStore
+
+APP_JS = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'docs', 'js', 'app.js')
+
+
+def _items():
+    rows = [
+        ('The Iconic', 'Shirts Page 2', '$40.00', '$80.00', 50),
+        ('JB Hi-Fi', 'Headphones', '$200.00', '$400.00', 50),
+        ('Myer', 'Jeans', '$90.00', '$100.00', 10),
+    ]
+    return [{'source': source, 'brand': 'Brand', 'name': f'{source} item', 'category': category,
+             'gender': 'Men', 'current_price': current, 'original_price': original,
+             'discount_percent': discount} for source, category, current, original, discount in rows]
+
+
+def test_store_filter_takes_registry_keys():
+    store = ItemStore(_items())
+    total, items = store.query(stores=['iconic'])
+    assert total == 1 and items[0]['source'] == 'The Iconic'
+    total, items = store.query(stores=['jbhifi', 'myer'])
+    assert {item['source'] for item in items} == {'JB Hi-Fi', 'Myer'}
+    assert store.query(stores=['unknown']) == (0, [])
+
+
+def test_category_group_and_discount_filters():
+    store = ItemStore(_items())
+    total, items = store.query(category_groups=['tops'])
+    assert [item['category'] for item in items] == ['Shirts Page 2']
+    total, _ = store.query(min_discount=40)
+    assert total == 2
+
+
+def test_brand_filter_keeps_brands_differing_in_case():
+    items = _items()
+    items[0]['brand'], items[1]['brand'] = 'BOSS', 'Boss'
+    total, _ = ItemStore(items).query(brands=['boss'])
+    assert total == 2
+
+
+def _js_scores(items):
+    """calculateDealScore from docs/js/app.js, run by node over `items`"""
+    with open(APP_JS, encoding='utf-8') as f:
+        source = f.read()
+    scoring = source[source.index('const BRAND_TIERS'):source.index('// Get score label')]
+    parse_price = source[source.index('function parsePrice'):source.index('// Get discount badge class')]
+    script = (f'{scoring}\n{parse_price}\nconst items = {json.dumps(items)};\n'
+              'calculateCategoryAverages(items);\n'
+              'console.log(JSON.stringify(items.map(calculateDealScore)));\n')
+    result = subprocess.run(['node', '-e', script], capture_output=True, text=True, check=True)
+    return json.loads(result.stdout)
+
+
+@pytest.mark.skipif(shutil.which('node') is None, reason='node is not installed')
+def test_score_matches_the_frontend():
+    rows = [
+        ('Gucci', 'Shirts', '$400.00', '$900.00', 55),
+        ('Hugo Boss', 'Shirts', '$120.00', '$200.00', 40),
+        ('BOSS', 'Jeans', '$90.00', '$150.00', 40),
+        ('Nike', 'Sneakers', '$80.00', '$160.00', 50),
+        ('Cotton On', 'T-Shirts', '$10.00', '$25.00', 60),
+        ('Some Label', 'T-Shirts', '$45.00', 'N/A', 0),
+        ('Lee', 'Jeans', '$60.00', '$100.00', 40),
+        ('', 'Headphones', '$299.00', '$399.00', 25),
+    ]
+    items = [{'source': 'Myer', 'brand': brand, 'name': f'{brand} item', 'category': category,
+              'gender': 'Men', 'current_price': current, 'original_price': original,
+              'discount_percent': discount} for brand, category, current, original, discount in rows]
+    python_scores = [int(np.floor(score + 0.5)) for score in ItemStore(items).score]
+    assert python_scores == _js_scores(items)
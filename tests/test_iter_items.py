@@ -0,0 +1,111 @@
+import asyncio
+import os
+from contextlib import aclosing
+
+import discount_scraper_async as scraper_module
+from discount_scraper_async import AsyncDiscountScraper
+
+FIXTURE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'iconic_page.html')
+
+
+def test_stalled_consumer_caps_fetched_pages(monkeypatch):
+    with open(FIXTURE, encoding='utf-8') as f:
+        html = f.read()
+    fetched = []
+
+    async def fake_fetch(self, session, url, *args, **kwargs):
+        fetched.append(url)
+        await asyncio.sleep(0)
+        return html
+
+    monkeypatch.setattr(AsyncDiscountScraper, 'fetch_page', fake_fetch)
+    monkeypatch.setattr(scraper_module, 'MAX_PENDING_PAGES', 4)
+    monkeypatch.setattr(scraper_module, 'RESULT_QUEUE_SIZE', 2)
+
+    async def run():
+        scraper = AsyncDiscountScraper(use_http_cache=False, use_page_store=False)
+        stores = ['iconic', 'asos', 'myer', 'jbhifi']
+        jobs = len(scraper._build_jobs(stores, None))
+        async with aclosing(scraper.iter_items(stores=stores)) as deals:
+            await deals.__anext__()
+            # The caller stalls: fetching must stop once the pending pages are full
+            await asyncio.sleep(0.5)
+            return jobs, len(fetched)
+
+    jobs, count = asyncio.run(run())
+    # Slots, parsed pages queued for the caller, one page blocked on that queue
+    # and the page being yielded
+    assert count <= 4 + 2 + 2
+    assert count < jobs
+
+
+def _iconic_page(path, page, pages=5):
+    cards = ''.join(
+        f'<div><a href="/p{page}-{i}.html"><span class="brand">Brand</span><span class="name">Shirt {i}</span></a>'
+        f'<span class="price original">$80.00</span><span class="price final">$40.00</span></div>'
+        for i in range(3))
+    return f'<html><body>{cards}<a href="{path}?page={pages}">{pages}</a></body></html>'
+
+
+def test_throttled_page_does_not_stop_the_category(monkeypatch):
+    fetched = []
+
+    async def fake_fetch(self, session, url, referer=None, timeout=None, spec=None, metrics=None):
+        fetched.append(url)
+        page = int(url.rsplit('page=', 1)[1]) if 'page=' in url else 1
+        if page == 2:
+            metrics.status = 429
+            return ''
+        metrics.status = 200
+        return _iconic_page(url.split('?')[0].replace('https://www.theiconic.com.au', ''), page)
+
+    monkeypatch.setattr(AsyncDiscountScraper, 'fetch_page', fake_fetch)
+
+    async def run():
+        scraper = AsyncDiscountScraper(use_http_cache=False, use_page_store=False, stream_parse=False)
+        jobs = scraper._build_jobs(['iconic'], None)[:1]
+        monkeypatch.setattr(scraper, '_build_jobs', lambda stores, groups: jobs)
+        deals = [deal async for deal in scraper.iter_items(stores=['iconic'])]
+        return scraper, deals
+
+    scraper, deals = asyncio.run(run())
+    assert sorted({deal.url.split('/')[-1].split('-')[0] for deal in deals}) == ['p1', 'p3', 'p4', 'p5']
+    failed = [record for record in scraper.metrics.pages if record.page == 2]
+    assert failed[0].error == 'status 429'
+
+
+def test_known_pages_are_hashed_before_any_parse(monkeypatch, tmp_path):
+    from page_store import PageStore
+    streamed = []
+    parsed = []
+
+    async def fake_fetch(self, session, url, referer=None, timeout=None, spec=None, metrics=None):
+        streamed.append(spec is not None)
+        metrics.status = 200
+        return _iconic_page(url.split('?')[0].replace('https://www.theiconic.com.au', ''), 1, pages=1)
+
+    original_parse = AsyncDiscountScraper.parse_page
+
+    def counting_parse(self, *args):
+        parsed.append(args[0])
+        return original_parse(self, *args)
+
+    monkeypatch.setattr(AsyncDiscountScraper, 'fetch_page', fake_fetch)
+    monkeypatch.setattr(AsyncDiscountScraper, 'parse_page', counting_parse)
+
+    async def crawl(scraper):
+        return [deal async for deal in scraper.iter_items(stores=['iconic'])]
+
+    scraper = AsyncDiscountScraper(use_http_cache=False, use_page_store=False)
+    scraper.page_store = PageStore(str(tmp_path))
+    jobs = scraper._build_jobs(['iconic'], None)[:1]
+    monkeypatch.setattr(scraper, '_build_jobs', lambda stores, groups: jobs)
+
+    first = asyncio.run(crawl(scraper))
+    assert streamed == [True]
+    streamed.clear()
+    parsed.clear()
+    second = asyncio.run(crawl(scraper))
+    # Known page: downloaded whole, digest matched, never parsed
+    assert streamed == [False] and parsed == []
+    assert [deal.url for deal in second] == [deal.url for deal in first]
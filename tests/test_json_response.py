@@ -0,0 +1,57 @@
+import pytest
+
+import json_response
+from json_response import build_body, etag_matches, negotiate_encoding
+
+
+@pytest.fixture
+def gzip_only(monkeypatch):
+    monkeypatch.setattr(json_response, 'brotli', None)
+
+
+@pytest.mark.parametrize('header,expected', [
+    (None, None),
+    ('', None),
+    ('gzip, deflate', 'gzip'),
+    ('GZIP', 'gzip'),
+    ('gzip;q=0.5;level=1', 'gzip'),
+    ('gzip; level=1; q=0.5', 'gzip'),
+    ('gzip;q=0', None),
+    ('gzip;q=0.000', None),
+    ('gzip;q=abc', None),
+    ('*', 'gzip'),
+    ('*;q=0', None),
+    ('*, gzip;q=0', None),
+    ('identity, *;q=0.1', 'gzip'),
+    ('deflate', None),
+])
+def test_negotiate_encoding(gzip_only, header, expected):
+    assert negotiate_encoding(header) == expected
+
+
+def test_brotli_preferred_unless_refused(monkeypatch):
+    monkeypatch.setattr(json_response, 'brotli', object())
+    assert negotiate_encoding('gzip, br') == 'br'
+    assert negotiate_encoding('gzip, br;q=0') == 'gzip'
+    assert negotiate_encoding('gzip;q=1, br;q=0.5;level=4') == 'gzip'
+
+
+def test_etag_matches():
+    _, etag = build_body({'items': [1, 2]})
+    assert etag.startswith('W/"')
+    strong = etag[2:]
+    assert etag_matches(etag, etag)
+    assert etag_matches(strong, etag)
+    assert etag_matches(f'"other", {etag}', etag)
+    assert etag_matches(f'W/"other",{strong}', etag)
+    assert etag_matches('*', etag)
+    assert not etag_matches('"other", W/"another"', etag)
+    assert not etag_matches('', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_volatile_keys_stay_out_of_the_etag():
+    body, etag = build_body({'items': [1], 'timestamp': 'a'}, volatile=('timestamp',))
+    other_body, other_etag = build_body({'items': [1], 'timestamp': 'b'}, volatile=('timestamp',))
+    assert etag == other_etag and body != other_body
+    assert build_body({'items': [2], 'timestamp': 'a'}, volatile=('timestamp',))[1] != etag
@@ -0,0 +1,58 @@
+import pytest
+
+from pagination import discover_page_count, has_next_link, page_url, stops_category
+
+ICONIC = ('page', 1)
+JBHIFI = ('p', 0)
+ICONIC_URL = 'https://www.theiconic.com.au/mens-clothing-shirts-polos-sale/'
+JBHIFI_URL = 'https://www.jbhifi.com.au/collections/headphones?sort=price'
+
+
+@pytest.mark.parametrize('page_param,url,page,expected', [
+    (ICONIC, ICONIC_URL, 1, ICONIC_URL),
+    (ICONIC, ICONIC_URL, 3, ICONIC_URL + '?page=3'),
+    (ICONIC, ICONIC_URL + '?page=2', 1, ICONIC_URL),
+    (JBHIFI, JBHIFI_URL, 1, JBHIFI_URL + '&p=0'),
+    (JBHIFI, JBHIFI_URL, 3, JBHIFI_URL + '&p=2'),
+])
+def test_page_url(page_param, url, page, expected):
+    assert page_url(page_param, url, page) == expected
+
+
+@pytest.mark.parametrize('as_bytes', [False, True])
+def test_page_count_from_the_category_pager(as_bytes):
+    html = ('<nav><a href="/womens-sale/?page=1">Women</a><a href="/mens-sale/?page=40">Sale</a></nav>'
+            '<a href="/mens-clothing-shirts-polos-sale/?sort=popularity&amp;page=2">2</a>'
+            '<a href="https://www.theiconic.com.au/mens-clothing-shirts-polos-sale/?sort=popularity&amp;page=7">7</a>')
+    if as_bytes:
+        html = html.encode()
+    assert discover_page_count(ICONIC, html, ICONIC_URL) == 7
+
+
+def test_page_count_zero_based_pager():
+    html = ('<a href="/collections/headphones?sort=price&amp;p=1">2</a>'
+            '<a href="/collections/headphones?sort=price&amp;p=4">5</a>'
+            '<a href="/collections/speakers?p=9">Speakers</a>')
+    assert discover_page_count(JBHIFI, html, JBHIFI_URL) == 5
+
+
+def test_no_pager():
+    assert discover_page_count(ICONIC, '<a href="/womens-sale/?page=3">Women</a>', ICONIC_URL) is None
+    assert discover_page_count(ICONIC, '', ICONIC_URL) is None
+
+
+def test_next_link():
+    assert has_next_link('<link rel="next" href="?page=2">')
+    assert has_next_link(b"<a class='pager' rel='next' href='?page=2'>Next</a>")
+    assert not has_next_link('<a rel="prev" href="?page=1">Prev</a>')
+    assert not has_next_link('')
+
+
+@pytest.mark.parametrize('page,fetched,new_urls,stops', [
+    (2, True, 0, True),    # fetched, nothing new: the listing ran out
+    (2, True, 12, False),
+    (2, False, 0, False),  # 429/5xx/network error: not evidence of an empty page
+    (1, True, 0, False),   # the first page never ends the crawl on its own
+])
+def test_stops_category(page, fetched, new_urls, stops):
+    assert stops_category(page, fetched, new_urls) is stops
@@ -0,0 +1,18 @@
+import logging
+
+import parse_pool
+
+
+def test_pinned_pool_follows_the_requested_size(caplog):
+    try:
+        pool = parse_pool.pinned_executor(1)
+        assert parse_pool.pinned_executor(1) is pool
+        with caplog.at_level(logging.WARNING, logger='parse_pool'):
+            resized = parse_pool.pinned_executor(2)
+        assert resized is not pool and resized._max_workers == 2
+        assert 'from 1 to 2 workers' in caplog.text
+        assert parse_pool.pinned_executor(2) is resized
+    finally:
+        parse_pool.shutdown_pinned()
+    assert parse_pool.pinned_executor(2) is not resized
+    parse_pool.shutdown_pinned()
@@ -0,0 +1,15 @@
+from price_index import PriceIndex
+
+SNAPSHOT = {'product_id': 'p1', 'current_price': 40.0, 'original_price': 80.0, 'discount_percent': 50}
+
+
+def test_index_for_another_target_is_not_loaded(tmp_path):
+    path = str(tmp_path / 'price_index.json')
+    index = PriceIndex(path, target='sqlite:/tmp/prices.db')
+    index.record(SNAPSHOT, now=1000.0)
+    index.save()
+
+    same = PriceIndex(path, target='sqlite:/tmp/prices.db')
+    assert same.load() and same.due(SNAPSHOT, now=2000.0) is None
+    # Written for SQLite: Supabase has none of these rows, so it must be rebuilt
+    assert not PriceIndex(path, target='supabase:https://example.supabase.co').load()
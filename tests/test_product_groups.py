@@ -0,0 +1,58 @@
+from product_groups import group_indexes, group_items
+
+
+def _item(source, brand, name, price='$100.00'):
+    return {'source': source, 'brand': brand, 'name': name, 'current_price': price,
+            'url': f'https://{source}/{brand}/{name}'.replace(' ', '-')}
+
+
+def _grouped_names(items):
+    return sorted(sorted(items[i]['name'] for i in group) for group in group_indexes(items))
+
+
+def test_same_product_across_stores_is_grouped():
+    items = [
+        _item('THE ICONIC', 'Nike', 'Air Max 90 Sneakers', '$180.00'),
+        _item('Myer', 'Nike', 'Air Max 90 Trainers', '$150.00'),
+    ]
+    rows = group_items(items)
+    assert len(rows) == 1
+    assert rows[0]['source'] == 'Myer'
+    assert [alt['source'] for alt in rows[0]['alternatives']] == ['THE ICONIC']
+
+
+def test_model_numbers_must_match():
+    items = [
+        _item('THE ICONIC', 'Nike', 'Air Max 90'),
+        _item('Myer', 'Nike', 'Air Max 95'),
+    ]
+    assert len(group_indexes(items)) == 2
+
+
+def test_colour_variants_stay_separate():
+    items = [
+        _item('Myer', 'Calvin Klein', 'Logo Tee Black'),
+        _item('Myer', 'Calvin Klein', 'Logo Tee White'),
+        _item('David Jones', 'Calvin Klein', 'Logo Tee Navy'),
+    ]
+    assert len(group_indexes(items)) == 3
+
+
+def test_group_never_holds_two_offers_from_one_store():
+    items = [
+        _item('Myer', 'Calvin Klein', 'Logo Tee'),
+        _item('Myer', 'Calvin Klein', 'Logo T-Shirt'),
+        _item('David Jones', 'Calvin Klein', 'Logo Tee'),
+    ]
+    for group in group_indexes(items):
+        sources = [items[i]['source'] for i in group]
+        assert len(sources) == len(set(sources))
+    rows = group_items(items)
+    for row in rows:
+        assert row['source'] not in {alt['source'] for alt in row['alternatives']}
+
+
+def test_numbered_products_are_not_collapsed():
+    stores = ['THE ICONIC', 'ASOS', 'Myer', 'JB Hi-Fi', 'David Jones']
+    items = [_item(stores[n % len(stores)], 'Acme', f'Logo Tee {n}') for n in range(100)]
+    assert len(group_indexes(items)) == 100
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from deal import Deal
+from discount_scraper_async import TOP_N
+from ranking import CategoryTopN
+
+CATEGORIES = ['Shirts', 'Pants', 'Shoes', 'Headphones']
+
+
+def _deals(count, seed):
+    rng = random.Random(seed)
+    # Few distinct discounts, so most scores tie
+    return [Deal.create('Myer', 'Brand', f'Item {i}', 4000, 8000, rng.choice(CATEGORIES), 'Men',
+                        f'https://example.com/{i}', '2026-01-01T00:00:00',
+                        discount_percent=rng.choice([10, 30, 50, 70]))
+            for i in range(count)]
+
+
+def _score(deal):
+    return deal.discount_percent
+
+
+@pytest.mark.parametrize('count,seed', [(0, 0), (30, 1), (500, 2), (2000, 3)])
+def test_matches_a_stable_sort_per_category(count, seed):
+    deals = _deals(count, seed)
+    top = CategoryTopN(_score, TOP_N)
+    for deal in deals:
+        top.add(deal)
+
+    expected = {}
+    for category in CATEGORIES:
+        in_category = [deal for deal in deals if deal.category == category]
+        expected[category] = sorted(in_category, key=_score, reverse=True)[:TOP_N]
+    ranked = top.ranked()
+    for category in CATEGORIES:
+        assert [deal for deal in ranked if deal.category == category] == expected[category]
+
+    # Across categories: best first, ties in arrival order
+    kept = [deal for deal in deals if any(deal is other for other in expected[deal.category])]
+    assert ranked == sorted(kept, key=_score, reverse=True)
+    seen = {category: sum(deal.category == category for deal in deals) for category in CATEGORIES}
+    assert top.dropped() == {category: (TOP_N, seen[category])
+                             for category in CATEGORIES if seen[category] > TOP_N}
+
+
+def test_no_limit_keeps_everything():
+    deals = _deals(200, 4)
+    top = CategoryTopN(_score, None)
+    for deal in deals:
+        top.add(deal)
+    assert top.ranked() == sorted(deals, key=_score, reverse=True)
+    assert top.dropped() == {}
@@ -0,0 +1,116 @@
+import asyncio
+import types
+
+import pytest
+
+import rate_control
+from rate_control import AdaptiveRateController, HostLimiter, RequestOutcome
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    # Only rate_control's clock; the event loop keeps the real time.monotonic
+    monkeypatch.setattr(rate_control, 'time', types.SimpleNamespace(monotonic=fake))
+    return fake
+
+
+def _outcome(status=200, retry_after=None):
+    outcome = RequestOutcome()
+    outcome.status, outcome.retry_after = status, retry_after
+    return outcome
+
+
+def test_additive_increase_about_one_per_window(clock):
+    limiter = HostLimiter('example.com', initial=4, max_limit=16)
+    for _ in range(4):
+        limiter._record(_outcome(), 0.1)
+    assert 4.9 < limiter.limit < 5.0
+    for _ in range(5):
+        limiter._record(_outcome(), 0.1)
+    assert 5.8 < limiter.limit < 6.0
+
+
+@pytest.mark.parametrize('status', [429, 503])
+def test_throttle_halves_the_limit_once_per_interval(clock, status):
+    limiter = HostLimiter('example.com', initial=8, decrease_interval=1.0)
+    limiter._record(_outcome(status), 0.1)
+    assert limiter.limit == 4
+    # Same burst: ignored until the interval has passed
+    limiter._record(_outcome(status), 0.1)
+    assert limiter.limit == 4
+    clock.now += 1.0
+    limiter._record(_outcome(status), 0.1)
+    assert limiter.limit == 2
+    assert limiter.throttled == 3
+
+
+def test_errors_and_latency_back_off_by_a_quarter(clock):
+    limiter = HostLimiter('example.com', initial=8)
+    limiter._record(_outcome(500), 0.1)
+    assert limiter.limit == 6
+    clock.now += 1.0
+    limiter._record(_outcome(None), 0.1)
+    assert limiter.limit == 4.5
+    assert limiter.errors == 2
+
+    limiter = HostLimiter('example.com', initial=8, latency_tolerance=2.0)
+    limiter._record(_outcome(), 0.1)
+    clock.now += 1.0
+    limiter._record(_outcome(), 5.0)  # ewma 1.08s > 0.1s * 2 + 0.25
+    assert limiter.limit == pytest.approx((8 + 1 / 8) * 0.75)
+
+
+def test_retry_after_blocks_new_requests(clock):
+    limiter = HostLimiter('example.com', cooldown=2.0)
+    limiter._record(_outcome(200, retry_after='30'), 0.1)
+    assert limiter.blocked_until == clock.now + 30
+    # Capped at a minute; unparseable values (HTTP dates) fall back to the cooldown
+    clock.now += 100
+    limiter._record(_outcome(429, retry_after='3600'), 0.1)
+    assert limiter.blocked_until == clock.now + 60
+    clock.now += 100
+    limiter._record(_outcome(429, retry_after='Wed, 21 Oct 2026 07:28:00 GMT'), 0.1)
+    assert limiter.blocked_until == clock.now + 2.0
+
+
+def test_per_host_floors_and_caps(clock):
+    controller = AdaptiveRateController(defaults={'initial': 4, 'max_limit': 6},
+                                        overrides={'slow.example.com': {'initial': 2, 'min_limit': 2,
+                                                                        'max_limit': 3}})
+    fast = controller.limiter('https://fast.example.com/a')
+    slow = controller.limiter('https://slow.example.com/a')
+    assert controller.limiter('https://fast.example.com/b') is fast
+    for _ in range(200):
+        fast._record(_outcome(), 0.1)
+        slow._record(_outcome(), 0.1)
+    assert fast.limit == 6 and slow.limit == 3
+    for _ in range(10):
+        clock.now += 1.0
+        fast._record(_outcome(429), 0.1)
+        slow._record(_outcome(429), 0.1)
+    assert fast.limit == 1 and slow.limit == 2
+
+
+def test_slots_cap_requests_in_flight(clock):
+    async def run():
+        controller = AdaptiveRateController(defaults={'initial': 2})
+        limiter = controller.limiter('https://example.com/')
+        await limiter.acquire()
+        await limiter.acquire()
+        third = asyncio.ensure_future(limiter.acquire())
+        await asyncio.sleep(0.01)
+        assert not third.done()
+        await limiter.release(_outcome(), 0.1)
+        await asyncio.wait_for(third, 1)
+        return limiter.in_flight
+
+    assert asyncio.run(run()) == 2
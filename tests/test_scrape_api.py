@@ -0,0 +1,91 @@
+import json
+import threading
+import urllib.error
+import urllib.request
+from http.server import HTTPServer
+
+import pytest
+
+import json_response
+import scrape
+import storage
+
+ITEMS = [
+    {'source': 'Myer', 'brand': 'Brand', 'name': f'Item {i}', 'url': f'https://example.com/{i}',
+     'category': 'Shirts', 'gender': 'Men' if i % 2 else 'Women', 'current_price': '$40.00',
+     'original_price': '$80.00', 'discount_percent': 50, 'scraped_at': '2026-01-01T00:00:00'}
+    for i in range(4)
+]
+
+
+@pytest.fixture
+def api(monkeypatch):
+    calls = []
+
+    def get_latest_items(**filters):
+        calls.append(filters)
+        return list(ITEMS)
+
+    monkeypatch.setattr(storage, 'get_latest_items', get_latest_items)
+    monkeypatch.setattr(scrape, '_cache', {})
+    server = HTTPServer(('127.0.0.1', 0), scrape.handler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    def get(path, **headers):
+        request = urllib.request.Request(f'http://127.0.0.1:{server.server_port}{path}', headers=headers)
+        try:
+            with urllib.request.urlopen(request) as response:
+                return response.status, response.headers, response.read()
+        except urllib.error.HTTPError as e:
+            return e.code, e.headers, e.read()
+
+    get.calls = calls
+    yield get
+    server.shutdown()
+    server.server_close()
+
+
+def test_storage_filters_go_to_the_query(api):
+    status, _, body = api('/api/scrape?stores=myer&genders=Men&min_discount=30')
+    assert status == 200 and json.loads(body)['total'] == len(ITEMS)
+    assert api.calls == [{'stores': ['myer'], 'category_groups': None, 'genders': ['Men'], 'min_discount': 30.0}]
+
+    # Same filters: served from the cache; other filters: a new query
+    api('/api/scrape?stores=myer&genders=men&min_discount=30')
+    api('/api/scrape?stores=myer&genders=Men&min_discount=40')
+    assert len(api.calls) == 2
+
+
+def test_malformed_parameters_are_400(api):
+    for query in ('page=abc', 'sort=unknown', 'min_discount=lots'):
+        status, _, body = api(f'/api/scrape?{query}')
+        assert status == 400 and not json.loads(body)['success']
+
+
+def test_storage_value_error_is_500(api, monkeypatch):
+    def corrupt(**filters):
+        raise json.JSONDecodeError('Expecting value', '<html>', 0)
+
+    monkeypatch.setattr(storage, 'get_latest_items', corrupt)
+    status, _, _ = api('/api/scrape')
+    assert status == 500
+
+
+def test_unchanged_data_revalidates_with_304(api, monkeypatch):
+    monkeypatch.setattr(json_response, 'MIN_COMPRESS_BYTES', 0)
+    status, headers, body = api('/api/scrape?stores=myer', **{'Accept-Encoding': 'gzip;q=0.5;level=1'})
+    etag = headers['ETag']
+    assert status == 200 and headers['Content-Encoding'] == 'gzip' and etag.startswith('W/')
+
+    # Served from the cache with a new timestamp and cache age: same ETag
+    status, headers, body = api('/api/scrape?stores=myer', **{'If-None-Match': f'"other", {etag[2:]}'})
+    assert status == 304 and body == b''
+    assert headers['ETag'] == etag and 'Content-Type' not in headers
+
+    status, _, body = api('/api/scrape?stores=myer', **{'If-None-Match': 'W/"other"'})
+    assert status == 200 and json.loads(body)['total'] == len(ITEMS)
+
+
+def test_errors_are_never_304(api):
+    status, headers, _ = api('/api/scrape?page=abc', **{'If-None-Match': '*'})
+    assert status == 400 and 'ETag' not in headers and headers['Cache-Control'] == 'no-store'
@@ -0,0 +1,39 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+import sqlite_client
+
+
+def _item(source, name, category='Shirts'):
+    return {'source': source, 'brand': 'Brand', 'name': name, 'url': f'https://example.com/{name}',
+            'category': category, 'gender': 'Men', 'current_price': '$40.00',
+            'original_price': '$80.00', 'discount_percent': 50}
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(sqlite_client, 'SQLITE_PATH', str(tmp_path / 'prices.db'))
+    monkeypatch.setattr(sqlite_client, '_conn', None)
+    yield sqlite_client
+    if sqlite_client._conn is not None:
+        sqlite_client._conn.close()
+
+
+def test_latest_items_store_filter_takes_registry_keys(db):
+    db.save_price_history([_item('The Iconic', 'a'), _item('JB Hi-Fi', 'b'), _item('Myer', 'c')])
+    assert [item['source'] for item in db.get_latest_items(stores=['iconic'])] == ['The Iconic']
+    assert [item['source'] for item in db.get_latest_items(stores=['jbhifi'])] == ['JB Hi-Fi']
+    assert db.get_latest_items(stores=['theiconic']) == []
+    assert len(db.get_latest_items()) == 3
+
+
+def test_latest_items_leave_out_delisted_products(db, monkeypatch):
+    old = (datetime.now(timezone.utc) - timedelta(days=30)).isoformat(timespec='seconds')
+    now = db._now
+    monkeypatch.setattr(db, '_now', lambda: old)
+    db.save_price_history([_item('Myer', 'gone')])
+    monkeypatch.setattr(db, '_now', now)
+    db.save_price_history([_item('Myer', 'listed')])
+    assert [item['name'] for item in db.get_latest_items()] == ['listed']
+    assert len(db.get_latest_items(max_age=60 * 24 * 3600)) == 2
@@ -0,0 +1,48 @@
+import gzip
+import hashlib
+import json
+import os
+
+from static_shards import MANIFEST_NAME, publish_shards
+
+
+def _item(source, name, category='Shirts'):
+    return {'source': source, 'brand': 'Brand', 'name': name, 'url': f'https://example.com/{name}',
+            'category': category, 'gender': 'Men', 'current_price': '$40.00', 'original_price': '$80.00',
+            'discount_percent': 50, 'scraped_at': '2026-01-01T00:00:00'}
+
+
+def _shard_files(out_dir):
+    return {name for name in os.listdir(out_dir) if name.endswith('.json.gz')}
+
+
+def test_manifest_hashes_match_the_shards(tmp_path):
+    items = [_item('Myer', 'a'), _item('JB Hi-Fi', 'b', 'Headphones'), _item('The Iconic', 'c', 'Jeans')]
+    manifest = publish_shards(items, str(tmp_path), timestamp='2026-01-01T00:00:00')
+    with open(tmp_path / MANIFEST_NAME, encoding='utf-8') as f:
+        assert json.load(f) == manifest
+
+    assert _shard_files(tmp_path) == {entry['file'] for entry in manifest['shards'].values()}
+    for name, entry in manifest['shards'].items():
+        raw = (tmp_path / entry['file']).read_bytes()
+        body = gzip.decompress(raw)
+        assert hashlib.sha256(body).hexdigest() == entry['sha256']
+        assert entry['file'] == f"{name}.{entry['sha256'][:16]}.json.gz"
+        assert (entry['bytes'], entry['gzip_bytes']) == (len(body), len(raw))
+        assert json.loads(body)['total'] == entry['items']
+    assert manifest['shards']['store-myer']['items'] == 1
+    assert manifest['shards']['store-asos']['items'] == 0
+    assert manifest['shards']['category-jeans']['items'] == 1
+
+
+def test_stale_shards_are_removed(tmp_path):
+    first = publish_shards([_item('Myer', 'a')], str(tmp_path))
+    second = publish_shards([_item('Myer', 'b')], str(tmp_path))
+    # Clients holding the previous manifest can still load its shards
+    assert first['shards']['all']['file'] in _shard_files(tmp_path)
+
+    third = publish_shards([_item('Myer', 'c')], str(tmp_path))
+    files = _shard_files(tmp_path)
+    assert first['shards']['all']['file'] not in files
+    assert files == ({entry['file'] for entry in second['shards'].values()}
+                     | {entry['file'] for entry in third['shards'].values()})
@@ -0,0 +1,83 @@
+import gzip
+import json
+import threading
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlsplit
+
+import pytest
+
+import supabase_client
+
+
+class FakePostgREST(BaseHTTPRequestHandler):
+    """products and price_history with the unique (product_id, hour) key, upserts as PostgREST does"""
+    tables = {}
+
+    def log_message(self, *args):
+        pass
+
+    def do_POST(self):
+        parts = urlsplit(self.path)
+        table = parts.path.rsplit('/', 1)[1]
+        body = self.rfile.read(int(self.headers['Content-Length']))
+        if self.headers.get('Content-Encoding') == 'gzip':
+            body = gzip.decompress(body)
+        rows = json.loads(body)
+        for row in rows:
+            # Column default
+            row.setdefault('scraped_at', datetime.now(timezone.utc).isoformat())
+        key_columns = (parse_qs(parts.query).get('on_conflict') or [''])[0].split(',')
+        prefer = self.headers.get('Prefer', '')
+        stored = self.tables.setdefault(table, {})
+
+        def key(row):
+            if table == 'products':
+                return row['id']
+            return row['product_id'], row['scraped_at'][:13]
+
+        if 'resolution=' not in prefer or key_columns == ['']:
+            if any(key(row) in stored for row in rows):
+                self._reply(409, b'{"code":"23505","message":"duplicate key value"}')
+                return
+        for row in rows:
+            if key(row) in stored and 'ignore-duplicates' in prefer:
+                continue
+            stored[key(row)] = row
+        self._reply(201, b'')
+
+    def _reply(self, status, body):
+        self.send_response(status)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+@pytest.fixture
+def postgrest(monkeypatch):
+    FakePostgREST.tables = {}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), FakePostgREST)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(supabase_client, 'SUPABASE_URL', f'http://127.0.0.1:{server.server_port}')
+    yield FakePostgREST.tables
+    server.shutdown()
+    server.server_close()
+
+
+def _item(name, price):
+    return {'source': 'Myer', 'brand': 'Brand', 'name': name, 'url': f'https://example.com/{name}',
+            'category': 'Shirts', 'gender': 'Men', 'current_price': price, 'original_price': '$80.00',
+            'discount_percent': 50}
+
+
+def test_rerun_within_the_hour_still_writes_the_batch(postgrest):
+    supabase_client.write_price_history([_item('a', '$40.00')])
+    # Same hour: 'a' already has a snapshot, 'b' and 'c' are new
+    results = supabase_client.write_price_history([_item('a', '$35.00'), _item('b', '$40.00'),
+                                                   _item('c', '$40.00')])
+    assert all(result.ok for result in results['price_history'])
+    snapshots = postgrest['price_history']
+    assert len(snapshots) == 3
+    a = supabase_client._product_id(_item('a', ''))
+    # The newest snapshot of the hour wins, as in the SQLite backend
+    assert [row['current_price'] for key, row in snapshots.items() if key[0] == a] == [35.0]